@@ -1,31 +1,83 @@
+import asyncio
+import dataclasses
+import functools
+import json
 import os
 import sys
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Literal
 
 import numpy as np
+import pyarrow as pa
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 
 load_dotenv()
 
 cli_path = Path(__file__).parent.parent.parent / "cli"
 sys.path.insert(0, str(cli_path))
 
-from dazense_core.config import DazenseConfig, DazenseConfigError
+from dazense_core.cache import ProjectCache, QueryResultCache, SingleFlight, normalize_sql
+from dazense_core.config import DazenseConfigError
+from dazense_core.config.databases import ConnectionPool, get_connection_pool, get_schema_cache
 from dazense_core.context import get_context_provider
-from dazense_core.rules import BusinessRules
-from dazense_core.semantic import SemanticEngine, SemanticModel
+from dazense_core.results import ARROW_STREAM_MEDIA_TYPE, arrow_to_columns, arrow_to_ipc
+from dazense_core.semantic import (
+    MergedQuery,
+    SemanticEngine,
+    get_partition_cache,
+    get_plan_cache,
+    merge_queries,
+)
+from dazense_core.semantic.batch import select_rows
+from dazense_core.semantic import sampling
 
 port = int(os.environ.get("PORT", 8005))
 
 # Global scheduler instance
 scheduler = None
 
+# Parsed project files, reused across requests until they change on disk
+project_cache = ProjectCache()
+
+# Bounded worker pool for blocking warehouse calls, so a slow query never stalls the event loop
+warehouse_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("DAZENSE_WAREHOUSE_WORKERS", 8)),
+    thread_name_prefix="warehouse",
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking function on the warehouse worker pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(warehouse_executor, functools.partial(func, *args, **kwargs))
+
+
+# Hard caps for streamed results; requests may ask for less but never more
+STREAM_MAX_ROWS = int(os.environ.get("DAZENSE_STREAM_MAX_ROWS", 1_000_000))
+STREAM_MAX_BYTES = int(os.environ.get("DAZENSE_STREAM_MAX_BYTES", 256 * 1024 * 1024))
+STREAM_BATCH_SIZE = int(os.environ.get("DAZENSE_STREAM_BATCH_SIZE", 10_000))
+
+# Results of read-only SQL, shared across requests and users; a TTL of 0 disables caching
+RESULT_CACHE_TTL = float(os.environ.get("DAZENSE_RESULT_CACHE_TTL", 300))
+result_cache_dir = os.environ.get("DAZENSE_RESULT_CACHE_DIR")
+result_cache = QueryResultCache(
+    ttl=RESULT_CACHE_TTL,
+    max_bytes=int(os.environ.get("DAZENSE_RESULT_CACHE_MAX_BYTES", 256 * 1024 * 1024)),
+    disk_dir=Path(result_cache_dir) if result_cache_dir else None,
+)
+
+# Identical requests arriving while one is already running wait for it instead of re-querying
+in_flight = SingleFlight()
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -59,13 +111,27 @@ async def lifespan(app: FastAPI):
     if scheduler:
         scheduler.shutdown(wait=False)
 
+    # Stop warehouse workers and close pooled connections
+    warehouse_executor.shutdown(wait=False, cancel_futures=True)
+    get_connection_pool().close_all()
+
+
+def _invalidate_context_caches() -> None:
+    """Drop everything derived from the previous context after a refresh changed it."""
+    project_cache.invalidate()
+    result_cache.clear()
+    get_plan_cache().clear()
+    get_schema_cache().clear()
+    get_partition_cache().clear()
+
 
 async def _refresh_context_task():
     """Background task for scheduled context refresh."""
     try:
         provider = get_context_provider()
-        updated = provider.refresh()
+        updated = await asyncio.to_thread(provider.refresh)
         if updated:
+            _invalidate_context_caches()
             print(f"[Scheduler] Context refreshed at {datetime.now().isoformat()}")
         else:
             print(
@@ -90,10 +156,31 @@ app.add_middleware(
 # =============================================================================
 
 
+# "json": rows as objects (default). "columnar": {"columns", "data": {column: values}}.
+# "arrow": Arrow IPC stream. Columnar formats are fetched natively as Arrow by the backend.
+ResultFormat = Literal["json", "columnar", "arrow"]
+
+# "ndjson" (execute_sql only): streamed as a {"columns"} line, one JSON array per row,
+# then a {"row_count", "truncated"} line, capped by max_rows / max_bytes.
+StreamFormat = Literal["ndjson"]
+
+
+class Sample(BaseModel):
+    fraction: float = Field(gt=0, le=1)
+    # "bernoulli" samples rows, "system" storage blocks (faster, but less even)
+    method: Literal["bernoulli", "system"] = "bernoulli"
+    seed: int | None = None
+
+
 class ExecuteSQLRequest(BaseModel):
     sql: str
     dazense_project_folder: str
     database_id: str | None = None
+    format: ResultFormat | StreamFormat = "json"
+    max_rows: int | None = None
+    max_bytes: int | None = None
+    # Read a TABLESAMPLE of each table queried FROM (not of joined tables); results are not scaled
+    sample: Sample | None = None
 
 
 class ExecuteSQLResponse(BaseModel):
@@ -108,15 +195,41 @@ class RefreshResponse(BaseModel):
     message: str
 
 
-class QueryMetricsRequest(BaseModel):
-    dazense_project_folder: str
+class TimeRange(BaseModel):
+    start: str | None = None  # inclusive
+    end: str | None = None  # exclusive
+
+
+class TopN(BaseModel):
+    dimension: str
+    n: int = Field(ge=1)
+    # Measure the dimension's values are ranked by (default: the first measure)
+    by: str | None = None
+
+
+class MetricQuery(BaseModel):
     model_name: str
     measures: list[str]
     dimensions: list[str] = []
     filters: list[dict] = []
     order_by: list[dict] = []
     limit: int | None = None
+    # hour / day / week / month / quarter / year, applied to the model's time_dimension
+    time_grain: str | None = None
+    time_range: TimeRange | None = None
+    # previous_period / previous_year, and count or sum measures to add running totals of (need time_grain)
+    compare: list[str] = []
+    cumulative: list[str] = []
+    # Estimate from a TABLESAMPLE of the model's table, adding <measure>_lower / _upper confidence bounds
+    sample: Sample | None = None
+    # Keep the top n values of one of the dimensions, grouping the others as "Other"
+    top_n: TopN | None = None
+
+
+class QueryMetricsRequest(MetricQuery):
+    dazense_project_folder: str
     database_id: str | None = None
+    format: ResultFormat = "json"
 
 
 class QueryMetricsResponse(BaseModel):
@@ -128,6 +241,43 @@ class QueryMetricsResponse(BaseModel):
     dimensions: list[str]
 
 
+class QueryMetricsBatchRequest(BaseModel):
+    dazense_project_folder: str
+    queries: list[MetricQuery]
+    # "columnar" returns each result's data as {column: values}
+    format: Literal["json", "columnar"] = "json"
+
+
+class QueryMetricsBatchResult(BaseModel):
+    data: list[dict] | dict[str, list] | None = None
+    row_count: int = 0
+    columns: list[str] = []
+    model_name: str
+    measures: list[str]
+    dimensions: list[str]
+    error: str | None = None
+
+
+class QueryMetricsBatchResponse(BaseModel):
+    results: list[QueryMetricsBatchResult]
+
+
+class DimensionValuesRequest(BaseModel):
+    dazense_project_folder: str
+    model_name: str
+    dimension: str
+    # Case-insensitive prefix the values must start with
+    prefix: str = ""
+    limit: int = Field(default=100, ge=1)
+
+
+class DimensionValuesResponse(BaseModel):
+    # {"value", "count"} pairs, most frequent first
+    values: list[dict]
+    model_name: str
+    dimension: str
+
+
 class BusinessContextRequest(BaseModel):
     dazense_project_folder: str
     category: str | None = None
@@ -157,6 +307,271 @@ class HealthResponse(BaseModel):
     refresh_schedule: str | None
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+
+def _convert_value(v):
+    if isinstance(v, (np.integer,)):
+        return int(v)
+    if isinstance(v, (np.floating,)):
+        return float(v)
+    if isinstance(v, np.ndarray):
+        return v.tolist()
+    if hasattr(v, "item"):  # numpy scalar
+        return v.item()
+    return v
+
+
+def _sql_key(db_config, sql: str, kind: Literal["frame", "arrow"]) -> str | None:
+    """Key shared by equivalent read-only SQL on the same connection, or None if the SQL must always run.
+
+    Keys combine the connection config, the context version and the normalized SQL, so
+    formatting-only differences share an entry and a context refresh never serves stale data.
+    """
+    normalized = normalize_sql(sql, db_config.type)
+    if normalized is None:
+        return None
+    return QueryResultCache.make_key(
+        ConnectionPool.config_key(db_config), kind, project_cache.version, normalized
+    )
+
+
+def _cached_sql(db_config, sql: str, kind: Literal["frame", "arrow"], key: str | None):
+    """Run SQL through the result cache, as a DataFrame or an Arrow table (blocking)."""
+    fetch = db_config.execute_sql if kind == "frame" else db_config.execute_sql_arrow
+    if key is None or RESULT_CACHE_TTL <= 0:
+        return fetch(sql)
+
+    result = result_cache.get(key)
+    if result is None:
+        result = fetch(sql)
+        result_cache.put(key, result)
+    return result
+
+
+def _execute_sql_records(db_config, sql: str, key: str | None) -> tuple[list[dict], list[str]]:
+    """Run SQL and convert the result to JSON-friendly records (blocking; call via run_blocking)."""
+    df = _cached_sql(db_config, sql, "frame", key)
+    data = [
+        {k: _convert_value(v) for k, v in row.items()}
+        for row in df.to_dict(orient="records")
+    ]
+    return data, [str(c) for c in df.columns.tolist()]
+
+
+def _columnar_response(table: pa.Table, format: ResultFormat, **extra) -> Response:
+    """Serialize an Arrow result as an Arrow IPC stream or column-oriented JSON (blocking)."""
+    if format == "arrow":
+        return Response(content=arrow_to_ipc(table), media_type=ARROW_STREAM_MEDIA_TYPE)
+    return JSONResponse(
+        content={
+            "columns": table.column_names,
+            "data": arrow_to_columns(table),
+            "row_count": table.num_rows,
+            **extra,
+        }
+    )
+
+
+def _ndjson_chunks(batches: Iterator[pa.RecordBatch], max_rows: int, max_bytes: int) -> Iterator[bytes]:
+    """Encode record batches as NDJSON, stopping (and closing the fetch) once a cap is hit (blocking)."""
+    row_count = 0
+    byte_count = 0
+    truncated = False
+    try:
+        for index, batch in enumerate(batches):
+            if index == 0:
+                yield (json.dumps({"columns": batch.schema.names}) + "\n").encode()
+
+            lines: list[bytes] = []
+            columns = arrow_to_columns(pa.Table.from_batches([batch]))
+            for row in zip(*columns.values()):
+                line = (json.dumps(list(row)) + "\n").encode()
+                if row_count >= max_rows or byte_count + len(line) > max_bytes:
+                    truncated = True
+                    break
+                lines.append(line)
+                row_count += 1
+                byte_count += len(line)
+            if lines:
+                yield b"".join(lines)
+            if truncated:
+                break
+    finally:
+        close = getattr(batches, "close", None)
+        if close:
+            close()
+    yield (json.dumps({"row_count": row_count, "truncated": truncated}) + "\n").encode()
+
+
+async def _coalesced(key, func, *args, **kwargs):
+    """Run a blocking call on the worker pool, shared with identical in-flight requests unless key is None."""
+    if key is None:
+        return await run_blocking(func, *args, **kwargs)
+    return await in_flight.do(key, lambda: run_blocking(func, *args, **kwargs))
+
+
+async def _iterate_blocking(chunks: Iterator[bytes], first: bytes) -> AsyncIterator[bytes]:
+    """Drive a blocking chunk iterator from the event loop, one step per worker call."""
+    try:
+        yield first
+        while (chunk := await run_blocking(next, chunks, None)) is not None:
+            yield chunk
+    except Exception as e:
+        # Headers are already sent, so report mid-stream failures in-band
+        yield (json.dumps({"error": str(e)}) + "\n").encode()
+    finally:
+        await run_blocking(chunks.close)  # type: ignore[attr-defined]
+
+
+async def _stream_sql(db_config, request: ExecuteSQLRequest) -> StreamingResponse:
+    max_rows = min(request.max_rows or STREAM_MAX_ROWS, STREAM_MAX_ROWS)
+    max_bytes = min(request.max_bytes or STREAM_MAX_BYTES, STREAM_MAX_BYTES)
+    chunks = _ndjson_chunks(db_config.stream_sql_arrow(request.sql, STREAM_BATCH_SIZE), max_rows, max_bytes)
+    # Pull the first chunk eagerly so query errors still surface as HTTP errors
+    first = await run_blocking(next, chunks)
+    return StreamingResponse(_iterate_blocking(chunks, first), media_type="application/x-ndjson")
+
+
+def _load_semantic_project(project_path: Path):
+    """Return the project's (semantic model, config), raising a 400 if there is no semantic model."""
+    semantic_model = project_cache.get_semantic_model(project_path)
+    if semantic_model is None:
+        raise HTTPException(
+            status_code=400,
+            detail="No semantic_model.yml found in semantics/ folder",
+        )
+    return semantic_model, project_cache.get_config(project_path)
+
+
+async def _run_metric_query(project_path: Path, semantic_model, config, query: dict, arrow: bool):
+    """Run one metric query on the worker pool as rows (or an Arrow table), coalescing identical ones."""
+    engine = SemanticEngine(semantic_model, config.databases)
+    # Same spec and result kind against the same project and context version
+    key = (
+        "query_metrics",
+        str(project_path.resolve()),
+        project_cache.version,
+        "arrow" if arrow else "rows",
+        json.dumps(query, sort_keys=True, default=str),
+    )
+    return await _coalesced(key, engine.query_arrow if arrow else engine.query, **query)
+
+
+async def _run_merged_query(
+    project_path: Path,
+    semantic_model,
+    config,
+    group: MergedQuery,
+    queries: list[MetricQuery],
+    format: Literal["json", "columnar"],
+) -> dict[int, QueryMetricsBatchResult]:
+    """Run a merged batch query and split its result back into one result per member query."""
+    try:
+        result = await _run_metric_query(
+            project_path, semantic_model, config, group.query_kwargs(), arrow=format == "columnar"
+        )
+    except Exception as e:
+        if len(group.members) == 1:
+            return {group.members[0]: _batch_error(queries[group.members[0]], e)}
+        # Re-run the members one by one so an error is reported on the query that caused it
+        outcomes = await asyncio.gather(
+            *(
+                _run_merged_query(
+                    project_path,
+                    semantic_model,
+                    config,
+                    dataclasses.replace(merge_queries([queries[i].model_dump()])[0], members=[i]),
+                    queries,
+                    format,
+                )
+                for i in group.members
+            )
+        )
+        return {i: result for outcome in outcomes for i, result in outcome.items()}
+
+    engine = SemanticEngine(semantic_model, config.databases)
+    results: dict[int, QueryMetricsBatchResult] = {}
+    for index in group.members:
+        query = queries[index]
+        try:
+            columns = engine.result_columns(
+                query.model_name,
+                query.measures,
+                query.dimensions,
+                query.time_grain,
+                query.compare,
+                query.cumulative,
+                query.sample.model_dump() if query.sample else None,
+            )
+            if format == "columnar":
+                data = await run_blocking(lambda: arrow_to_columns(result.select(columns)))
+            else:
+                data = select_rows(result, columns)
+        except Exception as e:
+            results[index] = _batch_error(query, e)
+            continue
+        results[index] = QueryMetricsBatchResult(
+            data=data,
+            row_count=result.num_rows if format == "columnar" else len(result),
+            columns=columns,
+            model_name=query.model_name,
+            measures=query.measures,
+            dimensions=query.dimensions,
+        )
+    return results
+
+
+def _batch_error(query: MetricQuery, error: Exception) -> QueryMetricsBatchResult:
+    return QueryMetricsBatchResult(
+        model_name=query.model_name,
+        measures=query.measures,
+        dimensions=query.dimensions,
+        error=str(error),
+    )
+
+
+def _resolve_database(config, database_id: str | None):
+    """Pick the database a request targets, raising a 400 with the available names otherwise."""
+    if len(config.databases) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="No databases configured in dazense_config.yaml",
+        )
+
+    # Determine which database to use
+    if len(config.databases) == 1:
+        return config.databases[0]
+    if database_id:
+        # Find the database by name
+        db_config = next(
+            (db for db in config.databases if db.name == database_id),
+            None,
+        )
+        if db_config is None:
+            available_databases = [db.name for db in config.databases]
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": f"Database '{database_id}' not found",
+                    "available_databases": available_databases,
+                },
+            )
+        return db_config
+
+    # Multiple databases and no database_id specified
+    available_databases = [db.name for db in config.databases]
+    raise HTTPException(
+        status_code=400,
+        detail={
+            "message": "Multiple databases configured. Please specify database_id.",
+            "available_databases": available_databases,
+        },
+    )
+
+
 # =============================================================================
 # API Endpoints
 # =============================================================================
@@ -184,7 +599,7 @@ async def health_check():
 
 
 @app.post("/api/refresh", response_model=RefreshResponse)
-async def refresh_context():
+def refresh_context():
     """Trigger a context refresh (git pull if using git source).
 
     This endpoint can be called by:
@@ -197,6 +612,7 @@ async def refresh_context():
         updated = provider.refresh()
 
         if updated:
+            _invalidate_context_caches()
             return RefreshResponse(
                 status="ok",
                 updated=True,
@@ -220,67 +636,35 @@ async def execute_sql(request: ExecuteSQLRequest):
     try:
         # Load the dazense config from the project folder
         project_path = Path(request.dazense_project_folder)
-        os.chdir(project_path)
-        config = DazenseConfig.try_load(project_path, raise_on_error=True)
-        assert config is not None
-
-        if len(config.databases) == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="No databases configured in dazense_config.yaml",
-            )
-
-        # Determine which database to use
-        if len(config.databases) == 1:
-            db_config = config.databases[0]
-        elif request.database_id:
-            # Find the database by name
-            db_config = next(
-                (db for db in config.databases if db.name == request.database_id),
-                None,
-            )
-            if db_config is None:
-                available_databases = [db.name for db in config.databases]
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                        "message": f"Database '{request.database_id}' not found",
-                        "available_databases": available_databases,
-                    },
-                )
-        else:
-            # Multiple databases and no database_id specified
-            available_databases = [db.name for db in config.databases]
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": "Multiple databases configured. Please specify database_id.",
-                    "available_databases": available_databases,
-                },
-            )
-
-        df = db_config.execute_sql(request.sql)
-
-        def convert_value(v):
-            if isinstance(v, (np.integer,)):
-                return int(v)
-            if isinstance(v, (np.floating,)):
-                return float(v)
-            if isinstance(v, np.ndarray):
-                return v.tolist()
-            if hasattr(v, "item"):  # numpy scalar
-                return v.item()
-            return v
-
-        data = [
-            {k: convert_value(v) for k, v in row.items()}
-            for row in df.to_dict(orient="records")
-        ]
+        config = project_cache.get_config(project_path)
+        db_config = _resolve_database(config, request.database_id)
+        # Unseeded samples draw other rows on each run: never cached nor shared with concurrent requests
+        cacheable = True
+        if request.sample is not None:
+            sample = sampling.Sample(**request.sample.model_dump())
+            cacheable = sampling.is_repeatable(db_config.type, sample)
+            try:
+                sql = sampling.sample_sql(request.sql, db_config.type, sample)
+            except ValueError as e:
+                # SQL that does not parse, or a database without TABLESAMPLE
+                raise HTTPException(status_code=400, detail=str(e))
+            request = request.model_copy(update={"sql": sql})
+
+        if request.format == "ndjson":
+            return await _stream_sql(db_config, request)
+
+        if request.format != "json":
+            key = _sql_key(db_config, request.sql, "arrow") if cacheable else None
+            table = await _coalesced(key, _cached_sql, db_config, request.sql, "arrow", key)
+            return await run_blocking(_columnar_response, table, request.format)
+
+        key = _sql_key(db_config, request.sql, "frame") if cacheable else None
+        data, columns = await _coalesced(key, _execute_sql_records, db_config, request.sql, key)
 
         return ExecuteSQLResponse(
             data=data,
             row_count=len(data),
-            columns=[str(c) for c in df.columns.tolist()],
+            columns=columns,
         )
     except HTTPException:
         raise
@@ -294,30 +678,36 @@ async def execute_sql(request: ExecuteSQLRequest):
 async def query_metrics(request: QueryMetricsRequest):
     try:
         project_path = Path(request.dazense_project_folder)
-        os.chdir(project_path)
-
-        semantic_model = SemanticModel.load(project_path)
-        if semantic_model is None:
-            raise HTTPException(
-                status_code=400,
-                detail="No semantic_model.yml found in semantics/ folder",
+        semantic_model, config = _load_semantic_project(project_path)
+        query = request.model_dump(include=set(MetricQuery.model_fields))
+
+        if request.format != "json":
+            table = await _run_metric_query(project_path, semantic_model, config, query, arrow=True)
+            return await run_blocking(
+                _columnar_response,
+                table,
+                request.format,
+                model_name=request.model_name,
+                measures=request.measures,
+                dimensions=request.dimensions,
             )
 
-        config = DazenseConfig.try_load(project_path, raise_on_error=True)
-        assert config is not None
-
-        engine = SemanticEngine(semantic_model, config.databases)
-        rows = engine.query(
-            model_name=request.model_name,
-            measures=request.measures,
-            dimensions=request.dimensions,
-            filters=request.filters,
-            order_by=request.order_by,
-            limit=request.limit,
+        rows = await _run_metric_query(project_path, semantic_model, config, query, arrow=False)
+
+        columns = (
+            list(rows[0].keys())
+            if rows
+            else SemanticEngine(semantic_model, config.databases).result_columns(
+                request.model_name,
+                request.measures,
+                request.dimensions,
+                request.time_grain,
+                request.compare,
+                request.cumulative,
+                request.sample.model_dump() if request.sample else None,
+            )
         )
 
-        columns = list(rows[0].keys()) if rows else request.dimensions + request.measures
-
         return QueryMetricsResponse(
             data=rows,
             row_count=len(rows),
@@ -336,12 +726,56 @@ async def query_metrics(request: QueryMetricsRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/query_metrics/batch", response_model=QueryMetricsBatchResponse)
+async def query_metrics_batch(request: QueryMetricsBatchRequest):
+    """Run several metric queries concurrently, with one result (or error) per query.
+
+    Queries that differ only by their measures are merged into a single warehouse query.
+    """
+    try:
+        project_path = Path(request.dazense_project_folder)
+        semantic_model, config = _load_semantic_project(project_path)
+
+        groups = merge_queries([query.model_dump() for query in request.queries])
+        outcomes = await asyncio.gather(
+            *(
+                _run_merged_query(project_path, semantic_model, config, group, request.queries, request.format)
+                for group in groups
+            )
+        )
+        results = {index: result for outcome in outcomes for index, result in outcome.items()}
+
+        return QueryMetricsBatchResponse(results=[results[i] for i in range(len(request.queries))])
+    except HTTPException:
+        raise
+    except DazenseConfigError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/dimension_values", response_model=DimensionValuesResponse)
+def dimension_values(request: DimensionValuesRequest):
+    """Look up the valid values of a dimension in its index (built by `dazense sync`), without the warehouse."""
+    try:
+        semantic_model, config = _load_semantic_project(Path(request.dazense_project_folder))
+        engine = SemanticEngine(semantic_model, config.databases)
+        values = engine.dimension_values(request.model_name, request.dimension, request.prefix, request.limit)
+        return DimensionValuesResponse(values=values, model_name=request.model_name, dimension=request.dimension)
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/business_context", response_model=BusinessContextResponse)
-async def business_context(request: BusinessContextRequest):
+def business_context(request: BusinessContextRequest):
     try:
         project_path = Path(request.dazense_project_folder)
 
-        business_rules = BusinessRules.load(project_path)
+        business_rules = project_cache.get_business_rules(project_path)
         if business_rules is None:
             raise HTTPException(
                 status_code=400,
@@ -366,11 +800,11 @@ async def business_context(request: BusinessContextRequest):
 
 
 @app.post("/classify", response_model=ClassifyResponse)
-async def classify(request: ClassifyRequest):
+def classify(request: ClassifyRequest):
     try:
         project_path = Path(request.dazense_project_folder)
 
-        business_rules = BusinessRules.load(project_path)
+        business_rules = project_cache.get_business_rules(project_path)
         if business_rules is None:
             raise HTTPException(
                 status_code=400,
@@ -78,6 +78,434 @@ def test_execute_sql_with_cte_duckdb(duckdb_project_folder):
     )
 
 
+def test_execute_sql_columnar_format_duckdb(duckdb_project_folder):
+    """Test execute_sql returning column arrays instead of row objects."""
+    client = TestClient(app)
+
+    response = client.post(
+        "/execute_sql",
+        json={
+            "sql": "SELECT * FROM (VALUES (1, 'a', 1.5::DECIMAL(4,2)), (2, 'b', NULL)) t(id, name, amount)",
+            "dazense_project_folder": duckdb_project_folder,
+            "format": "columnar",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "columns": ["id", "name", "amount"],
+        "data": {"id": [1, 2], "name": ["a", "b"], "amount": [1.5, None]},
+        "row_count": 2,
+    }
+
+
+def test_execute_sql_arrow_format_duckdb(duckdb_project_folder):
+    """Test execute_sql returning an Arrow IPC stream."""
+    import pyarrow as pa
+
+    client = TestClient(app)
+
+    response = client.post(
+        "/execute_sql",
+        json={
+            "sql": "SELECT 1 AS id, 'hello' AS message",
+            "dazense_project_folder": duckdb_project_folder,
+            "format": "arrow",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.to_pylist() == [{"id": 1, "message": "hello"}]
+
+
+def test_execute_sql_ndjson_stream_duckdb(duckdb_project_folder):
+    """Test execute_sql streaming NDJSON rows with a row cap."""
+    import json
+
+    client = TestClient(app)
+
+    response = client.post(
+        "/execute_sql",
+        json={
+            "sql": "SELECT i AS id FROM range(5) t(i)",
+            "dazense_project_folder": duckdb_project_folder,
+            "format": "ndjson",
+            "max_rows": 3,
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"columns": ["id"]}, [0], [1], [2], {"row_count": 3, "truncated": True}]
+
+
+def test_execute_sql_ndjson_stream_not_truncated_at_exact_cap(duckdb_project_folder):
+    """Test that a result exactly at the row cap is not reported as truncated."""
+    import json
+
+    client = TestClient(app)
+
+    response = client.post(
+        "/execute_sql",
+        json={
+            "sql": "SELECT i AS id FROM range(2) t(i)",
+            "dazense_project_folder": duckdb_project_folder,
+            "format": "ndjson",
+            "max_rows": 2,
+        },
+    )
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines[-1] == {"row_count": 2, "truncated": False}
+
+
+def test_execute_sql_ndjson_stream_error_is_http_error(duckdb_project_folder):
+    """Errors before the first row still produce an HTTP error response."""
+    client = TestClient(app)
+
+    response = client.post(
+        "/execute_sql",
+        json={
+            "sql": "SELECT * FROM missing_table",
+            "dazense_project_folder": duckdb_project_folder,
+            "format": "ndjson",
+        },
+    )
+
+    assert response.status_code == 500
+
+
+def test_execute_sql_relative_duckdb_path_ignores_cwd(tmp_path, monkeypatch):
+    """Relative DuckDB paths resolve against the project folder, whatever the process cwd is."""
+    import duckdb
+
+    project = tmp_path / "project"
+    project.mkdir()
+    with duckdb.connect(str(project / "data.duckdb")) as con:
+        con.execute("CREATE TABLE answers AS SELECT 42 AS answer")
+    config = {
+        "project_name": "test-project",
+        "databases": [{"name": "local", "type": "duckdb", "path": "data.duckdb"}],
+    }
+    with (project / "dazense_config.yaml").open("w") as f:
+        yaml.dump(config, f)
+    monkeypatch.chdir(tmp_path)
+
+    client = TestClient(app)
+    response = client.post(
+        "/execute_sql",
+        json={"sql": "SELECT answer FROM answers", "dazense_project_folder": str(project)},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"answer": 42}]
+
+
+
+def test_execute_sql_reuses_cached_result_for_equivalent_sql(duckdb_project_folder):
+    """Formatting-only differences hit the result cache; a context refresh clears it."""
+    from unittest.mock import patch
+
+    from dazense_core.config.databases.duckdb import DuckDBConfig
+
+    client = TestClient(app)
+    sqls = ["SELECT 7 AS lucky", "select 7  as lucky -- again"]
+
+    with patch.object(DuckDBConfig, "execute_sql", autospec=True, side_effect=DuckDBConfig.execute_sql) as execute:
+        for sql in sqls:
+            response = client.post(
+                "/execute_sql",
+                json={"sql": sql, "dazense_project_folder": duckdb_project_folder},
+            )
+            assert response.status_code == 200
+            assert response.json()["data"] == [{"lucky": 7}]
+        assert execute.call_count == 1
+
+        with patch("main.get_context_provider") as get_provider:
+            get_provider.return_value.refresh.return_value = True
+            assert client.post("/api/refresh").json()["updated"] is True
+
+        client.post("/execute_sql", json={"sql": sqls[0], "dazense_project_folder": duckdb_project_folder})
+        assert execute.call_count == 2
+
+
+def test_execute_sql_coalesces_concurrent_identical_requests(duckdb_project_folder, monkeypatch):
+    """Identical requests in flight at the same time share a single warehouse execution."""
+    import asyncio
+    import time
+    from unittest.mock import patch
+
+    import httpx
+
+    import main
+    from dazense_core.config.databases.duckdb import DuckDBConfig
+
+    monkeypatch.setattr(main, "RESULT_CACHE_TTL", 0)
+
+    def slow_execute_sql(self, sql):
+        time.sleep(0.1)
+        return original(self, sql)
+
+    original = DuckDBConfig.execute_sql
+
+    async def send_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(
+                *(
+                    client.post(
+                        "/execute_sql",
+                        json={"sql": "SELECT 3 AS n", "dazense_project_folder": duckdb_project_folder},
+                    )
+                    for _ in range(4)
+                )
+            )
+
+    with patch.object(DuckDBConfig, "execute_sql", autospec=True, side_effect=slow_execute_sql) as execute:
+        responses = asyncio.run(send_all())
+
+    assert [r.json()["data"] for r in responses] == [[{"n": 3}]] * 4
+    assert execute.call_count == 1
+
+
+@pytest.fixture
+def semantic_project_folder(tmp_path):
+    """Create a project folder with a DuckDB file and a semantic model over its orders table."""
+    import duckdb
+
+    with duckdb.connect(str(tmp_path / "shop.duckdb")) as con:
+        con.execute(
+            """
+            CREATE TABLE orders AS SELECT * FROM (VALUES
+                (1, 'completed', 'web', 100),
+                (2, 'completed', 'store', 50),
+                (3, 'cancelled', 'web', 75)
+            ) AS t(order_id, status, channel, amount)
+            """
+        )
+    config = {
+        "project_name": "test-project",
+        "databases": [{"name": "shop", "type": "duckdb", "path": "shop.duckdb"}],
+    }
+    with (tmp_path / "dazense_config.yaml").open("w") as f:
+        yaml.dump(config, f)
+    semantic_model = {
+        "models": {
+            "orders": {
+                "table": "orders",
+                "schema": "main",
+                "dimensions": {"status": {"column": "status"}, "channel": {"column": "channel"}},
+                "measures": {
+                    "order_count": {"type": "count"},
+                    "total_amount": {"type": "sum", "column": "amount"},
+                },
+            }
+        }
+    }
+    (tmp_path / "semantics").mkdir()
+    with (tmp_path / "semantics" / "semantic_model.yml").open("w") as f:
+        yaml.dump(semantic_model, f)
+    return str(tmp_path)
+
+
+def test_query_metrics(semantic_project_folder):
+    client = TestClient(app)
+    response = client.post(
+        "/query_metrics",
+        json={
+            "dazense_project_folder": semantic_project_folder,
+            "model_name": "orders",
+            "measures": ["order_count"],
+            "dimensions": ["status"],
+            "order_by": [{"column": "status"}],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {"status": "cancelled", "order_count": 1},
+        {"status": "completed", "order_count": 2},
+    ]
+
+
+def test_query_metrics_batch_merges_queries_differing_only_by_measures(semantic_project_folder):
+    from unittest.mock import patch
+
+    from dazense_core.semantic import SemanticEngine
+
+    by_status = {"model_name": "orders", "dimensions": ["status"], "order_by": [{"column": "status"}]}
+    client = TestClient(app)
+    with patch.object(SemanticEngine, "query", autospec=True, side_effect=SemanticEngine.query) as query:
+        response = client.post(
+            "/query_metrics/batch",
+            json={
+                "dazense_project_folder": semantic_project_folder,
+                "queries": [
+                    {**by_status, "measures": ["order_count"]},
+                    {"model_name": "orders", "measures": ["total_amount"], "dimensions": ["channel"], "order_by": [{"column": "channel"}]},
+                    {**by_status, "measures": ["total_amount"]},
+                ],
+            },
+        )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["data"] for r in results] == [
+        [{"status": "cancelled", "order_count": 1}, {"status": "completed", "order_count": 2}],
+        [{"channel": "store", "total_amount": 50}, {"channel": "web", "total_amount": 175}],
+        [{"status": "cancelled", "total_amount": 75}, {"status": "completed", "total_amount": 150}],
+    ]
+    assert results[2]["columns"] == ["status", "total_amount"]
+    assert query.call_count == 2
+
+
+def test_query_metrics_batch_reports_errors_per_query(semantic_project_folder):
+    client = TestClient(app)
+    response = client.post(
+        "/query_metrics/batch",
+        json={
+            "dazense_project_folder": semantic_project_folder,
+            "format": "columnar",
+            "queries": [
+                {"model_name": "orders", "measures": ["order_count"]},
+                {"model_name": "orders", "measures": ["missing_measure"]},
+                {"model_name": "orders", "measures": [], "dimensions": ["status"], "top_n": {"dimension": "status", "n": 1}},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    ok, failed, unranked = response.json()["results"]
+    assert "top_n needs a measure" in unranked["error"]
+    assert ok["error"] is None
+    assert ok["data"] == {"order_count": [3]}
+    assert "missing_measure" in failed["error"]
+    assert failed["data"] is None
+
+
+def test_query_metrics_batch_reports_error_of_a_failing_first_member(semantic_project_folder):
+    client = TestClient(app)
+    response = client.post(
+        "/query_metrics/batch",
+        json={
+            "dazense_project_folder": semantic_project_folder,
+            "queries": [
+                {"model_name": "orders", "measures": ["missing_measure"]},
+                {"model_name": "orders", "measures": ["order_count"]},
+            ],
+        },
+    )
+
+    assert response.status_code == 200
+    failed, ok = response.json()["results"]
+    assert "missing_measure" in failed["error"]
+    assert failed["measures"] == ["missing_measure"]
+    assert ok["error"] is None
+    assert ok["measures"] == ["order_count"]
+    assert ok["data"] == [{"order_count": 3}]
+
+
+def test_query_metrics_sample_adds_confidence_bounds(semantic_project_folder):
+    client = TestClient(app)
+    response = client.post(
+        "/query_metrics",
+        json={
+            "dazense_project_folder": semantic_project_folder,
+            "model_name": "orders",
+            "measures": ["total_amount"],
+            "sample": {"fraction": 1},
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"total_amount": 225, "total_amount_lower": 225, "total_amount_upper": 225}]
+
+
+def test_query_metrics_top_n_groups_other_values(semantic_project_folder):
+    client = TestClient(app)
+    response = client.post(
+        "/query_metrics",
+        json={
+            "dazense_project_folder": semantic_project_folder,
+            "model_name": "orders",
+            "measures": ["order_count"],
+            "dimensions": ["channel"],
+            "order_by": [{"column": "channel"}],
+            "top_n": {"dimension": "channel", "n": 1, "by": "total_amount"},
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"channel": "Other", "order_count": 1}, {"channel": "web", "order_count": 2}]
+
+
+def test_execute_sql_sample(semantic_project_folder):
+    client = TestClient(app)
+    request = {"dazense_project_folder": semantic_project_folder, "sql": "SELECT COUNT(*) AS n FROM orders"}
+
+    response = client.post("/execute_sql", json={**request, "sample": {"fraction": 1, "method": "system"}})
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"n": 3}]
+
+    response = client.post("/execute_sql", json={**request, "sample": {"fraction": 2}})
+    assert response.status_code == 422
+
+    response = client.post("/execute_sql", json={**request, "sql": "SELEC n FRM orders", "sample": {"fraction": 0.5}})
+    assert response.status_code == 400
+    assert "does not parse" in response.json()["detail"]
+
+
+def test_execute_sql_caches_only_seeded_samples(semantic_project_folder):
+    from unittest.mock import patch
+
+    from dazense_core.config.databases.duckdb import DuckDBConfig
+
+    client = TestClient(app)
+    request = {"dazense_project_folder": semantic_project_folder, "sql": "SELECT COUNT(*) AS n FROM orders"}
+
+    with patch.object(DuckDBConfig, "execute_sql", autospec=True, side_effect=DuckDBConfig.execute_sql) as execute:
+        for _ in range(2):
+            assert client.post("/execute_sql", json={**request, "sample": {"fraction": 0.5}}).status_code == 200
+        assert execute.call_count == 2
+
+        for _ in range(2):
+            response = client.post("/execute_sql", json={**request, "sample": {"fraction": 0.5, "seed": 42}})
+            assert response.status_code == 200
+        assert execute.call_count == 3
+
+def test_dimension_values(semantic_project_folder):
+    from main import project_cache
+
+    from dazense_core.semantic import SemanticEngine
+
+    client = TestClient(app)
+    request = {"dazense_project_folder": semantic_project_folder, "model_name": "orders", "dimension": "channel"}
+    assert client.post("/dimension_values", json=request).status_code == 400
+
+    project_path = Path(semantic_project_folder)
+    engine = SemanticEngine(project_cache.get_semantic_model(project_path), project_cache.get_config(project_path).databases)
+    engine.index_dimension_values("orders")
+
+    response = client.post("/dimension_values", json={**request, "prefix": "W"})
+    assert response.status_code == 200
+    assert response.json()["values"] == [{"value": "web", "count": 2}]
+
+    response = client.post(
+        "/query_metrics",
+        json={
+            "dazense_project_folder": semantic_project_folder,
+            "model_name": "orders",
+            "measures": ["order_count"],
+            "filters": [{"column": "channel", "value": "online"}],
+        },
+    )
+    assert response.status_code == 400
+    assert "'online' is not a value of dimension 'channel'" in response.json()["detail"]
+
+
 # BigQuery tests (requires SSO authentication)
 
 @pytest.fixture
@@ -0,0 +1,43 @@
+import type { dimensionValues } from '@dazense/shared/tools';
+import { dimensionValues as schemas } from '@dazense/shared/tools';
+
+import { DimensionValuesOutput, renderToModelOutput } from '../../components/tool-outputs';
+import { env } from '../../env';
+import { createTool, type ToolContext } from '../../types/tools';
+
+async function executeDimensionValues(
+	{ model_name, dimension, prefix, limit }: dimensionValues.Input,
+	context: ToolContext,
+): Promise<dimensionValues.Output> {
+	const response = await fetch(`http://localhost:${env.FASTAPI_PORT}/dimension_values`, {
+		method: 'POST',
+		headers: { 'Content-Type': 'application/json' },
+		body: JSON.stringify({
+			dazense_project_folder: context.projectFolder,
+			model_name,
+			dimension,
+			prefix,
+			...(limit && { limit }),
+		}),
+	});
+
+	if (!response.ok) {
+		const errorData = await response.json().catch(() => ({ detail: response.statusText }));
+		throw new Error(`Error fetching dimension values: ${JSON.stringify(errorData.detail)}`);
+	}
+
+	const data = await response.json();
+	return {
+		_version: '1',
+		...data,
+	};
+}
+
+export default createTool({
+	description:
+		'List the valid values of a semantic model dimension, with their row counts, from a local index (no warehouse query). Use this to find the exact values to filter on before calling query_metrics.',
+	inputSchema: schemas.InputSchema,
+	outputSchema: schemas.OutputSchema,
+	execute: executeDimensionValues,
+	toModelOutput: ({ output }) => renderToModelOutput(DimensionValuesOutput({ output }), output),
+});
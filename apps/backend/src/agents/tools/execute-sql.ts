@@ -6,7 +6,7 @@ import { env } from '../../env';
 import { createTool, type ToolContext } from '../../types/tools';
 
 export async function executeQuery(
-	{ sql_query, database_id }: executeSql.Input,
+	{ sql_query, sample, database_id }: executeSql.Input,
 	context: ToolContext,
 ): Promise<executeSql.Output> {
 	const dazenseProjectFolder = context.projectFolder;
@@ -19,6 +19,7 @@ export async function executeQuery(
 		body: JSON.stringify({
 			sql: sql_query,
 			dazense_project_folder: dazenseProjectFolder,
+			...(sample && { sample }),
 			...(database_id && { database_id }),
 		}),
 	});
@@ -5,6 +5,7 @@ import { env } from '../../env';
 import { mcpService } from '../../services/mcp.service';
 import { AgentSettings } from '../../types/agent-settings';
 import classify from './classify';
+import dimensionValues from './dimension-values';
 import displayChart from './display-chart';
 import executePython, { isPythonAvailable } from './execute-python';
 import executeSql from './execute-sql';
@@ -49,6 +50,7 @@ export const getTools = (agentSettings: AgentSettings | null) => {
 		...mcpTools,
 		...(agentSettings?.experimental?.pythonSandboxing && execute_python && { execute_python }),
 		...(hasSemanticModel() && { query_metrics: queryMetrics }),
+		...(hasSemanticModel() && { dimension_values: dimensionValues }),
 		...(hasBusinessRules() && { get_business_context: getBusinessContext }),
 		...(hasBusinessRules() && { classify }),
 	};
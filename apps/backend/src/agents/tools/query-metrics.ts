@@ -6,7 +6,21 @@ import { env } from '../../env';
 import { createTool, type ToolContext } from '../../types/tools';
 
 async function executeQueryMetrics(
-	{ model_name, measures, dimensions, filters, order_by, limit, database_id }: queryMetrics.Input,
+	{
+		model_name,
+		measures,
+		dimensions,
+		filters,
+		order_by,
+		limit,
+		time_grain,
+		time_range,
+		compare,
+		cumulative,
+		sample,
+		top_n,
+		database_id,
+	}: queryMetrics.Input,
 	context: ToolContext,
 ): Promise<queryMetrics.Output> {
 	const response = await fetch(`http://localhost:${env.FASTAPI_PORT}/query_metrics`, {
@@ -20,6 +34,12 @@ async function executeQueryMetrics(
 			filters,
 			order_by,
 			limit,
+			time_grain,
+			time_range,
+			compare,
+			cumulative,
+			...(sample && { sample }),
+			...(top_n && { top_n }),
 			...(database_id && { database_id }),
 		}),
 	});
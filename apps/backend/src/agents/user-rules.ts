@@ -81,6 +81,7 @@ export type SemanticModelInfo = {
 	name: string;
 	table: string;
 	description?: string;
+	timeDimension?: string;
 	dimensions: string[];
 	measures: Record<string, string>;
 	joins: string[];
@@ -108,6 +109,7 @@ export function getSemanticModels(): SemanticModelInfo[] | null {
 			name,
 			table: model.table as string,
 			description: model.description as string | undefined,
+			timeDimension: model.time_dimension as string | undefined,
 			dimensions: Object.keys((model.dimensions as Record<string, unknown>) || {}),
 			measures: Object.fromEntries(
 				Object.entries((model.measures as Record<string, Record<string, string>>) || {}).map(([k, v]) => [
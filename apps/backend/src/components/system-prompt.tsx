@@ -58,6 +58,18 @@ export function SystemPrompt() {
 					researching.
 				</ListItem>
 				<ListItem>If you can execute a SQL query, use the execute_sql tool for it.</ListItem>
+				<ListItem>
+					While exploring large tables, pass a small sample (e.g. 1%) to execute_sql or query_metrics to iterate
+					quickly, then run the query without it for the final answer.
+				</ListItem>
+				<ListItem>
+					To break a metric down by a dimension with many values, pass top_n to query_metrics rather than a
+					limit: the remaining values are aggregated into an "Other" row, so totals stay correct.
+				</ListItem>
+				<ListItem>
+					One query_metrics call can group by dimensions several joins away (model.column) and combine
+					measures of several models (model.measure): do not split such questions into several calls.
+				</ListItem>
 			</List>
 			<Title level={2}>How dazense Works</Title>
 			<List>
@@ -112,6 +124,7 @@ export function SystemPrompt() {
 					<Span>
 						A semantic layer is available with pre-defined metrics and dimensions. Prefer using the
 						query_metrics tool over writing raw SQL when the required measures and dimensions are available.
+						Use the dimension_values tool to look up the exact values to filter a dimension on.
 					</Span>
 					<List>
 						{semanticModels.map((model) => (
@@ -124,6 +137,8 @@ export function SystemPrompt() {
 									.map(([name, type]) => `${name} (${type})`)
 									.join(', ')}
 								{model.joins.length > 0 && `\nJoins: ${model.joins.join(', ')}`}
+								{model.timeDimension &&
+									`\nTime dimension: ${model.timeDimension} (use time_grain / time_range / compare / cumulative)`}
 							</ListItem>
 						))}
 					</List>
@@ -0,0 +1,17 @@
+import type { dimensionValues } from '@dazense/shared/tools';
+
+import { Block, ListItem, TitledList } from '../../lib/markdown';
+
+export const DimensionValuesOutput = ({ output }: { output: dimensionValues.Output }) => {
+	if (output.values.length === 0) {
+		return <Block>No values of {output.dimension} match the prefix.</Block>;
+	}
+
+	return (
+		<TitledList title={`Values of ${output.model_name}.${output.dimension} (${output.values.length})`}>
+			{output.values.map(({ value, count }) => (
+				<ListItem>{value === null ? 'NULL' : JSON.stringify(value)} ({count} rows)</ListItem>
+			))}
+		</TitledList>
+	);
+};
@@ -4,6 +4,7 @@ import type { ReactNode } from 'react';
 import { renderToMarkdown } from '../../lib/markdown/render-to-markdown';
 
 export { ClassifyOutput } from './classify';
+export { DimensionValuesOutput } from './dimension-values';
 export { DisplayChartOutput } from './display-chart';
 export { ExecuteSqlOutput } from './execute-sql';
 export { GetBusinessContextOutput } from './get-business-context';
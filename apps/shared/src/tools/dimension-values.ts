@@ -0,0 +1,23 @@
+import z from 'zod/v3';
+
+export const InputSchema = z.object({
+	model_name: z.string().describe('The semantic model name (e.g. "trips")'),
+	dimension: z.string().describe('The dimension to list values of (e.g. "payment_type")'),
+	prefix: z.string().default('').describe('Only return values starting with this prefix (case-insensitive)'),
+	limit: z.number().optional().describe('Maximum number of values to return (default: 100)'),
+});
+
+export const DimensionValueSchema = z.object({
+	value: z.string().nullable(),
+	count: z.number(),
+});
+
+export const OutputSchema = z.object({
+	_version: z.literal('1').optional(),
+	values: z.array(DimensionValueSchema),
+	model_name: z.string(),
+	dimension: z.string(),
+});
+
+export type Input = z.infer<typeof InputSchema>;
+export type Output = z.infer<typeof OutputSchema>;
@@ -1,7 +1,19 @@
 import z from 'zod/v3';
 
+export const SampleSchema = z.object({
+	fraction: z.number().gt(0).lte(1).describe('Share of rows to sample (e.g. 0.01 for 1%)'),
+	method: z
+		.enum(['bernoulli', 'system'])
+		.default('bernoulli')
+		.describe('bernoulli samples rows, system samples storage blocks (faster, less even)'),
+	seed: z.number().int().optional().describe('Seed making the sample repeatable'),
+});
+
 export const InputSchema = z.object({
 	sql_query: z.string().describe('The SQL query to execute'),
+	sample: SampleSchema.optional().describe(
+		'For exploration only: read a sample of each table queried FROM (not joined tables). Results are not scaled.',
+	),
 	database_id: z
 		.string()
 		.optional()
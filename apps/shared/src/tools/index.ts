@@ -1,4 +1,5 @@
 export * as classify from './classify';
+export * as dimensionValues from './dimension-values';
 export * as displayChart from './display-chart';
 export * as executePython from './execute-python';
 export * as executeSql from './execute-sql';
@@ -1,23 +1,69 @@
 import z from 'zod/v3';
 
+import { SampleSchema } from './execute-sql';
+
 export const FilterSchema = z.object({
-	column: z.string().describe('Column name to filter on'),
+	column: z.string().describe('Column name to filter on, or join.column for a column of a joined model'),
 	operator: z.enum(['eq', 'ne', 'gt', 'gte', 'lt', 'lte', 'in', 'not_in']).default('eq').describe('Filter operator'),
 	value: z.any().describe('Value to compare against'),
 });
 
 export const OrderBySchema = z.object({
-	column: z.string().describe('Column name to order by'),
+	column: z.string().describe('Column name to order by (joined dimensions as join.column)'),
 	ascending: z.boolean().default(true).describe('Sort ascending (true) or descending (false)'),
 });
 
+export const TimeRangeSchema = z.object({
+	start: z.string().optional().describe('Inclusive start of the range (e.g. "2024-01-01")'),
+	end: z.string().optional().describe('Exclusive end of the range (e.g. "2024-02-01")'),
+});
+
+export const TopNSchema = z.object({
+	dimension: z.string().describe('One of the query dimensions (e.g. "zone.name")'),
+	n: z.number().int().min(1).describe('Number of values to keep'),
+	by: z.string().optional().describe('Measure the values are ranked by (default: the first measure)'),
+});
+
 export const InputSchema = z.object({
 	model_name: z.string().describe('The semantic model name to query (e.g. "orders", "customers")'),
-	measures: z.array(z.string()).min(1).describe('Measures to compute (e.g. ["order_count", "total_amount"])'),
-	dimensions: z.array(z.string()).default([]).describe('Dimensions to group by (e.g. ["status", "customer.name"])'),
+	measures: z
+		.array(z.string())
+		.min(1)
+		.describe(
+			'Measures to compute (e.g. ["order_count", "total_amount"]), or model.measure for a measure of another model (aggregated separately, then joined on the dimensions)',
+		),
+	dimensions: z
+		.array(z.string())
+		.default([])
+		.describe(
+			'Dimensions to group by (e.g. ["status", "customer.name"]). Columns several joins away are join.join.column, or model.column to follow the shortest join path',
+		),
 	filters: z.array(FilterSchema).default([]).describe('Filters to apply'),
 	order_by: z.array(OrderBySchema).default([]).describe('Ordering of results'),
 	limit: z.number().optional().describe('Maximum number of rows to return'),
+	time_grain: z
+		.enum(['hour', 'day', 'week', 'month', 'quarter', 'year'])
+		.optional()
+		.describe(
+			"Truncate the model's time dimension to this grain and group by it (leading `<time_dimension>_<grain>` column)",
+		),
+	time_range: TimeRangeSchema.optional().describe("Restrict the model's time dimension to this range"),
+	compare: z
+		.array(z.enum(['previous_period', 'previous_year']))
+		.default([])
+		.describe(
+			'With time_grain: add each measure in the compared period and its relative change (`<measure>_<comparison>[_change]` columns)',
+		),
+	cumulative: z
+		.array(z.string())
+		.default([])
+		.describe('With time_grain: count or sum measures to add running totals of (`<measure>_cumulative` columns)'),
+	sample: SampleSchema.optional().describe(
+		'For exploration only: estimate from a sample of the table. Counts and sums are scaled up, and count, sum and avg measures get 95% bounds (`<measure>_lower` / `<measure>_upper` columns).',
+	),
+	top_n: TopNSchema.optional().describe(
+		'Keep the top n values of a high-cardinality dimension and aggregate all other rows into one "Other" group, instead of truncating with limit',
+	),
 	database_id: z
 		.string()
 		.optional()
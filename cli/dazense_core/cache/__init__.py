@@ -0,0 +1,10 @@
+from .project import ProjectCache
+from .results import QueryResultCache, normalize_sql
+from .singleflight import SingleFlight
+
+__all__ = [
+    "ProjectCache",
+    "QueryResultCache",
+    "SingleFlight",
+    "normalize_sql",
+]
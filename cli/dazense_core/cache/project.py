@@ -0,0 +1,104 @@
+"""In-memory cache of parsed project files (config, semantic model, business rules)."""
+
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dazense_core.config import DazenseConfig
+from dazense_core.rules import BusinessRules
+from dazense_core.semantic import SemanticModel
+
+CONFIG_FILE = Path("dazense_config.yaml")
+SEMANTIC_MODEL_FILE = Path("semantics") / "semantic_model.yml"
+BUSINESS_RULES_FILE = Path("semantics") / "business_rules.yml"
+
+# (st_mtime_ns, st_size) of a file, or None when it does not exist
+Fingerprint = tuple[int, int] | None
+
+
+@dataclass
+class _Entry:
+    fingerprint: Fingerprint
+    version: int
+    value: Any
+
+
+class ProjectCache:
+    """Caches loaded project files keyed by project folder.
+
+    Each file is re-parsed only when its mtime or size changes, or after
+    `invalidate()` bumps the context version (e.g. following a context refresh).
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[Path, Path], _Entry] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Monotonic context version, bumped on every invalidation."""
+        return self._version
+
+    def get_config(self, project_path: Path) -> DazenseConfig:
+        """Return the project's DazenseConfig, raising DazenseConfigError if it cannot be loaded."""
+        config = self._get(
+            project_path,
+            CONFIG_FILE,
+            lambda: DazenseConfig.try_load(project_path, raise_on_error=True, change_dir=False),
+        )
+        assert config is not None
+        return config
+
+    def get_semantic_model(self, project_path: Path) -> SemanticModel | None:
+        """Return the project's SemanticModel, or None if semantic_model.yml does not exist."""
+        return self._get(project_path, SEMANTIC_MODEL_FILE, lambda: SemanticModel.load(project_path))
+
+    def get_business_rules(self, project_path: Path) -> BusinessRules | None:
+        """Return the project's BusinessRules, or None if business_rules.yml does not exist."""
+        return self._get(project_path, BUSINESS_RULES_FILE, lambda: BusinessRules.load(project_path))
+
+    def invalidate(self, project_path: Path | None = None) -> None:
+        """Drop cached entries (for one project or all) and bump the context version."""
+        with self._lock:
+            self._version += 1
+            if project_path is None:
+                self._entries.clear()
+                return
+            key_path = self._key_path(project_path)
+            for key in [k for k in self._entries if k[0] == key_path]:
+                del self._entries[key]
+
+    def _get(self, project_path: Path, relative_file: Path, loader: Callable[[], Any]) -> Any:
+        key = (self._key_path(project_path), relative_file)
+        fingerprint = self._fingerprint(project_path / relative_file)
+
+        with self._lock:
+            version = self._version
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint and entry.version == version:
+                return entry.value
+
+        # Load outside the lock: a concurrent miss may parse twice, which is harmless
+        value = loader()
+
+        with self._lock:
+            # Don't store a value loaded before a concurrent invalidation
+            if self._version == version:
+                self._entries[key] = _Entry(fingerprint=fingerprint, version=version, value=value)
+        return value
+
+    @staticmethod
+    def _key_path(project_path: Path) -> Path:
+        return Path(os.path.abspath(project_path))
+
+    @staticmethod
+    def _fingerprint(path: Path) -> Fingerprint:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
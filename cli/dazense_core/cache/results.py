@@ -0,0 +1,224 @@
+"""TTL + LRU cache of SQL query results, keyed by database and normalized SQL."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlglot
+from sqlglot import exp
+
+# Database config type -> sqlglot dialect
+SQL_DIALECTS = {
+    "bigquery": "bigquery",
+    "databricks": "databricks",
+    "duckdb": "duckdb",
+    "mssql": "tsql",
+    "postgres": "postgres",
+    "redshift": "redshift",
+    "snowflake": "snowflake",
+}
+
+# Functions whose result changes between runs of the same query: random values, UUIDs and the current time
+_VOLATILE_FUNCTIONS = (
+    exp.Rand,
+    exp.Randn,
+    exp.Uuid,
+    exp.CurrentDate,
+    exp.CurrentDatetime,
+    exp.CurrentTime,
+    exp.CurrentTimestamp,
+    exp.CurrentTimestampLTZ,
+    exp.Localtime,
+    exp.Localtimestamp,
+)
+# Volatile functions sqlglot parses as anonymous calls (upper-cased names)
+_VOLATILE_FUNCTION_NAMES = {
+    "CLOCK_TIMESTAMP",
+    "NOW",
+    "STATEMENT_TIMESTAMP",
+    "SYSTIMESTAMP",
+    "TIMEOFDAY",
+    "TRANSACTION_TIMESTAMP",
+    "UNIX_TIMESTAMP",
+    "UUID_STRING",
+}
+
+
+def normalize_sql(sql: str, db_type: str | None = None) -> str | None:
+    """Canonical form of a single read-only query (whitespace, keyword case and comments removed).
+
+    Returns None when the SQL should not be cached: it does not parse, holds several
+    statements, is not a query (DDL/DML), calls a non-deterministic function (random
+    values, UUIDs, the current date or time) or samples a table without a seed.
+    """
+    dialect = SQL_DIALECTS.get(db_type or "")
+    try:
+        statements = sqlglot.parse(sql, dialect=dialect)
+    except sqlglot.errors.SqlglotError:
+        return None
+    if len(statements) != 1 or not isinstance(statements[0], exp.Query):
+        return None
+    if not _is_deterministic(statements[0]):
+        return None
+    return statements[0].sql(dialect=dialect, comments=False)
+
+
+def _is_deterministic(query: exp.Expression) -> bool:
+    if query.find(*_VOLATILE_FUNCTIONS) is not None:
+        return False
+    if any(function.name.upper() in _VOLATILE_FUNCTION_NAMES for function in query.find_all(exp.Anonymous)):
+        return False
+    # A sample draws other rows on each run unless it is seeded (REPEATABLE / SEED)
+    return all(sample.args.get("seed") is not None for sample in query.find_all(exp.TableSample))
+
+
+@dataclass
+class _Entry:
+    value: pd.DataFrame | pa.Table
+    nbytes: int
+    expires_at: float
+
+
+class QueryResultCache:
+    """Thread-safe cache of query results (pandas DataFrames or Arrow tables).
+
+    Entries expire after `ttl` seconds and the least recently used ones are evicted
+    once the in-memory total exceeds `max_bytes`. When `disk_dir` is set, results are
+    also written there as Parquet so they survive memory eviction and restarts.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        disk_dir: Path | None = None,
+        disk_max_bytes: int = 1024 * 1024 * 1024,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        if disk_dir is not None:
+            disk_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate in-memory size of all cached results."""
+        return self._nbytes
+
+    @staticmethod
+    def make_key(*parts: object) -> str:
+        """Hash key parts (e.g. connection key, result kind, context version, normalized SQL)."""
+        return hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+
+    def get(self, key: str) -> pd.DataFrame | pa.Table | None:
+        """Return a cached result, or None on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    return entry.value
+                self._pop(key)
+
+        value = self._read_disk(key)
+        if value is not None:
+            self._store(key, value)
+        return value
+
+    def put(self, key: str, value: pd.DataFrame | pa.Table) -> None:
+        """Cache a result. Results larger than the whole budget are not cached."""
+        if self._store(key, value):
+            self._write_disk(key, value)
+
+    def clear(self) -> None:
+        """Drop every cached result, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*.parquet"):
+                path.unlink(missing_ok=True)
+
+    def _store(self, key: str, value: pd.DataFrame | pa.Table) -> bool:
+        nbytes = _result_nbytes(value)
+        if nbytes > self.max_bytes:
+            return False
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = _Entry(value=value, nbytes=nbytes, expires_at=time.monotonic() + self.ttl)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+        return True
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+
+    def _disk_path(self, key: str, kind: str) -> Path:
+        assert self.disk_dir is not None
+        return self.disk_dir / f"{key}.{kind}.parquet"
+
+    def _read_disk(self, key: str) -> pd.DataFrame | pa.Table | None:
+        if self.disk_dir is None:
+            return None
+        for kind in ("arrow", "frame"):
+            path = self._disk_path(key, kind)
+            try:
+                if time.time() - path.stat().st_mtime >= self.ttl:
+                    path.unlink(missing_ok=True)
+                    continue
+                table = pq.read_table(path)
+            except (OSError, pa.ArrowException):
+                continue
+            return table if kind == "arrow" else table.to_pandas()
+        return None
+
+    def _write_disk(self, key: str, value: pd.DataFrame | pa.Table) -> None:
+        if self.disk_dir is None:
+            return
+        kind = "arrow" if isinstance(value, pa.Table) else "frame"
+        path = self._disk_path(key, kind)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            table = value if isinstance(value, pa.Table) else pa.Table.from_pandas(value, preserve_index=False)
+            pq.write_table(table, tmp_path)
+            tmp_path.replace(path)
+        except (OSError, pa.ArrowException, TypeError, ValueError):
+            # The disk tier is best-effort: e.g. object columns with mixed types are not Parquet-serializable
+            tmp_path.unlink(missing_ok=True)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        assert self.disk_dir is not None
+        files = []
+        for path in self.disk_dir.glob("*.parquet"):
+            try:
+                files.append((path.stat(), path))
+            except OSError:
+                continue
+        total = sum(stat.st_size for stat, _ in files)
+        for stat, path in sorted(files, key=lambda item: item[0].st_mtime):
+            if total <= self.disk_max_bytes and time.time() - stat.st_mtime < self.ttl:
+                continue
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
+
+
+def _result_nbytes(value: pd.DataFrame | pa.Table) -> int:
+    if isinstance(value, pa.Table):
+        return value.nbytes
+    return int(value.memory_usage(index=True, deep=True).sum())
@@ -0,0 +1,40 @@
+"""Coalesce concurrent identical async calls into a single in-flight execution."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; concurrent callers with the same key share its outcome.
+
+    The shared call runs as its own task, so a caller that goes away (e.g. a client
+    disconnect cancelling its request) never cancels the work the other callers wait on.
+    Nothing is remembered once the call finishes: later callers start a new execution.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of keys currently executing."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Await `func()`, or the already running call for `key`, and return its result (or raise its error)."""
+        call = self._calls.get(key)
+        if call is None:
+            call = asyncio.ensure_future(func())
+            self._calls[key] = call
+            call.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(call)
+
+    def _finish(self, key: Hashable, call: asyncio.Future[Any]) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
+        # Mark the error as retrieved in case every caller was cancelled before it finished
+        if not call.cancelled():
+            call.exception()
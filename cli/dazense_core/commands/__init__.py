@@ -1,8 +1,10 @@
+from dazense_core.commands.build import build
 from dazense_core.commands.chat import chat
+from dazense_core.commands.compile import compile_cmd
 from dazense_core.commands.debug import debug
 from dazense_core.commands.init import init
 from dazense_core.commands.sync import sync
 from dazense_core.commands.test import test
 from dazense_core.commands.upgrade import upgrade
 
-__all__ = ["chat", "debug", "init", "sync", "test", "upgrade"]
+__all__ = ["build", "chat", "compile_cmd", "debug", "init", "sync", "test", "upgrade"]
@@ -0,0 +1,86 @@
+"""Build command for creating and refreshing the rollup tables of the semantic model."""
+
+import sys
+from pathlib import Path
+from typing import Annotated
+
+from cyclopts import Parameter
+
+from dazense_core.config import DazenseConfig
+from dazense_core.semantic import SemanticEngine, SemanticModel
+from dazense_core.tracking import track_command
+from dazense_core.ui import create_console
+
+console = create_console()
+
+
+def select_rollups(semantic_model: SemanticModel, names: list[str] | None) -> list[tuple[str, str]]:
+    """(model, rollup) pairs to build: all of them, or those matching `model` or `model.rollup` names."""
+    rollups = [
+        (model_name, rollup_name) for model_name, m in semantic_model.models.items() for rollup_name in m.rollups
+    ]
+    if not names:
+        return rollups
+
+    selected = [(m, r) for m, r in rollups if m in names or f"{m}.{r}" in names]
+    known = {m for m, _ in rollups} | {f"{m}.{r}" for m, r in rollups}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown rollup(s): {', '.join(unknown)}. Available: {', '.join(sorted(known)) or 'none'}")
+    return selected
+
+
+@track_command("build")
+def build(
+    *,
+    rollup: Annotated[
+        list[str] | None,
+        Parameter(
+            name=["-r", "--rollup"],
+            help="Rollup(s) to build, as `model.rollup`, or `model` for all rollups of a model. Defaults to all.",
+        ),
+    ] = None,
+):
+    """Build or refresh the rollup tables declared in semantics/semantic_model.yml.
+
+    Each rollup is aggregated from its model's table. Rollups stored in the model's
+    database are created there with CREATE TABLE AS; rollups with their own `database`
+    (e.g. a local DuckDB file) are copied into it.
+    """
+    console.print("\n[bold cyan]🧱 dazense build[/bold cyan]\n")
+
+    config = DazenseConfig.try_load(exit_on_error=True)
+    assert config is not None  # Help type checker after exit_on_error=True
+
+    semantic_model = SemanticModel.load(Path.cwd())
+    if semantic_model is None:
+        console.print("[red]Error:[/red] No semantics/semantic_model.yml found")
+        sys.exit(1)
+
+    try:
+        targets = select_rollups(semantic_model, rollup)
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        sys.exit(1)
+
+    if not targets:
+        console.print("  [dim]No rollups to build[/dim]\n")
+        return
+
+    engine = SemanticEngine(semantic_model, config.databases)
+    failed = 0
+    for model_name, rollup_name in targets:
+        try:
+            rows = engine.build_rollup(model_name, rollup_name)
+            console.print(f"  [green]✓[/green] {model_name}.{rollup_name} [dim]({rows:,} rows)[/dim]")
+        except Exception as e:
+            failed += 1
+            console.print(f"  [red]✗[/red] {model_name}.{rollup_name}: {e}")
+
+    if failed:
+        console.print(f"\n[bold red]✗ {failed} of {len(targets)} rollup(s) failed[/bold red]\n")
+        sys.exit(1)
+    console.print(f"\n[bold green]✓ Built {len(targets)} rollup(s)[/bold green]\n")
+
+
+__all__ = ["build"]
@@ -0,0 +1,60 @@
+"""Compile command for validating the semantic model and writing its precompiled artifact."""
+
+import sys
+from pathlib import Path
+
+from rich.console import Console
+
+from dazense_core.config import DazenseConfig
+from dazense_core.semantic import CompileResult, compile_semantic_model
+from dazense_core.semantic.compiler import SEMANTIC_MODEL_FILE
+from dazense_core.tracking import track_command
+from dazense_core.ui import create_console
+
+console = create_console()
+
+
+def run_compile(project_path: Path, config: DazenseConfig, console: Console) -> CompileResult | None:
+    """Compile the project's semantic model, printing its problems; None if it could not be parsed."""
+    try:
+        result = compile_semantic_model(project_path, config.databases)
+    except Exception as e:
+        console.print(f"  [red]✗[/red] {SEMANTIC_MODEL_FILE}: {e}")
+        return None
+
+    for error in result.errors:
+        console.print(f"  [red]✗[/red] {error}")
+    if result.unchecked:
+        console.print(f"  [yellow]⚠[/yellow] Not checked, table not synced: {', '.join(result.unchecked)}")
+    if result.path is not None:
+        console.print(f"  [green]✓[/green] {result.path.relative_to(project_path)} [dim]({result.get_summary()})[/dim]")
+    return result
+
+
+@track_command("compile")
+def compile_cmd():
+    """Validate semantics/semantic_model.yml and write its precompiled artifact.
+
+    Every column a model references is checked against the table schemas written by
+    `dazense sync`. When they all exist, the validated models are written to
+    semantics/semantic_model.compiled, which is loaded instead of the YAML (each model
+    on first use) for as long as the YAML is unchanged. Also run at the end of `dazense sync`.
+    """
+    console.print("\n[bold cyan]🧩 dazense compile[/bold cyan]\n")
+
+    config = DazenseConfig.try_load(exit_on_error=True)
+    assert config is not None  # Help type checker after exit_on_error=True
+
+    project_path = Path.cwd()
+    if not (project_path / SEMANTIC_MODEL_FILE).exists():
+        console.print(f"[red]Error:[/red] No {SEMANTIC_MODEL_FILE} found")
+        sys.exit(1)
+
+    result = run_compile(project_path, config, console)
+    if result is None or not result.success:
+        console.print("\n[bold red]✗ Compile failed[/bold red]\n")
+        sys.exit(1)
+    console.print(f"\n[bold green]✓ Compiled {result.models} model(s)[/bold green]\n")
+
+
+__all__ = ["compile_cmd", "run_compile"]
@@ -6,7 +6,9 @@ from typing import Annotated
 
 from cyclopts import Parameter
 
+from dazense_core.commands.compile import run_compile
 from dazense_core.config import DazenseConfig
+from dazense_core.semantic.compiler import SEMANTIC_MODEL_FILE
 from dazense_core.templates.render import render_all_templates
 from dazense_core.tracking import track_command
 from dazense_core.ui import create_console
@@ -44,7 +46,8 @@ def sync(
 
     After syncing providers, renders any Jinja templates (*.j2 files) found in
     the project directory, making the `dazense` context object available for
-    accessing provider data.
+    accessing provider data. Finally compiles semantics/semantic_model.yml, if
+    any, against the synced schema (see `dazense compile`).
     """
     console.print("\n[bold cyan]🔄 dazense sync[/bold cyan]\n")
 
@@ -109,6 +112,13 @@ def sync(
         console.print("\n[bold cyan]📝 Rendering templates[/bold cyan]\n")
         template_result = render_all_templates(project_path, config, console)
 
+    # Compile the semantic model against the freshly synced schema
+    compile_failed = False
+    if (project_path / SEMANTIC_MODEL_FILE).exists():
+        console.print("\n[bold cyan]🧩 Compiling semantic model[/bold cyan]\n")
+        compile_result = run_compile(project_path, config, console)
+        compile_failed = compile_result is None or not compile_result.success
+
     # Separate successful and failed results
     successful_results = [r for r in results if r.success]
     failed_results = [r for r in results if not r.success]
@@ -147,8 +157,8 @@ def sync(
 
     console.print()
 
-    # Exit with error code if any provider or template failed
-    has_failures = bool(failed_results) or (template_result and template_result.templates_failed > 0)
+    # Exit with error code if any provider, template or the semantic model compile failed
+    has_failures = bool(failed_results) or (template_result and template_result.templates_failed > 0) or compile_failed
     if has_failures:
         sys.exit(1)
 
@@ -2,8 +2,10 @@
 
 from dataclasses import dataclass
 
+from .acceleration.provider import AccelerationSyncProvider
 from .base import SyncProvider, SyncResult
 from .databases.provider import DatabaseSyncProvider
+from .dimension_values.provider import DimensionValuesSyncProvider
 from .notion.provider import NotionSyncProvider
 from .repositories.provider import RepositorySyncProvider
 
@@ -12,6 +14,8 @@ PROVIDER_REGISTRY: dict[str, SyncProvider] = {
     "notion": NotionSyncProvider(),
     "repositories": RepositorySyncProvider(),
     "databases": DatabaseSyncProvider(),
+    "acceleration": AccelerationSyncProvider(),
+    "dimension_values": DimensionValuesSyncProvider(),
 }
 
 # Default providers in order of execution
@@ -69,10 +73,12 @@ def get_providers_by_names(names: list[str]) -> list[ProviderSelection]:
 
 
 __all__ = [
+    "AccelerationSyncProvider",
     "SyncProvider",
     "SyncResult",
     "ProviderSelection",
     "DatabaseSyncProvider",
+    "DimensionValuesSyncProvider",
     "RepositorySyncProvider",
     "PROVIDER_REGISTRY",
     "PROVIDER_CHOICES",
@@ -0,0 +1,5 @@
+"""Acceleration syncing functionality for extracting local copies of hot semantic models."""
+
+from .provider import AccelerationSyncProvider
+
+__all__ = ["AccelerationSyncProvider"]
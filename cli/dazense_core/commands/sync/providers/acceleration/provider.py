@@ -0,0 +1,85 @@
+"""Acceleration sync provider implementation."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dazense_core.config import AnyDatabaseConfig, DazenseConfig
+from dazense_core.semantic import SemanticEngine, SemanticModel
+from dazense_core.semantic.acceleration import ACCELERATION_OUTPUT_DIR
+from dazense_core.ui import create_console
+
+from ..base import SyncProvider, SyncResult
+
+console = create_console()
+
+
+@dataclass
+class AcceleratedModel:
+    """A semantic model with `acceleration` configured, with what is needed to extract it."""
+
+    name: str
+    semantic_model: SemanticModel
+    databases: list[AnyDatabaseConfig]
+
+
+class AccelerationSyncProvider(SyncProvider):
+    """Provider for extracting local DuckDB/Parquet copies of accelerated semantic models."""
+
+    @property
+    def name(self) -> str:
+        return "Acceleration"
+
+    @property
+    def emoji(self) -> str:
+        return "⚡"
+
+    @property
+    def default_output_dir(self) -> str:
+        return ACCELERATION_OUTPUT_DIR
+
+    def get_items(self, config: DazenseConfig) -> list[AcceleratedModel]:
+        semantic_model = SemanticModel.load(Path.cwd())
+        if semantic_model is None:
+            return []
+        return [
+            AcceleratedModel(name=name, semantic_model=semantic_model, databases=config.databases)
+            for name, model_def in semantic_model.models.items()
+            if model_def.acceleration is not None
+        ]
+
+    def sync(self, items: list[Any], output_path: Path, project_path: Path | None = None) -> SyncResult:
+        """Extract the local copy of each accelerated model.
+
+        Copies are written under the semantic model's project folder, where the engine
+        reads them, so a custom output directory only changes what is displayed.
+
+        Args:
+                items: Accelerated models to extract
+                output_path: Folder of the local copies
+                project_path: Path to the dazense project root (unused for acceleration)
+
+        Returns:
+                SyncResult with the number of extracted models
+        """
+        if not items:
+            return SyncResult(provider_name=self.name, items_synced=0)
+
+        console.print(f"\n[bold cyan]{self.emoji} Syncing {self.name}[/bold cyan]")
+        console.print(f"[dim]Location:[/dim] {output_path.absolute()}\n")
+
+        engine = SemanticEngine(items[0].semantic_model, items[0].databases)
+        rows: dict[str, int] = {}
+        for item in items:
+            try:
+                rows[item.name] = engine.accelerate(item.name)
+                console.print(f"  [green]✓[/green] {item.name} [dim]({rows[item.name]:,} rows)[/dim]")
+            except Exception as e:
+                console.print(f"  [yellow]⚠[/yellow] Failed to extract {item.name}: {e}")
+
+        return SyncResult(
+            provider_name=self.name,
+            items_synced=len(rows),
+            details={"rows": rows},
+            summary=f"{len(rows)} models copied locally",
+        )
@@ -4,6 +4,8 @@ from typing import Any
 
 from ibis import BaseBackend
 
+from dazense_core.config.databases import DatabaseConfig, get_schema_cache
+
 
 class DatabaseContext:
     """Context object passed to Jinja2 templates during database sync.
@@ -19,8 +21,10 @@ class DatabaseContext:
         table_name: str,
         table_description: str | None = None,
         column_descriptions: dict[str, str] | None = None,
+        db_config: DatabaseConfig | None = None,
     ):
         self._conn = conn
+        self._db_config = db_config
         self._schema = schema
         self._table_name = table_name
         self._table_ref = None
@@ -30,7 +34,13 @@ class DatabaseContext:
     @property
     def table(self):
         if self._table_ref is None:
-            self._table_ref = self._conn.table(self._table_name, database=self._schema)
+            if self._db_config is None:
+                self._table_ref = self._conn.table(self._table_name, database=self._schema)
+            else:
+                # Never from the sync snapshot: this context is what (re)writes it
+                self._table_ref = get_schema_cache().table(
+                    self._conn, self._db_config, self._table_name, self._schema, snapshot=False
+                )
         return self._table_ref
 
     def columns(self) -> list[dict[str, Any]]:
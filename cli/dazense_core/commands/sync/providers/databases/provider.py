@@ -80,7 +80,14 @@ def sync_database(
             else:
                 table_desc = db_config.fetch_table_description(conn, schema, table)
                 col_descs = db_config.fetch_column_descriptions(conn, schema, table)
-                ctx = DatabaseContext(conn, schema, table, table_description=table_desc, column_descriptions=col_descs)
+                ctx = DatabaseContext(
+                    conn,
+                    schema,
+                    table,
+                    table_description=table_desc,
+                    column_descriptions=col_descs,
+                    db_config=db_config,
+                )
 
             for template_name in templates:
                 # Derive output filename: "databases/columns.md.j2" → "columns.md"
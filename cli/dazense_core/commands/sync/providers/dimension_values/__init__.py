@@ -0,0 +1,5 @@
+"""Dimension value syncing functionality for indexing the values of low-cardinality dimensions."""
+
+from .provider import DimensionValuesSyncProvider
+
+__all__ = ["DimensionValuesSyncProvider"]
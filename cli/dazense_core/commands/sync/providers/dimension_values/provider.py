@@ -0,0 +1,88 @@
+"""Dimension values sync provider implementation."""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from dazense_core.config import AnyDatabaseConfig, DazenseConfig
+from dazense_core.semantic import SemanticEngine, SemanticModel
+from dazense_core.semantic.values import DEFAULT_MAX_VALUES, VALUE_INDEX_OUTPUT_DIR
+from dazense_core.ui import create_console
+
+from ..base import SyncProvider, SyncResult
+
+console = create_console()
+
+
+@dataclass
+class IndexedModel:
+    """A semantic model whose dimension values are indexed, with what is needed to query it."""
+
+    name: str
+    semantic_model: SemanticModel
+    databases: list[AnyDatabaseConfig]
+
+
+class DimensionValuesSyncProvider(SyncProvider):
+    """Provider for indexing the distinct values of low-cardinality semantic model dimensions."""
+
+    @property
+    def name(self) -> str:
+        return "Dimension values"
+
+    @property
+    def emoji(self) -> str:
+        return "🔎"
+
+    @property
+    def default_output_dir(self) -> str:
+        return VALUE_INDEX_OUTPUT_DIR
+
+    def get_items(self, config: DazenseConfig) -> list[IndexedModel]:
+        semantic_model = SemanticModel.load(Path.cwd())
+        if semantic_model is None:
+            return []
+        return [
+            IndexedModel(name=name, semantic_model=semantic_model, databases=config.databases)
+            for name, model_def in semantic_model.models.items()
+            if model_def.dimensions
+        ]
+
+    def sync(self, items: list[Any], output_path: Path, project_path: Path | None = None) -> SyncResult:
+        """Index the values of each model's dimensions with at most DAZENSE_DIMENSION_INDEX_MAX_VALUES values.
+
+        Indexes are written under the semantic model's project folder, where the engine
+        reads them, so a custom output directory only changes what is displayed.
+
+        Args:
+                items: Semantic models to index
+                output_path: Folder of the value indexes
+                project_path: Path to the dazense project root (unused for dimension values)
+
+        Returns:
+                SyncResult with the number of indexed models
+        """
+        if not items:
+            return SyncResult(provider_name=self.name, items_synced=0)
+
+        console.print(f"\n[bold cyan]{self.emoji} Syncing {self.name}[/bold cyan]")
+        console.print(f"[dim]Location:[/dim] {output_path.absolute()}\n")
+
+        max_values = int(os.environ.get("DAZENSE_DIMENSION_INDEX_MAX_VALUES", DEFAULT_MAX_VALUES))
+        engine = SemanticEngine(items[0].semantic_model, items[0].databases)
+        dimensions: dict[str, int] = {}
+        for item in items:
+            try:
+                indexed = engine.index_dimension_values(item.name, max_values)
+                dimensions[item.name] = len(indexed)
+                console.print(f"  [green]✓[/green] {item.name} [dim]({len(indexed)} dimensions indexed)[/dim]")
+            except Exception as e:
+                console.print(f"  [yellow]⚠[/yellow] Failed to index {item.name}: {e}")
+
+        return SyncResult(
+            provider_name=self.name,
+            items_synced=len(dimensions),
+            details={"dimensions": dimensions},
+            summary=f"{sum(dimensions.values())} dimensions indexed across {len(dimensions)} models",
+        )
@@ -205,7 +205,10 @@ class DazenseConfig(BaseModel):
         content = config_file.read_text()
         content = cls._process_env_vars(content)
         data = yaml.safe_load(content)
-        return cls.model_validate(data)
+        config = cls.model_validate(data)
+        for db in config.databases:
+            db.set_project_path(path)
+        return config
 
     def get_connection(self, name: str) -> BaseBackend:
         """Get an Ibis connection by database name."""
@@ -225,6 +228,7 @@ class DazenseConfig(BaseModel):
         *,
         exit_on_error: bool = False,
         raise_on_error: bool = False,
+        change_dir: bool = True,
     ) -> "DazenseConfig | None":
         """Try to load config from path.
 
@@ -233,6 +237,8 @@ class DazenseConfig(BaseModel):
                   environment variable if set, otherwise current directory.
             exit_on_error: If True, prints error message and calls sys.exit(1) on failure.
             raise_on_error: If True, raises DazenseConfigError on failure.
+            change_dir: If True, changes the process working directory to the project folder.
+                Long-running servers pass False since the cwd is shared by concurrent requests.
         Returns:
             DazenseConfig if loaded successfully, None if failed and both flags are False.
         """
@@ -257,7 +263,8 @@ class DazenseConfig(BaseModel):
             return None
 
         try:
-            os.chdir(path)
+            if change_dir:
+                os.chdir(path)
             return cls.load(path)
         except yaml.YAMLError as e:
             handle_error(f"Failed to load dazense_config.yaml: Invalid YAML syntax: {e}")
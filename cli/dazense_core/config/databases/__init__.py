@@ -7,8 +7,10 @@ from .bigquery import BigQueryConfig
 from .databricks import DatabricksConfig
 from .duckdb import DuckDBConfig
 from .mssql import MssqlConfig
+from .pool import ConnectionPool, get_connection_pool
 from .postgres import PostgresConfig
 from .redshift import RedshiftConfig
+from .schema_cache import SchemaCache, get_schema_cache
 from .snowflake import SnowflakeConfig
 
 # =============================================================================
@@ -65,6 +67,7 @@ def parse_database_config(data: dict) -> DatabaseConfig:
 __all__ = [
     "AnyDatabaseConfig",
     "BigQueryConfig",
+    "ConnectionPool",
     "DATABASE_CONFIG_CLASSES",
     "DatabaseAccessor",
     "DatabaseConfig",
@@ -75,4 +78,7 @@ __all__ = [
     "SnowflakeConfig",
     "PostgresConfig",
     "RedshiftConfig",
+    "SchemaCache",
+    "get_connection_pool",
+    "get_schema_cache",
 ]
@@ -2,12 +2,20 @@ from __future__ import annotations
 
 import fnmatch
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import contextmanager
 from enum import Enum
+from pathlib import Path
 
 import pandas as pd
+import pyarrow as pa
 import questionary
 from ibis import BaseBackend
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from dazense_core.results import cursor_to_arrow, cursor_to_batches
+
+from .pool import get_connection_pool
 
 
 class DatabaseType(str, Enum):
@@ -54,6 +62,24 @@ class DatabaseConfig(BaseModel, ABC):
         description="Which default templates to render per table (e.g., ['columns', 'description']). Defaults to all.",
     )
 
+    # Folder of the dazense_config.yaml this config was loaded from; relative paths resolve against it
+    _project_path: Path | None = PrivateAttr(default=None)
+
+    @property
+    def project_path(self) -> Path | None:
+        return self._project_path
+
+    def set_project_path(self, project_path: Path) -> None:
+        """Anchor relative file paths in this config to the project folder instead of the process cwd."""
+        self._project_path = project_path.resolve()
+
+    def resolve_path(self, path: str) -> str:
+        """Resolve a (possibly relative, possibly ~-prefixed) file path from this config."""
+        expanded = Path(path).expanduser()
+        if expanded.is_absolute() or self._project_path is None:
+            return str(expanded)
+        return str(self._project_path / expanded)
+
     @classmethod
     @abstractmethod
     def promptConfig(cls) -> DatabaseConfig:
@@ -65,18 +91,56 @@ class DatabaseConfig(BaseModel, ABC):
         """Create an Ibis connection for this database."""
         ...
 
+    def connect_for_write(self) -> BaseBackend:
+        """Create an Ibis connection that may create tables (e.g. for `dazense build`)."""
+        return self.connect()
+
     def execute_sql(self, sql: str) -> pd.DataFrame:
-        """Execute arbitrary SQL and return results as a DataFrame."""
-        conn = self.connect()
-        cursor = conn.raw_sql(sql)  # type: ignore[union-attr]
+        """Execute arbitrary SQL on a pooled connection and return results as a DataFrame."""
+        with get_connection_pool().connection(self) as conn:
+            cursor = conn.raw_sql(sql)  # type: ignore[union-attr]
+
+            if hasattr(cursor, "fetchdf"):
+                return cursor.fetchdf()
+            if hasattr(cursor, "to_dataframe"):
+                return cursor.to_dataframe()
 
-        if hasattr(cursor, "fetchdf"):
-            return cursor.fetchdf()
-        if hasattr(cursor, "to_dataframe"):
-            return cursor.to_dataframe()
+            columns: list[str] = [desc[0] for desc in cursor.description]
+            return pd.DataFrame(cursor.fetchall(), columns=columns)  # type: ignore[arg-type]
 
-        columns: list[str] = [desc[0] for desc in cursor.description]
-        return pd.DataFrame(cursor.fetchall(), columns=columns)  # type: ignore[arg-type]
+    def execute_sql_arrow(self, sql: str) -> pa.Table:
+        """Execute arbitrary SQL on a pooled connection and return results as an Arrow table.
+
+        Uses the driver's native Arrow fetch when available, skipping per-row Python conversion.
+        """
+        with get_connection_pool().connection(self) as conn:
+            cursor = conn.raw_sql(sql)  # type: ignore[union-attr]
+            return cursor_to_arrow(cursor)
+
+    def stream_sql_arrow(self, sql: str, batch_size: int = 10_000) -> Iterator[pa.RecordBatch]:
+        """Execute SQL and yield the result in Arrow record batches of at most `batch_size` rows.
+
+        The pooled connection is held until the generator is exhausted or closed, so
+        closing it early stops fetching and bounds memory to roughly one batch.
+        """
+        with get_connection_pool().connection(self) as conn:
+            with self.open_stream_cursor(conn, sql) as cursor:
+                yield from cursor_to_batches(cursor, batch_size)
+
+    @contextmanager
+    def open_stream_cursor(self, conn: BaseBackend, sql: str) -> Iterator:
+        """Open a cursor for incremental fetching. Override for drivers that buffer results client-side."""
+        yield conn.raw_sql(sql)  # type: ignore[union-attr]
+
+    def is_connection_alive(self, conn: BaseBackend) -> bool:
+        """Cheap liveness probe used by the connection pool before reusing an idle connection."""
+        try:
+            cursor = conn.raw_sql("SELECT 1")  # type: ignore[union-attr]
+            if hasattr(cursor, "fetchall"):
+                cursor.fetchall()
+            return True
+        except Exception:
+            return False
 
     def matches_pattern(self, schema: str, table: str) -> bool:
         """Check if a schema.table matches the include/exclude patterns.
@@ -96,7 +96,7 @@ class BigQueryConfig(DatabaseConfig):
             from google.oauth2 import service_account
 
             credentials = service_account.Credentials.from_service_account_file(
-                self.credentials_path,
+                self.resolve_path(self.credentials_path),
                 scopes=["https://www.googleapis.com/auth/bigquery"],
             )
             kwargs["credentials"] = credentials
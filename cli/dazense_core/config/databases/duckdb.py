@@ -27,10 +27,18 @@ class DuckDBConfig(DatabaseConfig):
     def connect(self) -> BaseBackend:
         """Create an Ibis DuckDB connection."""
         return ibis.duckdb.connect(
-            database=self.path,
+            database=self.path if self.path == ":memory:" else self.resolve_path(self.path),
             read_only=False if self.path == ":memory:" else True,
         )
 
+    def connect_for_write(self) -> BaseBackend:
+        """Create a read-write Ibis DuckDB connection, creating the database file if needed."""
+        if self.path == ":memory:":
+            return self.connect()
+        path = Path(self.resolve_path(self.path))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return ibis.duckdb.connect(database=str(path))
+
     def get_database_name(self) -> str:
         """Get the database name for DuckDB."""
         if self.path == ":memory:":
@@ -0,0 +1,217 @@
+"""Process-wide registry of reusable Ibis connections, keyed by database config hash."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ibis import BaseBackend
+
+if TYPE_CHECKING:
+    from .base import DatabaseConfig
+
+
+@dataclass
+class _IdleConnection:
+    conn: BaseBackend
+    released_at: float
+    needs_check: bool = False
+
+
+class ConnectionPool:
+    """Thread-safe pool of Ibis connections shared by all requests in the process.
+
+    Connections are checked out exclusively, so a backend connection is never used
+    by two threads at once. Idle connections are closed after `idle_timeout` seconds
+    and health-checked on checkout when they sat idle for `health_check_after`
+    seconds or were returned after a failure.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 16,
+        idle_timeout: float = 300.0,
+        health_check_after: float = 30.0,
+        acquire_timeout: float = 60.0,
+    ):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+        self._idle: dict[str, list[_IdleConnection]] = {}
+        self._size = 0
+        # Bumped by close_all: connections checked out under an older generation are closed on release
+        self._generation = 0
+        self._checked_out: dict[int, int] = {}
+        self._cond = threading.Condition()
+
+    @staticmethod
+    def config_key(db_config: DatabaseConfig) -> str:
+        """Hash of the full database config, so edited credentials never reuse stale connections.
+
+        The project folder is part of the key because relative paths (e.g. a DuckDB file)
+        resolve against it.
+        """
+        payload = f"{db_config.project_path}|{db_config.model_dump_json()}"
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle or checked out."""
+        return self._size
+
+    @contextmanager
+    def connection(self, db_config: DatabaseConfig) -> Iterator[BaseBackend]:
+        """Check out a connection for the duration of the block."""
+        conn = self.acquire(db_config)
+        failed = False
+        try:
+            yield conn
+        except GeneratorExit:
+            # A streaming consumer stopped early; the connection itself is fine
+            raise
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.release(db_config, conn, failed=failed)
+
+    def acquire(self, db_config: DatabaseConfig) -> BaseBackend:
+        """Check out an idle connection for this config, or open a new one."""
+        key = self.config_key(db_config)
+        deadline = time.monotonic() + self.acquire_timeout
+
+        while True:
+            to_close: list[BaseBackend] = []
+            idle: _IdleConnection | None = None
+            with self._cond:
+                to_close.extend(self._pop_expired())
+                while True:
+                    if self._idle.get(key):
+                        idle = self._idle[key].pop()
+                        break
+                    if self._size < self.max_size:
+                        self._size += 1
+                        break
+                    evicted = self._pop_least_recently_used()
+                    if evicted is not None:
+                        # Reuse the evicted connection's slot for this config
+                        to_close.append(evicted)
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Timed out waiting for a database connection ({self.max_size} in use)")
+                    self._cond.wait(remaining)
+
+            self._close_all(to_close)
+
+            if idle is None:
+                try:
+                    return self._check_out(db_config.connect())
+                except BaseException:
+                    self._discard_slot()
+                    raise
+
+            stale = time.monotonic() - idle.released_at >= self.health_check_after
+            if (idle.needs_check or stale) and not db_config.is_connection_alive(idle.conn):
+                self._close_all([idle.conn])
+                self._discard_slot()
+                continue
+            return self._check_out(idle.conn)
+
+    def release(self, db_config: DatabaseConfig, conn: BaseBackend, failed: bool = False) -> None:
+        """Return a checked-out connection to the pool, or close it if close_all ran since its checkout."""
+        key = self.config_key(db_config)
+        with self._cond:
+            retired = self._checked_out.pop(id(conn), self._generation) != self._generation
+            if retired:
+                self._size -= 1
+            else:
+                self._idle.setdefault(key, []).append(
+                    _IdleConnection(conn=conn, released_at=time.monotonic(), needs_check=failed)
+                )
+            self._cond.notify()
+        if retired:
+            self._close_all([conn])
+
+    def close_all(self) -> None:
+        """Close every idle connection now, and every checked-out one when it is released."""
+        with self._cond:
+            to_close = [idle.conn for idles in self._idle.values() for idle in idles]
+            self._size -= len(to_close)
+            self._idle.clear()
+            self._generation += 1
+            self._cond.notify_all()
+        self._close_all(to_close)
+
+    def _check_out(self, conn: BaseBackend) -> BaseBackend:
+        with self._cond:
+            self._checked_out[id(conn)] = self._generation
+        return conn
+
+    def _pop_expired(self) -> list[BaseBackend]:
+        now = time.monotonic()
+        expired: list[BaseBackend] = []
+        for key, idles in list(self._idle.items()):
+            keep = [idle for idle in idles if now - idle.released_at < self.idle_timeout]
+            expired.extend(idle.conn for idle in idles if now - idle.released_at >= self.idle_timeout)
+            if keep:
+                self._idle[key] = keep
+            else:
+                del self._idle[key]
+        self._size -= len(expired)
+        return expired
+
+    def _pop_least_recently_used(self) -> BaseBackend | None:
+        oldest_key: str | None = None
+        oldest_index = 0
+        for key, idles in self._idle.items():
+            for index, idle in enumerate(idles):
+                if oldest_key is None or idle.released_at < self._idle[oldest_key][oldest_index].released_at:
+                    oldest_key, oldest_index = key, index
+        if oldest_key is None:
+            return None
+        idle = self._idle[oldest_key].pop(oldest_index)
+        if not self._idle[oldest_key]:
+            del self._idle[oldest_key]
+        return idle.conn
+
+    def _discard_slot(self) -> None:
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_all(conns: list[BaseBackend]) -> None:
+        for conn in conns:
+            try:
+                conn.disconnect()
+            except Exception:
+                pass
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use.
+
+    Environment variables:
+        DAZENSE_POOL_MAX_SIZE: Maximum number of open connections (default: 16)
+        DAZENSE_POOL_IDLE_TIMEOUT: Seconds before an idle connection is closed (default: 300)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                max_size=int(os.environ.get("DAZENSE_POOL_MAX_SIZE", 16)),
+                idle_timeout=float(os.environ.get("DAZENSE_POOL_IDLE_TIMEOUT", 300)),
+            )
+        return _pool
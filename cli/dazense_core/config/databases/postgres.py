@@ -1,3 +1,6 @@
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
 from typing import Literal
 
 import ibis
@@ -10,6 +13,16 @@ from dazense_core.ui import ask_text
 from .base import DatabaseConfig
 
 
+@contextmanager
+def server_side_cursor(conn: BaseBackend, sql: str) -> Iterator:
+    """Open a named (server-side) psycopg cursor so fetchmany() streams instead of buffering all rows."""
+    raw = conn.con  # type: ignore[attr-defined]
+    with raw.transaction():
+        with raw.cursor(name=f"dazense_{uuid.uuid4().hex}") as cursor:
+            cursor.execute(sql)
+            yield cursor
+
+
 class PostgresConfig(DatabaseConfig):
     """PostgreSQL-specific configuration."""
 
@@ -68,6 +81,12 @@ class PostgresConfig(DatabaseConfig):
         """Get the database name for Postgres."""
         return self.database
 
+    @contextmanager
+    def open_stream_cursor(self, conn: BaseBackend, sql: str) -> Iterator:
+        """psycopg buffers client-side cursors entirely, so stream through a server-side cursor."""
+        with server_side_cursor(conn, sql) as cursor:
+            yield cursor
+
     def get_schemas(self, conn: BaseBackend) -> list[str]:
         if self.schema_name:
             return [self.schema_name]
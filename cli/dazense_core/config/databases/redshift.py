@@ -1,3 +1,5 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Literal
 
@@ -10,21 +12,29 @@ from dazense_core.config.exceptions import InitError
 from dazense_core.ui import ask_confirm, ask_text
 
 from .base import DatabaseConfig
+from .postgres import server_side_cursor
+from .schema_cache import get_schema_cache
 
 
 class RedshiftDatabaseContext:
     """Redshift-specific context that bypasses Ibis's problematic pg_enum queries."""
 
-    def __init__(self, conn: BaseBackend, schema: str, table_name: str):
+    def __init__(self, conn: BaseBackend, schema: str, table_name: str, db_config: DatabaseConfig | None = None):
         self._conn = conn
         self._schema = schema
         self._table_name = table_name
+        self._db_config = db_config
         self._table_ref = None
 
     @property
     def table(self):
         if self._table_ref is None:
-            self._table_ref = self._conn.table(self._table_name, database=self._schema)
+            if self._db_config is None:
+                self._table_ref = self._conn.table(self._table_name, database=self._schema)
+            else:
+                self._table_ref = get_schema_cache().table(
+                    self._conn, self._db_config, self._table_name, self._schema, snapshot=False
+                )
         return self._table_ref
 
     def columns(self) -> list[dict[str, Any]]:
@@ -249,7 +259,7 @@ class RedshiftConfig(DatabaseConfig):
 
         # Set up SSH tunnel if configured
         if self.ssh_tunnel:
-            ssh_pkey_path = Path(self.ssh_tunnel.ssh_private_key_path).expanduser()
+            ssh_pkey_path = Path(self.resolve_path(self.ssh_tunnel.ssh_private_key_path))
 
             tunnel = SSHTunnelForwarder(
                 (self.ssh_tunnel.ssh_host, self.ssh_tunnel.ssh_port),
@@ -286,6 +296,12 @@ class RedshiftConfig(DatabaseConfig):
         """Get the database name for Redshift."""
         return self.database
 
+    @contextmanager
+    def open_stream_cursor(self, conn: BaseBackend, sql: str) -> Iterator:
+        """Redshift is reached through psycopg, so stream through a server-side cursor as well."""
+        with server_side_cursor(conn, sql) as cursor:
+            yield cursor
+
     def get_schemas(self, conn: BaseBackend) -> list[str]:
         if self.schema_name:
             return [self.schema_name]
@@ -295,7 +311,7 @@ class RedshiftConfig(DatabaseConfig):
 
     def create_context(self, conn: BaseBackend, schema: str, table_name: str) -> RedshiftDatabaseContext:
         """Create a Redshift-specific database context that avoids pg_enum queries."""
-        return RedshiftDatabaseContext(conn, schema, table_name)
+        return RedshiftDatabaseContext(conn, schema, table_name, db_config=self)
 
     def check_connection(self) -> tuple[bool, str]:
         """Test connectivity to Redshift."""
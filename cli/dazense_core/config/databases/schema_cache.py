@@ -0,0 +1,210 @@
+"""Process-wide TTL cache of Ibis table handles, so table schemas are introspected once per connection config."""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import ibis
+import ibis.expr.operations as ops
+import ibis.expr.types as ir
+from ibis import BaseBackend
+
+from .pool import ConnectionPool
+
+if TYPE_CHECKING:
+    from .base import DatabaseConfig
+
+# Folder written by `dazense sync` for databases, relative to the project folder
+SYNC_OUTPUT_DIR = "databases"
+
+# A column line of the default columns.md template: "- name (type[ NOT NULL][, "description"])"
+_COLUMN_LINE = re.compile(r'^- (?P<name>.+?) \((?P<type>[^"]+?)(?P<not_null> NOT NULL)?(?:, ".*")?\)$')
+
+
+def sync_snapshot_path(db_config: DatabaseConfig, schema: str, table: str) -> Path | None:
+    """Path of the columns.md written by `dazense sync` for a table, or None if the config has no project."""
+    if db_config.project_path is None:
+        return None
+    return (
+        db_config.project_path
+        / SYNC_OUTPUT_DIR
+        / f"type={db_config.type}"
+        / f"database={db_config.get_database_name()}"
+        / f"schema={schema}"
+        / f"table={table}"
+        / "columns.md"
+    )
+
+
+def parse_columns_snapshot(text: str) -> ibis.Schema | None:
+    """Parse the column list of a columns.md snapshot, or None if it is not in the default template format."""
+    fields = {}
+    for line in text.splitlines():
+        match = _COLUMN_LINE.match(line.strip())
+        if match is None:
+            continue
+        try:
+            dtype = ibis.dtype(match["type"])
+        except Exception:
+            return None
+        fields[match["name"]] = dtype.copy(nullable=match["not_null"] is None)
+    return ibis.schema(fields) if fields else None
+
+
+@dataclass
+class _Entry:
+    table: ir.Table
+    expires_at: float
+
+
+class SchemaCache:
+    """Caches `conn.table()` handles per connection config and (schema, table) for `ttl` seconds.
+
+    A handle is rebound to whichever pooled connection asks for it. On a miss, the
+    columns.md snapshot written by `dazense sync` is used instead of a catalog lookup
+    when available (unless that table was invalidated since, e.g. after a failed query).
+    Tables marked unavailable (e.g. rollups not built yet) are skipped by callers for
+    `unavailable_ttl` seconds, or until they are invalidated or the cache is cleared.
+    """
+
+    def __init__(self, ttl: float = 3600.0, unavailable_ttl: float = 300.0):
+        self.ttl = ttl
+        self.unavailable_ttl = unavailable_ttl
+        self._entries: dict[tuple[str, str | None, str], _Entry] = {}
+        # Tables whose snapshot proved stale: reload them from the catalog
+        self._skip_snapshot: set[tuple[str, str | None, str]] = set()
+        # Tables a query could not read, which callers with a fallback skip until the mark expires
+        self._unavailable: dict[tuple[str, str | None, str], float] = {}
+        self._lock = threading.Lock()
+
+    def table(
+        self,
+        conn: BaseBackend,
+        db_config: DatabaseConfig,
+        name: str,
+        database: str | None = None,
+        snapshot: bool = True,
+    ) -> ir.Table:
+        """Return a table handle bound to `conn`, introspecting its schema only on a cache miss."""
+        if self.ttl <= 0:
+            return conn.table(name, database=database)
+
+        key = (ConnectionPool.config_key(db_config), database, name)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            use_snapshot = snapshot and key not in self._skip_snapshot
+        if entry is not None and entry.expires_at > now:
+            return _rebind(entry.table, conn)
+
+        table = self._from_snapshot(conn, db_config, name, database) if use_snapshot else None
+        if table is None:
+            table = conn.table(name, database=database)
+        with self._lock:
+            self._entries[key] = _Entry(table=table, expires_at=now + self.ttl)
+        return table
+
+    def invalidate(
+        self, db_config: DatabaseConfig | None = None, name: str | None = None, database: str | None = None
+    ) -> None:
+        """Drop cached handles (all, of one connection config, or of one of its tables); their snapshots are no longer trusted."""
+        with self._lock:
+            if db_config is None:
+                self._skip_snapshot.update(self._entries)
+                self._entries.clear()
+                return
+            config_key = ConnectionPool.config_key(db_config)
+            if name is not None:
+                # E.g. after (re)building it: an unavailable table is read again
+                self._unavailable.pop((config_key, database, name), None)
+                keys = [(config_key, database, name)]
+            else:
+                keys = [k for k in self._entries if k[0] == config_key]
+            for key in keys:
+                self._skip_snapshot.add(key)
+                self._entries.pop(key, None)
+
+    def mark_unavailable(self, db_config: DatabaseConfig, name: str, database: str | None = None) -> None:
+        """Remember that a table could not be read (e.g. a rollup not built yet) for `unavailable_ttl` seconds."""
+        with self._lock:
+            self._unavailable[(ConnectionPool.config_key(db_config), database, name)] = (
+                time.monotonic() + self.unavailable_ttl
+            )
+
+    def is_unavailable(self, db_config: DatabaseConfig, name: str, database: str | None = None) -> bool:
+        key = (ConnectionPool.config_key(db_config), database, name)
+        with self._lock:
+            expires_at = self._unavailable.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                # Checked again, e.g. a rollup built since by `dazense build` in another process
+                del self._unavailable[key]
+                return False
+            return True
+
+    def clear(self) -> None:
+        """Forget everything, including which snapshots were stale (e.g. after a new sync)."""
+        with self._lock:
+            self._entries.clear()
+            self._skip_snapshot.clear()
+            self._unavailable.clear()
+
+    @staticmethod
+    def _from_snapshot(
+        conn: BaseBackend, db_config: DatabaseConfig, name: str, database: str | None
+    ) -> ir.Table | None:
+        path = sync_snapshot_path(db_config, database, name) if database else None
+        if path is None:
+            return None
+        try:
+            schema = parse_columns_snapshot(path.read_text())
+        except OSError:
+            return None
+        if schema is None:
+            return None
+
+        # Split "catalog.schema" the way the backend's own table() does
+        to_sqlglot_table = getattr(conn, "_to_sqlglot_table", None)
+        if to_sqlglot_table is not None:
+            table_loc = to_sqlglot_table(database)
+            namespace = ops.Namespace(catalog=table_loc.catalog or None, database=table_loc.db or None)
+        else:
+            namespace = ops.Namespace(database=database)
+        return ops.DatabaseTable(name, schema=schema, source=conn, namespace=namespace).to_expr()
+
+
+def _rebind(table: ir.Table, conn: BaseBackend) -> ir.Table:
+    """Point the table handles of an expression at another connection to the same database."""
+    node = table.op()
+    replacements = {t: t.copy(source=conn) for t in node.find(ops.DatabaseTable) if t.source is not conn}
+    if not replacements:
+        return table
+    return node.replace(replacements).to_expr()
+
+
+_schema_cache: SchemaCache | None = None
+_schema_cache_lock = threading.Lock()
+
+
+def get_schema_cache() -> SchemaCache:
+    """Return the process-wide schema cache, creating it on first use.
+
+    Environment variables:
+        DAZENSE_SCHEMA_CACHE_TTL: Seconds a table schema is reused, 0 to disable (default: 3600)
+        DAZENSE_UNAVAILABLE_TABLE_TTL: Seconds a missing rollup table is skipped before it is tried again (default: 300)
+    """
+    global _schema_cache
+    with _schema_cache_lock:
+        if _schema_cache is None:
+            _schema_cache = SchemaCache(
+                ttl=float(os.environ.get("DAZENSE_SCHEMA_CACHE_TTL", 3600)),
+                unavailable_ttl=float(os.environ.get("DAZENSE_UNAVAILABLE_TABLE_TTL", 300)),
+            )
+        return _schema_cache
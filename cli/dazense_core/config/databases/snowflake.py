@@ -98,7 +98,7 @@ class SnowflakeConfig(DatabaseConfig):
             UI.info(f"[yellow]Using authenticator: {self.authenticator}[/yellow]")
 
         if self.private_key_path:
-            with open(self.private_key_path, "rb") as key_file:
+            with open(self.resolve_path(self.private_key_path), "rb") as key_file:
                 private_key = serialization.load_pem_private_key(
                     key_file.read(),
                     password=self.passphrase.encode() if self.passphrase else None,
@@ -113,6 +113,9 @@ class SnowflakeConfig(DatabaseConfig):
         elif self.password:
             kwargs["password"] = self.password
 
+        # Server-side binding, so metric queries are prepared once per shape (see semantic.prepared)
+        kwargs["paramstyle"] = "qmark"
+
         return ibis.snowflake.connect(**kwargs, create_object_udfs=False)
 
     def get_database_name(self) -> str:
@@ -2,14 +2,16 @@ from cyclopts import App
 from dotenv import load_dotenv
 
 from dazense_core import __version__
-from dazense_core.commands import chat, debug, init, sync, test, upgrade
+from dazense_core.commands import build, chat, compile_cmd, debug, init, sync, test, upgrade
 from dazense_core.version import check_for_updates
 
 load_dotenv()
 
 app = App(version=__version__)
 
+app.command(build)
 app.command(chat)
+app.command(compile_cmd, name="compile")
 app.command(debug)
 app.command(init)
 app.command(sync)
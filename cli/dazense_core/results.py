@@ -0,0 +1,114 @@
+"""Columnar (Arrow) result helpers shared by SQL execution and the semantic engine."""
+
+import base64
+from collections.abc import Iterator
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+def cursor_to_arrow(cursor: Any) -> pa.Table:
+    """Fetch a raw_sql cursor/result as an Arrow table, using the driver's native Arrow path when available."""
+    # DuckDB
+    if hasattr(cursor, "to_arrow_table"):
+        return cursor.to_arrow_table()
+    if hasattr(cursor, "fetch_arrow_table"):
+        return cursor.fetch_arrow_table()
+    # Snowflake (returns None when the result is empty)
+    if hasattr(cursor, "fetch_arrow_all"):
+        table = cursor.fetch_arrow_all(force_return_table=True)
+        if table is not None:
+            return table
+    # Databricks
+    if hasattr(cursor, "fetchall_arrow"):
+        return cursor.fetchall_arrow()
+    # BigQuery
+    if hasattr(cursor, "to_arrow"):
+        return cursor.to_arrow()
+
+    columns: list[str] = [desc[0] for desc in cursor.description]
+    rows = cursor.fetchall()
+    return pa.Table.from_pandas(pd.DataFrame(rows, columns=columns), preserve_index=False)  # type: ignore[arg-type]
+
+
+def cursor_to_batches(cursor: Any, batch_size: int) -> Iterator[pa.RecordBatch]:
+    """Fetch a raw_sql cursor/result incrementally as Arrow record batches.
+
+    Always yields at least one (possibly empty) batch so callers can read the result schema.
+    """
+    batches = _iter_cursor_batches(cursor, batch_size)
+    first = next(batches, None)
+    if first is None:
+        yield _empty_batch(cursor)
+        return
+    yield first
+    yield from batches
+
+
+def _iter_cursor_batches(cursor: Any, batch_size: int) -> Iterator[pa.RecordBatch]:
+    # DuckDB
+    if hasattr(cursor, "to_arrow_reader"):
+        yield from cursor.to_arrow_reader(batch_size)
+        return
+    if hasattr(cursor, "fetch_record_batch"):
+        yield from cursor.fetch_record_batch(batch_size)
+        return
+    # Snowflake
+    if hasattr(cursor, "fetch_arrow_batches"):
+        for table in cursor.fetch_arrow_batches():
+            yield from table.to_batches(max_chunksize=batch_size)
+        return
+    # Databricks
+    if hasattr(cursor, "fetchmany_arrow"):
+        while (table := cursor.fetchmany_arrow(batch_size)).num_rows > 0:
+            yield from table.to_batches(max_chunksize=batch_size)
+        return
+    # BigQuery
+    if hasattr(cursor, "to_arrow_iterable"):
+        yield from cursor.to_arrow_iterable()
+        return
+
+    columns: list[str] = [desc[0] for desc in cursor.description]
+    while rows := cursor.fetchmany(batch_size):
+        yield pa.RecordBatch.from_pandas(pd.DataFrame(rows, columns=columns), preserve_index=False)  # type: ignore[arg-type]
+
+
+def _empty_batch(cursor: Any) -> pa.RecordBatch:
+    description = getattr(cursor, "description", None)
+    columns = [desc[0] for desc in description] if description else []
+    return pa.RecordBatch.from_pydict({name: pa.array([], type=pa.null()) for name in columns})
+
+
+def arrow_to_ipc(table: pa.Table) -> bytes:
+    """Serialize an Arrow table to the Arrow IPC stream format."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def arrow_to_columns(table: pa.Table) -> dict[str, list]:
+    """Convert an Arrow table to JSON-serializable column arrays.
+
+    Conversions are vectorized per column: decimals become floats, temporal values
+    become ISO-like strings, NaN becomes null and binary values are base64-encoded.
+    """
+    return {name: _column_to_json(column) for name, column in zip(table.column_names, table.columns)}
+
+
+def _column_to_json(column: pa.ChunkedArray) -> list:
+    dtype = column.type
+    if pa.types.is_decimal(dtype):
+        column = column.cast(pa.float64())
+        dtype = column.type
+    if pa.types.is_floating(dtype):
+        return pc.if_else(pc.is_nan(column), None, column).to_pylist()
+    if pa.types.is_temporal(dtype):
+        return column.cast(pa.string()).to_pylist()
+    if pa.types.is_binary(dtype) or pa.types.is_large_binary(dtype):
+        return [None if v is None else base64.b64encode(v).decode() for v in column.to_pylist()]
+    return column.to_pylist()
@@ -1,11 +1,25 @@
+from .batch import MergedQuery, merge_queries
+from .compiler import CompileResult, compile_semantic_model
 from .engine import SemanticEngine
-from .models import Dimension, JoinDefinition, Measure, ModelDefinition, SemanticModel
+from .models import Dimension, JoinDefinition, Measure, ModelDefinition, RollupDefinition, SemanticModel
+from .partitions import PartitionCache, get_partition_cache
+from .plans import PlanCache, QueryPlan, get_plan_cache
 
 __all__ = [
+    "CompileResult",
     "Dimension",
     "JoinDefinition",
     "Measure",
+    "MergedQuery",
     "ModelDefinition",
+    "PartitionCache",
+    "PlanCache",
+    "QueryPlan",
+    "RollupDefinition",
     "SemanticEngine",
     "SemanticModel",
+    "compile_semantic_model",
+    "get_partition_cache",
+    "get_plan_cache",
+    "merge_queries",
 ]
@@ -0,0 +1,127 @@
+"""Local DuckDB acceleration tier: Parquet copies of hot models, queried in-process while fresh."""
+
+import os
+import time
+from pathlib import Path
+
+import ibis
+import pyarrow as pa
+import pyarrow.parquet as pq
+import sqlglot as sg
+import sqlglot.expressions as sge
+from ibis import BaseBackend
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+
+from .models import AccelerationDefinition, ModelDefinition
+from .rollups import time_column
+
+# Folder of the local copies, relative to the project folder
+ACCELERATION_OUTPUT_DIR = "accelerated"
+
+# Bounds a narrower query filter can imply, per extraction filter operator
+_LOWER_BOUNDS = ("gt", "gte")
+_UPPER_BOUNDS = ("lt", "lte")
+
+
+class LocalCopyConfig(DuckDBConfig):
+    """In-memory DuckDB exposing each local copy as a view over its Parquet file.
+
+    Views read their file at query time, so a copy replaced by `dazense sync` is picked up
+    without reconnecting and the writer never waits on a database file lock.
+    """
+
+    directory: str
+
+    def connect(self) -> BaseBackend:
+        conn = ibis.duckdb.connect()
+        for path in sorted(Path(self.directory).glob("*.parquet")):
+            view = sg.to_identifier(path.stem, quoted=True).sql("duckdb")
+            source = sge.convert(str(path)).sql("duckdb")
+            conn.raw_sql(f"CREATE VIEW {view} AS SELECT * FROM read_parquet({source})")  # type: ignore[union-attr]
+        return conn
+
+    def connect_for_write(self) -> BaseBackend:
+        raise ValueError("Local copies are written as Parquet files, not through a connection")
+
+
+def local_copy_dir(project_path: Path) -> Path:
+    return project_path / ACCELERATION_OUTPUT_DIR
+
+
+def local_copy_path(project_path: Path, model_name: str) -> Path:
+    return local_copy_dir(project_path) / f"{model_name}.parquet"
+
+
+def write_local_copy(path: Path, data: pa.Table) -> None:
+    """Replace a local copy atomically, so concurrent readers see either the old or the new file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    pq.write_table(data, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def is_fresh(path: Path, max_age: float) -> bool:
+    try:
+        return time.time() - path.stat().st_mtime <= max_age
+    except OSError:
+        return False
+
+
+def can_answer(
+    model_def: ModelDefinition,
+    acceleration: AccelerationDefinition,
+    measures: list[str],
+    dimensions: list[str],
+    filters: list[dict],
+    time_grain: str | None,
+) -> bool:
+    """Whether the local copy holds every row and column the query reads.
+
+    Joined dimensions and filters are always answered by the warehouse, and a filtered copy
+    only answers queries whose own filters are at least as narrow as the extraction filters.
+    """
+    if any("." in dim for dim in dimensions) or any("." in f["column"] for f in filters):
+        return False
+    if not all(_implied(required, filters) for required in acceleration.filters):
+        return False
+    if acceleration.columns is None:
+        return True
+
+    needed = {f["column"] for f in filters}
+    for name in model_def.base_measures(measures):
+        measure = model_def.measures.get(name)
+        if measure is not None and measure.column is not None:
+            needed.add(measure.column)
+    for name in dimensions:
+        dim = model_def.dimensions.get(name)
+        if dim is not None:
+            needed.add(dim.column)
+    if time_grain is not None and (column := time_column(model_def)) is not None:
+        needed.add(column)
+    return needed <= set(acceleration.columns)
+
+
+def _implied(required: dict, filters: list[dict]) -> bool:
+    """Whether some query filter selects a subset of the rows `required` keeps."""
+    operator = required.get("operator", "eq")
+    for f in filters:
+        if f["column"] != required["column"]:
+            continue
+        other = f.get("operator", "eq")
+        if other == operator and f["value"] == required["value"]:
+            return True
+        try:
+            if operator == "in" and other in ("eq", "in"):
+                values = f["value"] if other == "in" else [f["value"]]
+                if set(values) <= set(required["value"]):
+                    return True
+            if operator in _LOWER_BOUNDS and other in _LOWER_BOUNDS:
+                if f["value"] > required["value"] or (f["value"] == required["value"] and operator == "gte"):
+                    return True
+            if operator in _UPPER_BOUNDS and other in _UPPER_BOUNDS:
+                if f["value"] < required["value"] or (f["value"] == required["value"] and operator == "lte"):
+                    return True
+        except TypeError:
+            continue
+    return False
@@ -0,0 +1,94 @@
+"""Compiled semantic model artifact, written by `dazense compile` and loaded instead of re-parsing the YAML.
+
+The artifact is JSON: each model definition is serialized on its own, so loading it only
+reads a dict of strings and each model is validated (by pydantic's JSON parser) the first
+time it is used. The artifact records the hash of the YAML and the dazense version it was
+compiled with, and is ignored once either changes.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+from dazense_core import __version__
+
+ARTIFACT_FILE = Path("semantics") / "semantic_model.compiled"
+
+# Bumped whenever the payload layout changes
+FORMAT_VERSION = 2
+
+
+def source_hash(source: bytes) -> str:
+    """Content hash of semantic_model.yml, identifying the definition an artifact was compiled from."""
+    return hashlib.sha256(source).hexdigest()
+
+
+class LazyModels(Mapping[str, Any]):
+    """Read-only mapping of model name -> model definition, validated from its JSON on first access."""
+
+    def __init__(self, payloads: dict[str, str], model_class: type[BaseModel]):
+        self._payloads = payloads
+        self._model_class = model_class
+        self._models: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> Any:
+        model = self._models.get(name)
+        if model is None:
+            payload = self._payloads[name]
+            # One instance per model: joins are resolved by identity (see join_graph)
+            with self._lock:
+                model = self._models.get(name)
+                if model is None:
+                    model = self._models[name] = self._model_class.model_validate_json(payload)
+        return model
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._payloads)
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._payloads
+
+
+def write_artifact(project_path: Path, digest: str, models: Mapping[str, BaseModel]) -> Path:
+    """Write the artifact for validated models compiled from YAML with hash `digest`, returning its path."""
+    payload = {
+        "format": FORMAT_VERSION,
+        "version": __version__,
+        "source_hash": digest,
+        "models": {name: model.model_dump_json(by_alias=True) for name, model in models.items()},
+    }
+    path = project_path / ARTIFACT_FILE
+    # Replaced atomically: a running server may be loading the previous artifact
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload))
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_artifact(project_path: Path, digest: str, model_class: type[BaseModel]) -> LazyModels | None:
+    """Models of the project's artifact, or None if there is none or it was not compiled from YAML `digest`."""
+    try:
+        payload = json.loads((project_path / ARTIFACT_FILE).read_bytes())
+    except (OSError, ValueError):
+        # Missing or truncated: fall back to the YAML
+        return None
+    if (
+        not isinstance(payload, dict)
+        or payload.get("format") != FORMAT_VERSION
+        # Model definitions may gain fields (with defaults) or stricter validation in another version
+        or payload.get("version") != __version__
+        or payload.get("source_hash") != digest
+        or not isinstance(payload.get("models"), dict)
+    ):
+        return None
+    return LazyModels(payload["models"], model_class)
@@ -0,0 +1,105 @@
+"""Groups batched metric queries that can be answered by a single warehouse query."""
+
+import json
+from dataclasses import dataclass, field
+
+
+@dataclass
+class MergedQuery:
+    """One warehouse query covering several batched metric queries.
+
+    Members share the model, dimensions, filters, ordering, limit, time grain/range, window columns, sample and top-N,
+    so they select the same groups in the same order and each member's result is a column subset of this one.
+    """
+
+    model_name: str
+    dimensions: list[str]
+    filters: list[dict]
+    order_by: list[dict]
+    limit: int | None
+    time_grain: str | None = None
+    time_range: dict | None = None
+    compare: list[str] = field(default_factory=list)
+    cumulative: list[str] = field(default_factory=list)
+    sample: dict | None = None
+    top_n: dict | None = None
+    measures: list[str] = field(default_factory=list)
+    # Positions of the member queries in the batch
+    members: list[int] = field(default_factory=list)
+
+    def query_kwargs(self) -> dict:
+        """Keyword arguments for SemanticEngine.query / query_arrow."""
+        return {
+            "model_name": self.model_name,
+            "measures": self.measures,
+            "dimensions": self.dimensions,
+            "filters": self.filters,
+            "order_by": self.order_by,
+            "limit": self.limit,
+            "time_grain": self.time_grain,
+            "time_range": self.time_range,
+            "compare": self.compare,
+            "cumulative": self.cumulative,
+            "sample": self.sample,
+            "top_n": self.top_n,
+        }
+
+
+def merge_queries(queries: list[dict]) -> list[MergedQuery]:
+    """Merge metric queries (SemanticEngine.query keyword arguments) that differ only by their measures."""
+    merged: dict[str, MergedQuery] = {}
+    for index, query in enumerate(queries):
+        dimensions = query.get("dimensions") or []
+        filters = query.get("filters") or []
+        order_by = query.get("order_by") or []
+        limit = query.get("limit")
+        time_grain = query.get("time_grain")
+        time_range = query.get("time_range")
+        compare = query.get("compare") or []
+        cumulative = query.get("cumulative") or []
+        sample = query.get("sample")
+        top_n = query.get("top_n")
+        if top_n is not None and top_n.get("by") is None and query["measures"]:
+            # Ranked by the first measure by default, which merging would change
+            top_n = {**top_n, "by": query["measures"][0]}
+        key = json.dumps(
+            [
+                query["model_name"],
+                dimensions,
+                filters,
+                order_by,
+                limit,
+                time_grain,
+                time_range,
+                compare,
+                cumulative,
+                sample,
+                top_n,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+        group = merged.get(key)
+        if group is None:
+            group = merged[key] = MergedQuery(
+                model_name=query["model_name"],
+                dimensions=dimensions,
+                filters=filters,
+                order_by=order_by,
+                limit=limit,
+                time_grain=time_grain,
+                time_range=time_range,
+                compare=compare,
+                cumulative=cumulative,
+                sample=sample,
+                top_n=top_n,
+            )
+        group.measures.extend(m for m in query["measures"] if m not in group.measures)
+        group.members.append(index)
+    return list(merged.values())
+
+
+def select_rows(rows: list[dict], columns: list[str]) -> list[dict]:
+    """Project the rows of a merged result onto one member query's columns."""
+    return [{column: row[column] for column in columns} for row in rows]
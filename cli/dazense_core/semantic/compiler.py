@@ -0,0 +1,122 @@
+"""Ahead-of-time compilation of the semantic model: validated against the synced schema, then written as an artifact."""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import ibis
+
+from dazense_core.config import AnyDatabaseConfig
+from dazense_core.config.databases.schema_cache import parse_columns_snapshot, sync_snapshot_path
+
+from . import artifact
+from .engine import model_database
+from .models import ModelDefinition, SemanticModel
+from .rollups import time_column
+
+SEMANTIC_MODEL_FILE = Path("semantics") / "semantic_model.yml"
+
+
+@dataclass
+class CompileResult:
+    models: int
+    # "model: problem" for each reference the synced schema contradicts
+    errors: list[str] = field(default_factory=list)
+    # Models whose table has no columns.md snapshot (not synced, or filtered out of the sync)
+    unchecked: list[str] = field(default_factory=list)
+    # Artifact written, or None when there were errors
+    path: Path | None = None
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    def get_summary(self) -> str:
+        if self.errors:
+            return f"{len(self.errors)} error(s) in {self.models} model(s)"
+        summary = f"{self.models} model(s) compiled"
+        if self.unchecked:
+            summary += f", {len(self.unchecked)} not checked (table not synced)"
+        return summary
+
+
+def compile_semantic_model(project_path: Path, databases: list[AnyDatabaseConfig]) -> CompileResult:
+    """Validate semantic_model.yml against the synced schema and, if it holds, write the compiled artifact.
+
+    Raises ValueError (or a YAML error) if the semantic model itself is invalid.
+    """
+    source = (project_path / SEMANTIC_MODEL_FILE).read_bytes()
+    semantic_model = SemanticModel.parse(source)
+
+    result = check_schema(semantic_model, databases)
+    if result.success:
+        result.path = artifact.write_artifact(project_path, artifact.source_hash(source), semantic_model.models)
+    return result
+
+
+def check_schema(semantic_model: SemanticModel, databases: list[AnyDatabaseConfig]) -> CompileResult:
+    """Check the columns every model references against the columns.md snapshots written by `dazense sync`."""
+    result = CompileResult(models=len(semantic_model.models))
+    by_name = {db.name: db for db in databases}
+
+    schemas: dict[str, ibis.Schema] = {}
+    for name, model_def in semantic_model.models.items():
+        try:
+            db_config = model_database(model_def, by_name)
+        except ValueError as e:
+            result.errors.append(f"{name}: {e}")
+            continue
+        path = sync_snapshot_path(db_config, model_def.schema_name, model_def.table)
+        schema = _read_snapshot(path) if path is not None else None
+        if schema is None:
+            result.unchecked.append(name)
+        else:
+            schemas[name] = schema
+
+    for name, model_def in semantic_model.models.items():
+        for alias, join_def in model_def.joins.items():
+            if join_def.to_model not in semantic_model.models:
+                result.errors.append(f"{name}: join '{alias}' references unknown model '{join_def.to_model}'")
+            elif join_def.to_model in schemas and join_def.related_key not in schemas[join_def.to_model]:
+                result.errors.append(
+                    f"{name}: join '{alias}' related_key '{join_def.related_key}' is not a column of "
+                    f"{_table_name(semantic_model.models[join_def.to_model])}"
+                )
+
+        schema = schemas.get(name)
+        if schema is None:
+            continue
+        for reference, column in _column_references(model_def):
+            if column not in schema:
+                result.errors.append(f"{name}: {reference} '{column}' is not a column of {_table_name(model_def)}")
+    return result
+
+
+def _column_references(model_def: ModelDefinition) -> list[tuple[str, str]]:
+    """(What references it, column) for each column of its own table a model reads."""
+    references = []
+    if model_def.primary_key is not None:
+        references.append(("primary_key", model_def.primary_key))
+    column = time_column(model_def)
+    if column is not None:
+        references.append(("time_dimension", column))
+    references += [(f"dimension '{name}' column", dim.column) for name, dim in model_def.dimensions.items()]
+    references += [
+        (f"measure '{name}' column", measure.column)
+        for name, measure in model_def.measures.items()
+        if measure.column is not None
+    ]
+    references += [(f"join '{alias}' foreign_key", join.foreign_key) for alias, join in model_def.joins.items()]
+    if model_def.acceleration is not None and model_def.acceleration.columns is not None:
+        references += [("acceleration column", column) for column in model_def.acceleration.columns]
+    return references
+
+
+def _read_snapshot(path: Path) -> ibis.Schema | None:
+    try:
+        return parse_columns_snapshot(path.read_text())
+    except OSError:
+        return None
+
+
+def _table_name(model_def: ModelDefinition) -> str:
+    return f"{model_def.schema_name}.{model_def.table}"
@@ -1,19 +1,106 @@
 """Translates semantic model metric queries into Ibis expressions and executes them."""
 
+import hashlib
+import json
+from collections.abc import Callable
+from datetime import datetime
+from functools import cached_property
+from typing import Any, TypeVar
+
+import ibis
+import ibis.common.exceptions as com
+import ibis.expr.datatypes as dt
+import ibis.expr.operations as ops
 import ibis.expr.types as ir
 import numpy as np
+import pandas as pd
+import pyarrow as pa
 from ibis import BaseBackend
 
 from dazense_core.config import AnyDatabaseConfig
+from dazense_core.config.databases import ConnectionPool, SchemaCache, get_connection_pool, get_schema_cache
+
+from . import acceleration, expressions, join_graph, values
+from .models import AggregationType, JoinType, Measure, ModelDefinition, RollupDefinition, SemanticModel, TimeGrain
+from .partitions import PartitionCache, PartitionEntry, as_datetime, get_partition_cache, select_buckets
+from .plans import FILTER_LIST_OPERATORS, PlanCache, QueryPlan, filter_shape, filter_values, get_plan_cache
+from .rollups import avg_columns, choose_rollup, is_aligned, rollup_filter_column, time_bucket_name, time_column
+from .sampling import Sample, bound_columns, bounded_measures, bounds, sample_columns, scale
+from .top_n import TopN, top_n_bucket, top_values, validate_top_n
+from .windows import (
+    COMPARISON_OFFSETS,
+    Windows,
+    compared_measures,
+    comparison_columns,
+    cumulative_column,
+    validate_windows,
+    window_columns,
+)
+
+T = TypeVar("T")
+
+# Ibis truncate() units per time grain
+TIME_GRAIN_UNITS = {
+    TimeGrain.HOUR: "h",
+    TimeGrain.DAY: "D",
+    TimeGrain.WEEK: "W",
+    TimeGrain.MONTH: "M",
+    TimeGrain.QUARTER: "Q",
+    TimeGrain.YEAR: "Y",
+}
+
+# Measures counting rows or values, which are 0 rather than null for groups without rows
+COUNT_TYPES = (AggregationType.COUNT, AggregationType.COUNT_DISTINCT, AggregationType.APPROX_COUNT_DISTINCT)
+
+# Native sketch operation of each approximate measure type, computed exactly on backends without it
+APPROXIMATE_OPERATIONS = {
+    AggregationType.APPROX_COUNT_DISTINCT: ops.ApproxCountDistinct,
+    AggregationType.MEDIAN: ops.ApproxMedian,
+    AggregationType.PERCENTILE: getattr(ops, "ApproxQuantile", None),  # missing in older ibis versions
+}
+
+
+# Errors building a query on a table that does not exist or lacks a column it reads
+MISSING_TABLE_ERRORS = (com.TableNotFound, com.IbisTypeError, AttributeError)
 
-from .models import AggregationType, ModelDefinition, SemanticModel
+
+def model_database(model_def: ModelDefinition, databases: dict[str, AnyDatabaseConfig]) -> AnyDatabaseConfig:
+    """Database config of a model's table (by name), raising ValueError if it cannot be determined."""
+    if model_def.database:
+        db_name = model_def.database
+    elif len(databases) == 1:
+        db_name = next(iter(databases))
+    else:
+        raise ValueError(
+            "Multiple databases configured but model does not specify 'database'. "
+            f"Available: {', '.join(databases.keys())}"
+        )
+
+    db_config = databases.get(db_name)
+    if db_config is None:
+        raise ValueError(f"Database '{db_name}' not found in configuration")
+    return db_config
 
 
 class SemanticEngine:
-    def __init__(self, model: SemanticModel, databases: list[AnyDatabaseConfig]):
+    def __init__(
+        self,
+        model: SemanticModel,
+        databases: list[AnyDatabaseConfig],
+        pool: ConnectionPool | None = None,
+        plan_cache: PlanCache | None = None,
+        schema_cache: SchemaCache | None = None,
+        partition_cache: PartitionCache | None = None,
+    ):
         self._model = model
         self._databases = {db.name: db for db in databases}
+        self._pool = pool or get_connection_pool()
+        self._plans = plan_cache if plan_cache is not None else get_plan_cache()
+        self._schemas = schema_cache if schema_cache is not None else get_schema_cache()
+        self._partitions = partition_cache if partition_cache is not None else get_partition_cache()
         self._connections: dict[str, BaseBackend] = {}
+        # Connections checked out of the pool, returned at the end of each query
+        self._leased: dict[str, AnyDatabaseConfig] = {}
 
     def query(
         self,
@@ -23,32 +110,101 @@ class SemanticEngine:
         filters: list[dict] | None = None,
         order_by: list[dict] | None = None,
         limit: int | None = None,
+        time_grain: str | None = None,
+        time_range: dict | None = None,
+        compare: list[str] | None = None,
+        cumulative: list[str] | None = None,
+        sample: dict | None = None,
+        top_n: dict | None = None,
     ) -> list[dict]:
-        """Translate a metric query to Ibis, execute, and return rows as dicts."""
-        dimensions = dimensions or []
-        filters = filters or []
-        order_by = order_by or []
+        """Translate a metric query to Ibis, execute, and return rows as dicts.
 
-        model_def = self._resolve_model(model_name)
-        table = self._get_table(model_def)
-        table = self._apply_joins(table, model_def, dimensions)
-        table = self._apply_filters(table, filters)
+        `time_grain` (hour/day/week/month/quarter/year) groups by the model's time dimension
+        truncated to that grain, as a leading `<time_dimension>_<grain>` column. `time_range`
+        ({"start", "end"}, end exclusive) filters the raw time dimension, so it can prune partitions.
 
-        dim_exprs = self._build_dimensions(table, model_def, dimensions)
-        measure_exprs = self._build_measures(table, model_def, measures)
+        With a time grain, `compare` (previous_period/previous_year) adds each measure's value in
+        the compared period and its relative change, as `<measure>_<comparison>[_change]` columns,
+        and `cumulative` adds running totals of count and sum measures as `<measure>_cumulative`.
 
-        if dim_exprs:
-            expr = table.group_by(dim_exprs).aggregate(measure_exprs)
-        else:
-            expr = table.aggregate(measure_exprs)
+        `sample` ({"fraction", "method": bernoulli/system, "seed"}) computes estimates from a
+        TABLESAMPLE of the model's table: counts and sums are scaled up by 1 / fraction, and
+        count, sum and avg measures get 95% confidence bounds as `<measure>_lower/_upper` columns.
 
-        expr = self._apply_order_by(expr, order_by)
+        `top_n` ({"dimension", "n", "by"}) keeps the `n` values of one of the dimensions ranking
+        highest by measure `by` (default: the first measure) and groups all others, nulls included,
+        as "Other", whose measures are computed from their rows like any group's.
+        """
+        df = self._run(
+            self._fetch_pandas,
+            lambda table: table.to_pandas(date_as_object=False),
+            model_name=model_name,
+            measures=measures,
+            dimensions=dimensions,
+            filters=filters,
+            order_by=order_by,
+            limit=limit,
+            time_grain=time_grain,
+            time_range=time_range,
+            windows=Windows(tuple(compare or ()), tuple(cumulative or ())),
+            sample=Sample.from_dict(sample),
+            top_n=TopN.from_dict(top_n),
+        )
+        return self._dataframe_to_dicts(df)
 
-        if limit is not None:
-            expr = expr.limit(limit)
+    def query_arrow(
+        self,
+        model_name: str,
+        measures: list[str],
+        dimensions: list[str] | None = None,
+        filters: list[dict] | None = None,
+        order_by: list[dict] | None = None,
+        limit: int | None = None,
+        time_grain: str | None = None,
+        time_range: dict | None = None,
+        compare: list[str] | None = None,
+        cumulative: list[str] | None = None,
+        sample: dict | None = None,
+        top_n: dict | None = None,
+    ) -> pa.Table:
+        """Translate a metric query to Ibis, execute, and return the result as an Arrow table."""
+        return self._run(
+            self._fetch_arrow,
+            lambda table: table,
+            model_name=model_name,
+            measures=measures,
+            dimensions=dimensions,
+            filters=filters,
+            order_by=order_by,
+            limit=limit,
+            time_grain=time_grain,
+            time_range=time_range,
+            windows=Windows(tuple(compare or ()), tuple(cumulative or ())),
+            sample=Sample.from_dict(sample),
+            top_n=TopN.from_dict(top_n),
+        )
 
-        df = expr.execute()
-        return self._dataframe_to_dicts(df)
+    def result_columns(
+        self,
+        model_name: str,
+        measures: list[str],
+        dimensions: list[str] | None = None,
+        time_grain: str | None = None,
+        compare: list[str] | None = None,
+        cumulative: list[str] | None = None,
+        sample: dict | None = None,
+    ) -> list[str]:
+        """Names of the columns a query returns, in order."""
+        model_def = self._resolve_model(model_name)
+        columns = [time_bucket_name(model_def, self._time_grain(time_grain))] if time_grain else []
+        windows = Windows(tuple(compare or ()), tuple(cumulative or ()))
+        return (
+            columns
+            + [dim.replace(".", "_") for dim in dimensions or []]
+            + [measure.replace(".", "_") for measure in measures]
+            + sample_columns(model_def, measures, Sample.from_dict(sample))
+            + window_columns(model_def, measures, windows)
+        )
 
     def get_model_info(self, model_name: str) -> dict:
         """Return model metadata (dimensions, measures, joins)."""
@@ -79,8 +235,892 @@ class SemanticEngine:
             },
         }
 
+    def build_rollup(self, model_name: str, rollup_name: str) -> int:
+        """(Re)create a rollup table from its model and return its row count.
+
+        A rollup in the model's database is written with CREATE TABLE AS in the warehouse;
+        one in another database (e.g. a local DuckDB file) is fetched as Arrow and copied there.
+        """
+        model_def = self._resolve_model(model_name)
+        rollup = self._resolve_rollup(model_def, rollup_name)
+        target_db, schema = self._rollup_location(model_def, rollup)
+        owned = target_db.name not in self._connections
+        target = target_db.connect_for_write() if owned else self._connections[target_db.name]
+        # Not leased: queries against the target database run on this writable connection
+        self._connections[target_db.name] = target
+        try:
+            expr = self._rollup_source(model_def, rollup)
+            if target_db.name == self._get_database(model_def).name:
+                table = target.create_table(rollup.table, obj=expr, database=schema, overwrite=True)
+            else:
+                data = self._get_connection(model_def).to_pyarrow(expr)
+                table = target.create_table(rollup.table, obj=data, database=schema, overwrite=True)
+            return int(table.count().execute())
+        finally:
+            self._release_connections()
+            if owned:
+                self._connections.pop(target_db.name, None)
+                target.disconnect()
+            self._schemas.invalidate(target_db, rollup.table, schema)
+
+    def accelerate(self, model_name: str) -> int:
+        """Extract the model's local copy (see `acceleration` in the model) and return its row count."""
+        model_def = self._resolve_model(model_name)
+        if model_def.acceleration is None:
+            raise ValueError(f"Model '{model_name}' has no acceleration configured")
+        if self._model.project_path is None:
+            raise ValueError("Local copies need a semantic model loaded from a project folder")
+
+        filters = model_def.acceleration.filters
+        try:
+            table, params = self._apply_filters(self._get_table(model_def), filters)
+            if model_def.acceleration.columns is not None:
+                table = table.select(*model_def.acceleration.columns)
+            data = self._get_connection(model_def).to_pyarrow(table, params=dict(zip(params, filter_values(filters))))
+        finally:
+            self._release_connections()
+        acceleration.write_local_copy(acceleration.local_copy_path(self._model.project_path, model_name), data)
+        return data.num_rows
+
+    def index_dimension_values(self, model_name: str, max_values: int = values.DEFAULT_MAX_VALUES) -> dict[str, int]:
+        """Write the value index of the model's dimensions with at most `max_values` distinct values.
+
+        Returns the number of distinct values of each indexed dimension.
+        """
+        model_def = self._resolve_model(model_name)
+        if self._model.project_path is None:
+            raise ValueError("Value indexes need a semantic model loaded from a project folder")
+
+        indexed: dict[str, list[tuple[str | None, int]]] = {}
+        types: dict[str, dt.DataType] = {}
+        try:
+            table = self._get_table(model_def)
+            conn = self._get_connection(model_def)
+            for name, dim_def in model_def.dimensions.items():
+                counts = table.group_by(value=table[dim_def.column].cast("string")).aggregate(count=table.count())
+                # One more than the threshold tells a dimension over it apart without counting all its values
+                counts = counts.order_by([counts["count"].desc(), counts["value"]]).limit(max_values + 1)
+                rows = conn.to_pyarrow(counts)
+                if rows.num_rows <= max_values:
+                    indexed[name] = list(zip(rows["value"].to_pylist(), rows["count"].to_pylist()))
+                    types[name] = table[dim_def.column].type()
+        finally:
+            self._release_connections()
+        values.write_value_index(
+            values.value_index_path(self._model.project_path, model_name), values.DimensionValues(indexed, types)
+        )
+        return {name: len(pairs) for name, pairs in indexed.items()}
+
+    def dimension_values(self, model_name: str, dimension: str, prefix: str = "", limit: int = 100) -> list[dict]:
+        """Indexed values of a dimension starting with `prefix`, with their row counts, most frequent first."""
+        model_def = self._resolve_model(model_name)
+        if dimension not in model_def.dimensions:
+            raise ValueError(f"Dimension '{dimension}' not found on model '{model_name}'")
+        index = self._value_index(model_name)
+        if index is None or dimension not in index.values:
+            raise ValueError(
+                f"Dimension '{dimension}' of model '{model_name}' has no value index: it has too many "
+                "distinct values, or `dazense sync` has not indexed it yet"
+            )
+        return index.search(dimension, prefix, limit)
+
     # -- Private helpers --
 
+    def _run(
+        self,
+        fetch: Callable[[BaseBackend, QueryPlan, list], T],
+        from_arrow: Callable[[pa.Table], T],
+        model_name: str,
+        measures: list[str],
+        dimensions: list[str] | None,
+        filters: list[dict] | None,
+        order_by: list[dict] | None,
+        limit: int | None,
+        time_grain: str | None,
+        time_range: dict | None,
+        windows: Windows,
+        sample: Sample | None,
+        top_n: TopN | None,
+    ) -> T:
+        """Fetch the query through a cached plan (built on a miss) and return pooled connections afterwards.
+
+        Plans are keyed by query shape, so queries differing only by filter values reuse the
+        same expression and skip both expression building and table schema lookups. Queries
+        a rollup can answer are read from the smallest such rollup (see rollups.choose_rollup).
+        Time-grained queries on a model with a partition cache only recompute open partitions.
+        Sampled queries always read a sample of the model's table, and top-N queries never read
+        rollups or cached partitions, whose groups are not the ones ranked over the whole table.
+        Queries with measures of other models ('model.measure') read each model's table.
+        """
+        dimensions = dimensions or []
+        filters = filters or []
+        order_by = order_by or []
+
+        failed = False
+        try:
+            model_def = self._resolve_model(model_name)
+            self._check_filter_values(model_name, model_def, filters)
+            if time_range:
+                filters = self._time_range_filters(model_def, time_range) + filters
+            validate_windows(model_def, measures, time_grain, windows)
+            validate_top_n(model_def, measures, dimensions, windows.compare, top_n)
+            if any("." in measure for measure in measures):
+                if windows or sample or top_n:
+                    raise ValueError(
+                        "Measures of other models cannot be combined with compare, cumulative, sample or top_n"
+                    )
+                return self._fetch(
+                    fetch, model_name, None, False, measures, dimensions, filters, order_by, limit, time_grain, windows
+                )
+            partitions = (
+                self._partition_bounds(model_def, filters, limit, time_grain)
+                if not windows and not sample and not top_n
+                else None
+            )
+            if partitions is not None:
+                assert time_grain is not None
+                return from_arrow(
+                    self._query_partitioned(
+                        model_name, model_def, measures, dimensions, order_by, time_grain, *partitions
+                    )
+                )
+            if sample is not None:
+                return self._fetch(
+                    fetch,
+                    model_name,
+                    None,
+                    False,
+                    measures,
+                    dimensions,
+                    filters,
+                    order_by,
+                    limit,
+                    time_grain,
+                    windows,
+                    sample,
+                    top_n,
+                )
+            return self._route(
+                fetch,
+                model_name,
+                model_def,
+                measures,
+                dimensions,
+                filters,
+                order_by,
+                limit,
+                time_grain,
+                windows,
+                top_n,
+            )
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._release_connections(failed=failed)
+
+    def _route(
+        self,
+        fetch: Callable[[BaseBackend, QueryPlan, list], T],
+        model_name: str,
+        model_def: ModelDefinition,
+        measures: list[str],
+        dimensions: list[str],
+        filters: list[dict],
+        order_by: list[dict],
+        limit: int | None,
+        time_grain: str | None,
+        windows: Windows,
+        top_n: TopN | None = None,
+    ) -> T:
+        """Fetch from the fastest source that can answer the query, falling back to the model's table."""
+        grain = self._time_grain(time_grain) if time_grain is not None else None
+
+        # Faster sources that can answer the query, tried before the model's table
+        routes: list[tuple[str | None, bool]] = []
+        # Rollups have no raw time column to shift for comparisons, nor raw rows to rank top-N values by
+        rollup_name = (
+            choose_rollup(model_def, measures, dimensions, filters, grain, exclude=self._unavailable_rollups(model_def))
+            if not windows and not top_n
+            else None
+        )
+        if rollup_name is not None:
+            routes.append((rollup_name, False))
+        if self._use_local_copy(model_name, model_def, measures, dimensions, filters, time_grain):
+            routes.append((None, True))
+        for route_rollup, local in routes:
+            try:
+                return self._fetch(
+                    fetch,
+                    model_name,
+                    route_rollup,
+                    local,
+                    measures,
+                    dimensions,
+                    filters,
+                    order_by,
+                    limit,
+                    time_grain,
+                    windows,
+                    top_n=top_n,
+                )
+            except Exception as e:
+                # Not built yet, out of date with the model or the table, or failing: use the next source
+                self._release_connections(failed=True)
+                if route_rollup is not None and isinstance(e, MISSING_TABLE_ERRORS):
+                    # Skipped for a while rather than looked up on every query (see SchemaCache.mark_unavailable)
+                    self._mark_rollup_unavailable(model_def, route_rollup)
+        return self._fetch(
+            fetch,
+            model_name,
+            None,
+            False,
+            measures,
+            dimensions,
+            filters,
+            order_by,
+            limit,
+            time_grain,
+            windows,
+            top_n=top_n,
+        )
+
+    def _check_filter_values(self, model_name: str, model_def: ModelDefinition, filters: list[dict]) -> None:
+        """Reject `eq`/`in` filters on values missing from a fresh value index, before querying the warehouse."""
+        for f in filters:
+            if f.get("operator", "eq") not in ("eq", "in"):
+                continue
+            target_name, column = model_name, f["column"]
+            if "." in column:
+                try:
+                    reference = join_graph.resolve(self._model, model_def, column)
+                except ValueError:
+                    # Reported when the query is built
+                    continue
+                target_name, column = reference.model or model_name, reference.column
+            target = self._model.get_model(target_name)
+            if target is None:
+                continue
+            dimension = next((name for name, dim in target.dimensions.items() if dim.column == column), None)
+            if dimension is None:
+                continue
+            index = self._value_index(target_name, values.DEFAULT_MAX_AGE)
+            if index is None or dimension not in index.values:
+                continue
+            for value in filter_values([f]):
+                index.check(dimension, value)
+
+    def _value_index(self, model_name: str, max_age: float | None = None) -> values.DimensionValues | None:
+        """The model's value index, or None if it was never built (or is older than `max_age` seconds)."""
+        if self._model.project_path is None:
+            return None
+        path = values.value_index_path(self._model.project_path, model_name)
+        if max_age is not None and not acceleration.is_fresh(path, max_age):
+            return None
+        return values.read_value_index(path)
+
+    def _partition_bounds(
+        self,
+        model_def: ModelDefinition,
+        filters: list[dict],
+        limit: int | None,
+        time_grain: str | None,
+    ) -> tuple[datetime | None, datetime | None, list[dict]] | None:
+        """Split a query into its time range and other filters, or None if its partitions cannot be cached.
+
+        Partitions are cacheable when the query groups by a time grain, has no limit (which would
+        cut across partitions) and bounds the time column only by a start and an end on grain boundaries.
+        """
+        if model_def.partition_cache is None or time_grain is None or limit is not None:
+            return None
+        grain = self._time_grain(time_grain)
+        column = self._time_column(model_def)
+        start = end = None
+        others = []
+        for f in filters:
+            if f["column"] != column:
+                others.append(f)
+                continue
+            operator = f.get("operator", "eq")
+            value = as_datetime(f["value"])
+            if value is None or not is_aligned(value, grain):
+                return None
+            if operator == "gte" and start is None:
+                start = value
+            elif operator == "lt" and end is None:
+                end = value
+            else:
+                return None
+        return start, end, others
+
+    def _query_partitioned(
+        self,
+        model_name: str,
+        model_def: ModelDefinition,
+        measures: list[str],
+        dimensions: list[str],
+        order_by: list[dict],
+        time_grain: str,
+        start: datetime | None,
+        end: datetime | None,
+        filters: list[dict],
+    ) -> pa.Table:
+        """Answer a time-grained query from cached closed partitions plus a fetch of the partitions after them.
+
+        Partitions before the watermark (see PartitionCache.watermark) are cached per query shape
+        and non-time filter values; each query recomputes only the partitions from the watermark
+        of the cached entry on, and the cache moves forward as more partitions close.
+        """
+        assert model_def.partition_cache is not None
+        grain = self._time_grain(time_grain)
+        bucket = time_bucket_name(model_def, grain)
+        key = (
+            ConnectionPool.config_key(self._get_database(model_def)),
+            self._model_fingerprint,
+            model_name,
+            tuple(measures),
+            tuple(dimensions),
+            json.dumps(filters, sort_keys=True, default=str),
+            time_grain,
+        )
+        watermark = self._partitions.watermark(grain, model_def.partition_cache.freshness_window)
+
+        entry = self._partitions.get(key)
+        if entry is not None and (
+            entry.closed_before > watermark
+            or (entry.covered_from is not None and (start is None or start < entry.covered_from))
+        ):
+            entry = None
+
+        parts: list[pa.Table] = []
+        fresh_start = start
+        if entry is not None:
+            parts.append(select_buckets(entry.rows, bucket, start, end))
+            fresh_start = entry.closed_before if start is None else max(start, entry.closed_before)
+        if entry is None or end is None or fresh_start is None or end > fresh_start:
+            time_filters = self._time_range_filters(
+                model_def, {"start": self._time_value(fresh_start), "end": self._time_value(end)}
+            )
+            parts.append(
+                self._route(
+                    self._fetch_arrow,
+                    model_name,
+                    model_def,
+                    measures,
+                    dimensions,
+                    time_filters + filters,
+                    [],
+                    None,
+                    time_grain,
+                    Windows(),
+                )
+            )
+        result = pa.concat_tables(parts, promote_options="permissive") if len(parts) > 1 else parts[0]
+
+        if end is None or end >= watermark:
+            # The result reaches the open partitions: cache its closed ones for the next query
+            kept = [select_buckets(entry.rows, bucket, None, start)] if entry is not None and start is not None else []
+            rows = pa.concat_tables(
+                kept + [select_buckets(result, bucket, None, watermark)], promote_options="permissive"
+            )
+            covered_from = entry.covered_from if entry is not None else start
+            self._partitions.put(key, PartitionEntry(rows=rows, covered_from=covered_from, closed_before=watermark))
+
+        if order_by:
+            # Chained order_by calls sort by the last column first, see _apply_order_by
+            result = result.sort_by(
+                [
+                    (self._result_column(o["column"]), "ascending" if o.get("ascending", True) else "descending")
+                    for o in reversed(order_by)
+                ]
+            )
+        return result
+
+    @staticmethod
+    def _fetch_arrow(conn: BaseBackend, plan: QueryPlan, values: list) -> pa.Table:
+        statement = plan.statement(conn)
+        if statement is not None:
+            try:
+                return statement.to_pyarrow(conn, values)
+            except Exception:
+                # Drivers that reject the statement or its bound values still run the plan with literal values
+                plan.discard_statement()
+        return conn.to_pyarrow(plan.expr, params=dict(zip(plan.params, values)))
+
+    @staticmethod
+    def _fetch_pandas(conn: BaseBackend, plan: QueryPlan, values: list) -> pd.DataFrame:
+        statement = plan.statement(conn)
+        if statement is not None:
+            try:
+                return statement.to_pandas(conn, values)
+            except Exception:
+                # Drivers that reject the statement or its bound values still run the plan with literal values
+                plan.discard_statement()
+        return conn.execute(plan.expr, params=dict(zip(plan.params, values)))
+
+    @staticmethod
+    def _time_value(value: datetime | None) -> str | None:
+        """Format a partition bound as a time filter value (a plain date at midnight, for date columns)."""
+        if value is None:
+            return None
+        return value.date().isoformat() if value.time() == datetime.min.time() else value.isoformat()
+
+    def _fetch(
+        self,
+        fetch: Callable[[BaseBackend, QueryPlan, list], T],
+        model_name: str,
+        rollup_name: str | None,
+        local: bool,
+        measures: list[str],
+        dimensions: list[str],
+        filters: list[dict],
+        order_by: list[dict],
+        limit: int | None,
+        time_grain: str | None,
+        windows: Windows,
+        sample: Sample | None = None,
+        top_n: TopN | None = None,
+    ) -> T:
+        """Fetch from a rollup, the model's local copy (`local`) or, by default, the model's table."""
+        model_def = self._resolve_model(model_name)
+        if rollup_name is not None:
+            db_config, _ = self._rollup_location(model_def, model_def.rollups[rollup_name])
+        elif local:
+            db_config = self._local_copy_config()
+        else:
+            db_config = self._get_database(model_def)
+        key = (
+            ConnectionPool.config_key(db_config),
+            self._model_fingerprint,
+            model_name,
+            rollup_name,
+            local,
+            tuple(measures),
+            tuple(dimensions),
+            filter_shape(filters),
+            tuple((o["column"], o.get("ascending", True)) for o in order_by),
+            limit,
+            time_grain,
+            windows,
+            sample,
+            top_n,
+        )
+        try:
+            plan = self._plans.get(key)
+            if plan is None:
+                plan = self._build_plan(
+                    model_name,
+                    rollup_name,
+                    local,
+                    measures,
+                    dimensions,
+                    filters,
+                    order_by,
+                    limit,
+                    time_grain,
+                    windows,
+                    sample,
+                    top_n,
+                )
+                self._plans.put(key, plan)
+
+            return fetch(self._connect(db_config), plan, filter_values(filters))
+        except BaseException as e:
+            # The plan or table schemas may be stale (e.g. the table changed), reload them next time
+            self._plans.discard(key)
+            if rollup_name is not None:
+                rollup = model_def.rollups[rollup_name]
+                self._schemas.invalidate(db_config, rollup.table, self._rollup_location(model_def, rollup)[1])
+            elif not isinstance(e, ValueError):
+                self._schemas.invalidate(db_config)
+            raise
+
+    @cached_property
+    def _model_fingerprint(self) -> str:
+        """Hash of the semantic model, so editing a model never reuses plans built from the old definition."""
+        # The YAML hash when loaded from a project, which spares serializing (and validating) every model
+        if self._model.source_hash is not None:
+            return self._model.source_hash
+        return hashlib.sha256(self._model.model_dump_json().encode()).hexdigest()
+
+    def _build_plan(
+        self,
+        model_name: str,
+        rollup_name: str | None,
+        local: bool,
+        measures: list[str],
+        dimensions: list[str],
+        filters: list[dict],
+        order_by: list[dict],
+        limit: int | None,
+        time_grain: str | None,
+        windows: Windows,
+        sample: Sample | None = None,
+        top_n: TopN | None = None,
+    ) -> QueryPlan:
+        model_def = self._resolve_model(model_name)
+        if rollup_name is not None:
+            return self._build_rollup_plan(
+                model_def, model_def.rollups[rollup_name], measures, dimensions, filters, order_by, limit, time_grain
+            )
+
+        if local:
+            local_config = self._local_copy_config()
+            backend = self._connect(local_config)
+            table = self._schemas.table(backend, local_config, model_name)
+        else:
+            backend = self._get_connection(model_def)
+            table = self._get_table(model_def)
+        if sample is not None:
+            table = sample.apply(table)
+
+        if any("." in measure for measure in measures):
+            expr, params = self._combine_models(
+                model_name, model_def, measures, dimensions, filters, time_grain, backend
+            )
+            return self._finish_plan(expr, order_by, limit, params)
+        expr, params = self._aggregation(
+            table, model_def, measures, dimensions, filters, time_grain, backend, sample=sample, top_n=top_n
+        )
+        if windows:
+            assert time_grain is not None
+            expr = self._apply_windows(
+                expr,
+                table,
+                model_def,
+                measures,
+                dimensions,
+                filters,
+                self._time_grain(time_grain),
+                backend,
+                params,
+                windows,
+                sample,
+            )
+        return self._finish_plan(expr, order_by, limit, params)
+
+    def _aggregation(
+        self,
+        table: ir.Table,
+        model_def: ModelDefinition,
+        measures: list[str],
+        dimensions: list[str],
+        filters: list[dict],
+        time_grain: str | None,
+        backend: BaseBackend,
+        reuse: list[ir.Scalar] | None = None,
+        sample: Sample | None = None,
+        top_n: TopN | None = None,
+    ) -> tuple[ir.Table, list[ir.Scalar]]:
+        """Join, filter and aggregate the model's table, returning the result and its filter parameters.
+
+        On a `sample` of the table, measures are estimated and followed by their confidence bounds.
+        With `top_n`, its dimension is grouped by its top values and OTHER, ranked over the same rows.
+        """
+        table, params = self._apply_joins(table, model_def, dimensions, filters, reuse)
+
+        dim_exprs = self._build_dimensions(table, model_def, dimensions)
+        if top_n is not None:
+            position = dimensions.index(top_n.dimension)
+            dimension = dim_exprs[position]
+            (rank_by,) = self._build_measures(table, model_def, [top_n.ranking_measure(measures)], backend, sample)
+            ranked = table.group_by(dimension.name("__value")).aggregate(rank_by.name("__rank_by"))
+            dim_exprs[position] = top_n_bucket(dimension, top_values(ranked, top_n.n)).name(dimension.get_name())
+        if time_grain is not None:
+            dim_exprs.insert(0, self._time_bucket(table, model_def, self._time_grain(time_grain)))
+        top_k = [
+            name
+            for name in measures
+            if (measure_def := model_def.measures.get(name)) is not None
+            and measure_def.type == AggregationType.APPROX_TOP_K
+        ]
+        bound_exprs: list[ir.Scalar] = []
+        if sample is not None:
+            for name in bounded_measures(model_def, measures):
+                measure_def = model_def.measures[name]
+                lower_column, upper_column = bound_columns(name)
+                lower, upper = bounds(table, measure_def.type, measure_def.column, sample)
+                bound_exprs.extend([lower.name(lower_column), upper.name(upper_column)])
+        if not top_k:
+            measure_exprs = self._build_measures(table, model_def, measures, backend, sample)
+            return self._group(table, dim_exprs, measure_exprs + bound_exprs), params
+
+        measure_exprs = self._build_measures(table, model_def, [m for m in measures if m not in top_k], backend, sample)
+        joined = [self._top_k(table, dim_exprs, model_def.measures[name], name) for name in top_k]
+        columns = [dim.get_name() for dim in dim_exprs] + measures + [bound.get_name() for bound in bound_exprs]
+        return self._group(table, dim_exprs, measure_exprs + bound_exprs, joined, columns), params
+
+    def _combine_models(
+        self,
+        model_name: str,
+        model_def: ModelDefinition,
+        measures: list[str],
+        dimensions: list[str],
+        filters: list[dict],
+        time_grain: str | None,
+        backend: BaseBackend,
+    ) -> tuple[ir.Table, list[ir.Scalar]]:
+        """Aggregate the measures of each model ('model.measure' for other models) and join them on the dimensions.
+
+        Each model is aggregated on its own, with the query's dimensions and filters resolved from
+        it (see _model_reference), so the join matches one row per group on each side and never
+        multiplies a model's measures by another's rows. Groups missing from a model count 0 rows and
+        get null values for its other measures.
+        """
+        by_model: dict[str, list[tuple[str, str]]] = {}
+        for measure in measures:
+            other, _, name = measure.rpartition(".")
+            by_model.setdefault(other or model_name, []).append((name, measure.replace(".", "_")))
+        groups = [dim.replace(".", "_") for dim in dimensions]
+        if time_grain is not None:
+            groups.insert(0, time_bucket_name(model_def, self._time_grain(time_grain)))
+
+        database = self._get_database(model_def)
+        expr: ir.Table | None = None
+        params: list[ir.Scalar] | None = None
+        counts: set[str] = set()
+        for fact_name, fact_measures in by_model.items():
+            fact_def = self._resolve_model(fact_name)
+            counts.update(
+                column
+                for name, column in fact_measures
+                if name in fact_def.measures and fact_def.measures[name].type in COUNT_TYPES
+            )
+            if self._get_database(fact_def).name != database.name:
+                raise ValueError(f"Model '{fact_name}' is not in the same database as model '{model_name}'")
+            table = self._get_table(fact_def)
+            fact_dimensions = [self._model_reference(model_name, model_def, fact_name, dim, True) for dim in dimensions]
+            fact_filters = [
+                {**f, "column": self._model_reference(model_name, model_def, fact_name, f["column"], False)}
+                for f in filters
+            ]
+            for f in fact_filters:
+                if "." not in f["column"] and f["column"] not in table.columns:
+                    raise ValueError(f"Column '{f['column']}' not found on model '{fact_name}'")
+
+            # Every model binds the same filter values, so the parameters of the first one are reused
+            part, part_params = self._aggregation(
+                table,
+                fact_def,
+                [name for name, _ in fact_measures],
+                fact_dimensions,
+                fact_filters,
+                time_grain,
+                backend,
+                reuse=params,
+            )
+            params = params if params is not None else part_params
+            names = groups + [column for _, column in fact_measures]
+            part = part.select(*(part[column].name(name) for column, name in zip(part.columns, names)))
+
+            if expr is None:
+                expr = part
+            elif groups:
+                joined = expr.outer_join(part, [expr[group].identical_to(part[group]) for group in groups])
+                expr = joined.select(
+                    *(ibis.coalesce(expr[group], part[group]).name(group) for group in groups),
+                    *(expr[name] for name in expr.columns if name not in groups),
+                    *(part[column] for _, column in fact_measures),
+                )
+            else:
+                expr = expr.cross_join(part)
+
+        assert expr is not None and params is not None
+        columns = [measure.replace(".", "_") for measure in measures]
+        return expr.select(
+            *groups,
+            *(expr[column].coalesce(0).name(column) if column in counts else expr[column] for column in columns),
+        ), params
+
+    def _model_reference(
+        self, model_name: str, model_def: ModelDefinition, fact_name: str, reference: str, dimension: bool
+    ) -> str:
+        """Translate a dimension or filter column of the queried model into the same column seen from `fact_name`.
+
+        Dotted references go to the model they resolve to, through the shortest join path from
+        `fact_name`. Other dimensions must have the same name on both models, and filters on the
+        queried model's time dimension apply to the other model's time dimension.
+        """
+        if fact_name == model_name:
+            return reference
+        fact_def = self._resolve_model(fact_name)
+        if "." in reference:
+            resolved = join_graph.resolve(self._model, model_def, reference)
+            target = resolved.model or model_name
+            if target == fact_name:
+                return f"{fact_name}.{resolved.column}"
+            path = join_graph.join_path(self._model, fact_def, target)
+            if path is None:
+                raise ValueError(f"No join path from model '{fact_name}' to model '{target}'")
+            return ".".join((*path, resolved.column))
+        if dimension:
+            if reference not in fact_def.dimensions:
+                raise ValueError(
+                    f"Dimension '{reference}' not found on model '{fact_name}', whose measures are queried"
+                )
+            return reference
+        fact_time_column = time_column(fact_def)
+        if reference == time_column(model_def) and fact_time_column is not None:
+            return fact_time_column
+        return reference
+
+    def _apply_windows(
+        self,
+        expr: ir.Table,
+        table: ir.Table,
+        model_def: ModelDefinition,
+        measures: list[str],
+        dimensions: list[str],
+        filters: list[dict],
+        grain: TimeGrain,
+        backend: BaseBackend,
+        params: list[ir.Scalar],
+        windows: Windows,
+        sample: Sample | None = None,
+    ) -> ir.Table:
+        """Add comparison and running total columns to an aggregated, time-grained result.
+
+        Each compared period is aggregated in the same statement from the model's table with its
+        time column shifted forward by the comparison offset: the query's filters (and parameters)
+        then select the compared rows, which land in the bucket they are compared with and are
+        left-joined on the time bucket and dimensions.
+        """
+        groups = [time_bucket_name(model_def, grain)] + [dim.replace(".", "_") for dim in dimensions]
+        compared = compared_measures(model_def, measures)
+        column = self._time_column(model_def)
+        for comparison in windows.compare:
+            offset = ibis.interval(**COMPARISON_OFFSETS[comparison][grain])
+            shifted = table.mutate(**{column: (table[column] + offset).cast(table[column].type())})
+            previous, _ = self._aggregation(
+                shifted, model_def, compared, dimensions, filters, grain.value, backend, reuse=params, sample=sample
+            )
+            added = {}
+            for measure in compared:
+                value_column, change_column = comparison_columns(measure, comparison)
+                added[value_column] = previous[measure]
+                added[change_column] = (expr[measure] - previous[measure]) / previous[measure].nullif(0)
+            joined = expr.left_join(previous, [expr[group].identical_to(previous[group]) for group in groups])
+            expr = joined.select(*(expr[name] for name in expr.columns), **added)
+
+        if windows.cumulative:
+            window = ibis.cumulative_window(group_by=groups[1:] or None, order_by=expr[groups[0]])
+            expr = expr.mutate(
+                **{cumulative_column(measure): expr[measure].sum().over(window) for measure in windows.cumulative}
+            )
+        return expr
+
+    def _build_rollup_plan(
+        self,
+        model_def: ModelDefinition,
+        rollup: RollupDefinition,
+        measures: list[str],
+        dimensions: list[str],
+        filters: list[dict],
+        order_by: list[dict],
+        limit: int | None,
+        time_grain: str | None,
+    ) -> QueryPlan:
+        """Answer a query by re-aggregating a rollup table (see rollups.can_answer for when that is exact)."""
+        table = self._get_rollup_table(model_def, rollup)
+        filters = [{**f, "column": rollup_filter_column(model_def, rollup, f["column"])} for f in filters]
+        table, params = self._apply_filters(table, filters)
+
+        dim_exprs = [table[dim.replace(".", "_")] for dim in dimensions]
+        if time_grain is not None:
+            assert rollup.time_grain is not None
+            grain = self._time_grain(time_grain)
+            bucket = table[time_bucket_name(model_def, rollup.time_grain)]
+            if grain != rollup.time_grain:
+                bucket = bucket.truncate(TIME_GRAIN_UNITS[grain])
+            dim_exprs.insert(0, bucket.name(time_bucket_name(model_def, grain)))
+        measure_exprs = [self._reaggregate_measure(table, model_def, name) for name in measures]
+        return self._finish_plan(self._group(table, dim_exprs, measure_exprs), order_by, limit, params)
+
+    def _group(
+        self,
+        table: ir.Table,
+        dim_exprs: list[ir.Column],
+        measure_exprs: list[ir.Scalar],
+        joined: list[ir.Table] | None = None,
+        columns: list[str] | None = None,
+    ) -> ir.Table:
+        """Aggregate, then join measures aggregated separately (`joined`, one row per group) and order `columns`."""
+        joined = joined or []
+        if dim_exprs:
+            expr = table.group_by(dim_exprs).aggregate(measure_exprs)
+        elif measure_exprs or not joined:
+            expr = table.aggregate(measure_exprs)
+        else:
+            # Only separately aggregated measures: each is a single row
+            expr, *joined = joined
+
+        dims = [dim.get_name() for dim in dim_exprs]
+        for other in joined:
+            if dims:
+                # IS NOT DISTINCT FROM, so groups with null dimension values match too
+                expr = expr.left_join(other, [expr[dim].identical_to(other[dim]) for dim in dims])
+            else:
+                expr = expr.cross_join(other)
+        if columns is not None:
+            expr = expr.select(*columns)
+        return expr
+
+    def _finish_plan(
+        self, expr: ir.Table, order_by: list[dict], limit: int | None, params: list[ir.Scalar]
+    ) -> QueryPlan:
+        expr = self._apply_order_by(expr, order_by)
+
+        if limit is not None:
+            expr = expr.limit(limit)
+        return QueryPlan(expr=expr, params=params)
+
+    def _rollup_source(self, model_def: ModelDefinition, rollup: RollupDefinition) -> ir.Table:
+        """Aggregate the model's table to the rollup's grain, storing each avg as a sum and a count."""
+        table = self._get_table(model_def)
+        table, _ = self._apply_joins(table, model_def, rollup.dimensions, [])
+
+        dim_exprs = self._build_dimensions(table, model_def, rollup.dimensions)
+        if rollup.time_grain is not None:
+            dim_exprs.insert(0, self._time_bucket(table, model_def, rollup.time_grain))
+        measure_exprs: list[ir.Scalar] = []
+        for name in rollup.measures:
+            measure_def = model_def.measures[name]
+            if measure_def.type == AggregationType.AVG:
+                assert measure_def.column is not None
+                sum_column, count_column = avg_columns(name)
+                measure_exprs.append(table[measure_def.column].sum().name(sum_column))
+                measure_exprs.append(table[measure_def.column].count().name(count_column))
+            else:
+                measure_exprs.append(self._aggregate(table, measure_def.type, measure_def.column, name))
+
+        if dim_exprs:
+            return table.group_by(dim_exprs).aggregate(measure_exprs)
+        return table.aggregate(measure_exprs)
+
+    def _use_local_copy(
+        self,
+        model_name: str,
+        model_def: ModelDefinition,
+        measures: list[str],
+        dimensions: list[str],
+        filters: list[dict],
+        time_grain: str | None,
+    ) -> bool:
+        """Whether the model has a local copy that is fresh enough and holds everything the query reads."""
+        if model_def.acceleration is None or self._model.project_path is None:
+            return False
+        path = acceleration.local_copy_path(self._model.project_path, model_name)
+        return acceleration.is_fresh(path, model_def.acceleration.max_age) and acceleration.can_answer(
+            model_def, model_def.acceleration, measures, dimensions, filters, time_grain
+        )
+
+    def _local_copy_config(self) -> acceleration.LocalCopyConfig:
+        assert self._model.project_path is not None
+        directory = acceleration.local_copy_dir(self._model.project_path)
+        return acceleration.LocalCopyConfig(
+            name=f"{acceleration.ACCELERATION_OUTPUT_DIR}:{directory}", directory=str(directory)
+        )
+
     def _resolve_model(self, model_name: str) -> ModelDefinition:
         model_def = self._model.get_model(model_name)
         if model_def is None:
@@ -88,55 +1128,152 @@ class SemanticEngine:
             raise ValueError(f"Model '{model_name}' not found. Available models: {available}")
         return model_def
 
+    @staticmethod
+    def _resolve_rollup(model_def: ModelDefinition, rollup_name: str) -> RollupDefinition:
+        rollup = model_def.rollups.get(rollup_name)
+        if rollup is None:
+            available = ", ".join(model_def.rollups) or "none"
+            raise ValueError(f"Rollup '{rollup_name}' not found on model '{model_def.table}'. Available: {available}")
+        return rollup
+
+    def _rollup_location(
+        self, model_def: ModelDefinition, rollup: RollupDefinition
+    ) -> tuple[AnyDatabaseConfig, str | None]:
+        """Database and schema of a rollup table (by default, next to the model's table)."""
+        if rollup.database is None:
+            return self._get_database(model_def), rollup.schema_name or model_def.schema_name
+        db_config = self._databases.get(rollup.database)
+        if db_config is None:
+            raise ValueError(f"Database '{rollup.database}' not found in configuration")
+        return db_config, rollup.schema_name
+
+    def _unavailable_rollups(self, model_def: ModelDefinition) -> list[str]:
+        """Rollups whose table could not be read since it was last built (see SchemaCache.mark_unavailable)."""
+        unavailable = []
+        for name, rollup in model_def.rollups.items():
+            try:
+                db_config, schema = self._rollup_location(model_def, rollup)
+            except ValueError:
+                # Reported if the rollup is routed to
+                continue
+            if self._schemas.is_unavailable(db_config, rollup.table, schema):
+                unavailable.append(name)
+        return unavailable
+
+    def _mark_rollup_unavailable(self, model_def: ModelDefinition, rollup_name: str) -> None:
+        rollup = model_def.rollups[rollup_name]
+        try:
+            db_config, schema = self._rollup_location(model_def, rollup)
+        except ValueError:
+            return
+        self._schemas.mark_unavailable(db_config, rollup.table, schema)
+
+    def _get_database(self, model_def: ModelDefinition) -> AnyDatabaseConfig:
+        return model_database(model_def, self._databases)
+
     def _get_connection(self, model_def: ModelDefinition) -> BaseBackend:
-        if model_def.database:
-            db_name = model_def.database
-        elif len(self._databases) == 1:
-            db_name = next(iter(self._databases))
-        else:
-            raise ValueError(
-                "Multiple databases configured but model does not specify 'database'. "
-                f"Available: {', '.join(self._databases.keys())}"
-            )
+        return self._connect(self._get_database(model_def))
+
+    def _connect(self, db_config: AnyDatabaseConfig) -> BaseBackend:
+        if db_config.name not in self._connections:
+            self._connections[db_config.name] = self._pool.acquire(db_config)
+            self._leased[db_config.name] = db_config
 
-        if db_name not in self._connections:
-            db_config = self._databases.get(db_name)
-            if db_config is None:
-                raise ValueError(f"Database '{db_name}' not found in configuration")
-            self._connections[db_name] = db_config.connect()
+        return self._connections[db_config.name]
 
-        return self._connections[db_name]
+    def _release_connections(self, failed: bool = False) -> None:
+        for db_name, db_config in self._leased.items():
+            self._pool.release(db_config, self._connections.pop(db_name), failed=failed)
+        self._leased.clear()
 
     def _get_table(self, model_def: ModelDefinition) -> ir.Table:
         conn = self._get_connection(model_def)
-        return conn.table(model_def.table, database=model_def.schema_name)
+        return self._schemas.table(conn, self._get_database(model_def), model_def.table, model_def.schema_name)
+
+    def _get_rollup_table(self, model_def: ModelDefinition, rollup: RollupDefinition) -> ir.Table:
+        db_config, schema = self._rollup_location(model_def, rollup)
+        return self._schemas.table(self._connect(db_config), db_config, rollup.table, schema)
 
     def _apply_joins(
         self,
         table: ir.Table,
         model_def: ModelDefinition,
         dimensions: list[str],
-    ) -> ir.Table:
-        """Join related tables if any dimensions reference joined models (e.g. 'customer.name')."""
-        needed_joins: set[str] = set()
+        filters: list[dict],
+        reuse: list[ir.Scalar] | None = None,
+    ) -> tuple[ir.Table, list[ir.Scalar]]:
+        """Join the related tables the query references and apply its filters below the joins.
+
+        Dimensions and filters on dotted references ('alias.column', 'alias.alias.column' or
+        'model.column', see join_graph.resolve) follow the model's joins, possibly through several
+        models; other filters are on the model's own columns. Each filter runs on the table it
+        references before joining, and only the join keys and requested dimensions of a related
+        table are joined. A join only referenced by filters becomes a semi-join, which keeps
+        matching rows without widening or multiplying them. The many side of a one_to_many join
+        is reduced to its distinct join key and dimension values first, so each row is counted
+        once per group instead of once per related row.
+
+        Returns the parameters of all filters in filter order, like _apply_filters (which see for `reuse`).
+        """
+        root = join_graph.JoinNode()
         for dim in dimensions:
             if "." in dim:
-                join_alias = dim.split(".")[0]
-                needed_joins.add(join_alias)
+                reference = join_graph.resolve(self._model, model_def, dim)
+                root.child(reference.path).fields[dim.replace(".", "_")] = reference.column
 
-        for join_alias in needed_joins:
-            join_def = model_def.joins.get(join_alias)
-            if join_def is None:
-                raise ValueError(f"Join '{join_alias}' not defined on model '{model_def.table}'")
+        reused = iter(reuse or [])
+        reused_by_filter = [[next(reused) for _ in filter_values([f])] if reuse is not None else None for f in filters]
+        params: list[list[ir.Scalar]] = [[] for _ in filters]
+        for i, f in enumerate(filters):
+            if "." in f["column"]:
+                reference = join_graph.resolve(self._model, model_def, f["column"])
+                root.child(reference.path).filters.append((i, reference.column))
+            else:
+                root.filters.append((i, f["column"]))
+
+        for i, column in root.filters:
+            table, params[i] = self._apply_filters(table, [{**filters[i], "column": column}], reused_by_filter[i])
+        table = self._join_related(table, model_def, root, filters, reused_by_filter, params)
+        if root.fields:
+            table = table.mutate(**{name: table[column] for name, column in root.fields.items()})
+        return table, [param for filter_params in params for param in filter_params]
 
+    def _join_related(
+        self,
+        table: ir.Table,
+        model_def: ModelDefinition,
+        node: join_graph.JoinNode,
+        filters: list[dict],
+        reused_by_filter: list[list[ir.Scalar] | None],
+        params: list[list[ir.Scalar]],
+    ) -> ir.Table:
+        """Join the related tables below `node` onto `table`, deepest first (see _apply_joins)."""
+        for join_alias, child in node.children.items():
+            join_def = model_def.joins[join_alias]
             related_model = self._resolve_model(join_def.to_model)
             related_table = self._get_table(related_model)
+            for i, column in child.filters:
+                related_table, params[i] = self._apply_filters(
+                    related_table, [{**filters[i], "column": column}], reused_by_filter[i]
+                )
+            related_table = self._join_related(related_table, related_model, child, filters, reused_by_filter, params)
 
-            table = table.join(
-                related_table,
-                table[join_def.foreign_key] == related_table[join_def.related_key],
-            )
+            joined_fields = child.joined_fields()
+            if not child.fields and not joined_fields:
+                table = table.semi_join(
+                    related_table, table[join_def.foreign_key] == related_table[join_def.related_key]
+                )
+                continue
 
+            key = f"{join_alias}__key"
+            related_table = related_table.select(
+                related_table[join_def.related_key].name(key),
+                *(related_table[column].name(name) for name, column in sorted(child.fields.items())),
+                *(related_table[name] for name in sorted(joined_fields)),
+            )
+            if join_def.type == JoinType.ONE_TO_MANY:
+                related_table = related_table.distinct()
+            table = table.join(related_table, table[join_def.foreign_key] == related_table[key])
         return table
 
     def _build_dimensions(
@@ -148,8 +1285,8 @@ class SemanticEngine:
         exprs: list[ir.Column] = []
         for dim_name in dimensions:
             if "." in dim_name:
-                _, field = dim_name.split(".", 1)
-                exprs.append(table[field].name(dim_name.replace(".", "_")))
+                # Joined and renamed by _apply_joins
+                exprs.append(table[dim_name.replace(".", "_")])
             else:
                 dim_def = model_def.dimensions.get(dim_name)
                 if dim_def is None:
@@ -157,20 +1294,101 @@ class SemanticEngine:
                 exprs.append(table[dim_def.column].name(dim_name))
         return exprs
 
+    def _time_column(self, model_def: ModelDefinition) -> str:
+        column = time_column(model_def)
+        if column is None:
+            raise ValueError(
+                f"Model '{model_def.table}' has no time_dimension, so time_grain/time_range are not supported"
+            )
+        return column
+
+    @staticmethod
+    def _time_grain(time_grain: str) -> TimeGrain:
+        try:
+            return TimeGrain(time_grain)
+        except ValueError:
+            supported = ", ".join(g.value for g in TimeGrain)
+            raise ValueError(f"Unsupported time grain '{time_grain}'. Supported: {supported}") from None
+
+    def _time_bucket(self, table: ir.Table, model_def: ModelDefinition, grain: TimeGrain) -> ir.Column:
+        column = table[self._time_column(model_def)]
+        if grain == TimeGrain.HOUR and column.type().is_date():
+            raise ValueError(f"Time grain 'hour' is not supported on date column '{self._time_column(model_def)}'")
+        return column.truncate(TIME_GRAIN_UNITS[grain]).name(time_bucket_name(model_def, grain))
+
+    def _time_range_filters(self, model_def: ModelDefinition, time_range: dict) -> list[dict]:
+        """Translate {"start", "end"} (start inclusive, end exclusive) into filters on the raw time column."""
+        column = self._time_column(model_def)
+        filters = []
+        if time_range.get("start") is not None:
+            filters.append({"column": column, "operator": "gte", "value": time_range["start"]})
+        if time_range.get("end") is not None:
+            filters.append({"column": column, "operator": "lt", "value": time_range["end"]})
+        return filters
+
     def _build_measures(
         self,
         table: ir.Table,
         model_def: ModelDefinition,
         measures: list[str],
+        backend: BaseBackend,
+        sample: Sample | None = None,
     ) -> list[ir.Scalar]:
+        """Aggregate measures, scaled up to estimates of the whole table when computed on a `sample` of it."""
         exprs: list[ir.Scalar] = []
         for measure_name in measures:
             measure_def = model_def.measures.get(measure_name)
             if measure_def is None:
                 raise ValueError(f"Measure '{measure_name}' not found on model '{model_def.table}'")
-            exprs.append(self._aggregate(table, measure_def.type, measure_def.column, measure_name))
+            if measure_def.type == AggregationType.DERIVED:
+                assert measure_def.expression is not None
+                value = expressions.evaluate(
+                    measure_def.expression,
+                    lambda ref: self._build_measures(table, model_def, [ref], backend, sample)[0],
+                )
+                exprs.append(value.name(measure_name))
+            elif measure_def.type in APPROXIMATE_OPERATIONS:
+                exprs.append(self._approximate(table, measure_def, measure_name, backend))
+            else:
+                value = self._aggregate(table, measure_def.type, measure_def.column, measure_name)
+                exprs.append(scale(value, measure_def.type, sample).name(measure_name))
         return exprs
 
+    @staticmethod
+    def _approximate(table: ir.Table, measure_def: Measure, alias: str, backend: BaseBackend) -> ir.Scalar:
+        """Compute a measure with the backend's sketch function, or exactly if the backend has none."""
+        assert measure_def.column is not None
+        column = table[measure_def.column]
+        operation = APPROXIMATE_OPERATIONS[measure_def.type]
+        native = operation is not None and backend.has_operation(operation)
+        match measure_def.type:
+            case AggregationType.APPROX_COUNT_DISTINCT:
+                return (column.approx_nunique() if native else column.nunique()).name(alias)
+            case AggregationType.MEDIAN:
+                return (column.approx_median() if native else column.median()).name(alias)
+            case _:
+                assert measure_def.percentile is not None
+                quantile = measure_def.percentile / 100
+                return (column.approx_quantile(quantile) if native else column.quantile(quantile)).name(alias)
+
+    @staticmethod
+    def _top_k(table: ir.Table, dim_exprs: list[ir.Column], measure_def: Measure, alias: str) -> ir.Table:
+        """The `k` most frequent values of a column per group, most frequent first.
+
+        Counted with a GROUP BY and ranked with a window in the same query: sketch functions
+        return differently shaped results on each backend and cannot be compiled portably.
+        """
+        assert measure_def.column is not None
+        dims = [dim.get_name() for dim in dim_exprs]
+        counts = table.group_by([*dim_exprs, table[measure_def.column].name("__value")]).aggregate(
+            __count=table.count()
+        )
+        rank = ibis.row_number().over(group_by=dims or None, order_by=[counts["__count"].desc(), counts["__value"]])
+        top = counts.filter(counts["__value"].notnull()).mutate(__rank=rank)
+        top = top.filter(top["__rank"] < measure_def.k)
+        value = top["__value"].collect(order_by=top["__rank"]).name(alias)
+        return top.group_by(dims).aggregate(value) if dims else top.aggregate(value)
+
     @staticmethod
     def _aggregate(
         table: ir.Table,
@@ -197,14 +1415,63 @@ class SemanticEngine:
                 assert column is not None
                 return table[column].max().name(alias)
 
+    def _reaggregate_measure(self, table: ir.Table, model_def: ModelDefinition, name: str) -> ir.Scalar:
+        """Re-aggregate a measure from a rollup, computing derived measures from the measures they use."""
+        measure_def = model_def.measures[name]
+        if measure_def.type != AggregationType.DERIVED:
+            return self._reaggregate(table, measure_def.type, name)
+        assert measure_def.expression is not None
+        value = expressions.evaluate(
+            measure_def.expression, lambda ref: self._reaggregate_measure(table, model_def, ref)
+        )
+        return value.name(name)
+
     @staticmethod
-    def _apply_filters(expr: ir.Table, filters: list[dict]) -> ir.Table:
+    def _reaggregate(table: ir.Table, agg_type: AggregationType, alias: str) -> ir.Scalar:
+        """Combine a measure's rollup rows: counts and sums add up, averages are total sum over total count."""
+        match agg_type:
+            case AggregationType.COUNT:
+                return table[alias].sum().coalesce(0).name(alias)
+            case AggregationType.SUM:
+                return table[alias].sum().name(alias)
+            case AggregationType.AVG:
+                sum_column, count_column = avg_columns(alias)
+                return (table[sum_column].sum() / table[count_column].sum().nullif(0)).name(alias)
+            case AggregationType.MIN:
+                return table[alias].min().name(alias)
+            case AggregationType.MAX:
+                return table[alias].max().name(alias)
+            case _:
+                raise ValueError(f"Measure '{alias}' of type '{agg_type.value}' cannot be read from a rollup")
+
+    @staticmethod
+    def _apply_filters(
+        expr: ir.Table, filters: list[dict], reuse: list[ir.Scalar] | None = None
+    ) -> tuple[ir.Table, list[ir.Scalar]]:
+        """Apply filters with their values as bind parameters typed like the filtered column.
+
+        `reuse` gives existing parameters (in filter order) to bind instead of new ones, so the same
+        filters applied twice in one expression take their values once.
+        """
+        params: list[ir.Scalar] = []
+        reused = iter(reuse) if reuse is not None else None
+
+        def bind(col_ref: ir.Column, value: Any) -> Any:
+            if value is None:
+                return None
+            param = next(reused) if reused is not None else ibis.param(col_ref.type())
+            params.append(param)
+            return param
+
         for f in filters:
             column = f["column"]
             operator = f.get("operator", "eq")
-            value = f["value"]
 
             col_ref = expr[column]
+            if operator in FILTER_LIST_OPERATORS:
+                value = [bind(col_ref, v) for v in filter_values([f])]
+            else:
+                value = bind(col_ref, f["value"])
             match operator:
                 case "eq":
                     expr = expr.filter(col_ref == value)
@@ -224,17 +1491,22 @@ class SemanticEngine:
                     expr = expr.filter(~col_ref.isin(value))
                 case _:
                     raise ValueError(f"Unsupported filter operator: {operator}")
-        return expr
+        return expr, params
 
-    @staticmethod
-    def _apply_order_by(expr: ir.Table, order_by: list[dict]) -> ir.Table:
+    @classmethod
+    def _apply_order_by(cls, expr: ir.Table, order_by: list[dict]) -> ir.Table:
         for o in order_by:
-            column = o["column"]
+            column = cls._result_column(o["column"])
             ascending = o.get("ascending", True)
             col_ref = expr[column]
             expr = expr.order_by(col_ref.asc() if ascending else col_ref.desc())
         return expr
 
+    @staticmethod
+    def _result_column(column: str) -> str:
+        """Result column of an order_by reference, which may name a joined dimension as 'alias.column'."""
+        return column.replace(".", "_")
+
     @staticmethod
     def _dataframe_to_dicts(df) -> list[dict]:
         def convert_value(v):
@@ -0,0 +1,64 @@
+"""Arithmetic expressions over measures, used by derived measures (e.g. 'total_amount / order_count')."""
+
+import ast
+import operator
+from collections.abc import Callable
+
+import ibis
+import ibis.expr.types as ir
+
+_BINARY_OPERATORS: dict[type[ast.operator], Callable] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    # Safe division: a zero denominator gives NULL instead of an error or infinity
+    ast.Div: lambda left, right: left / right.nullif(0),
+}
+_UNARY_OPERATORS: dict[type[ast.unaryop], Callable] = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+
+
+def parse(expression: str) -> ast.expr:
+    """Parse an expression, allowing only measure names, numbers, + - * / and parentheses."""
+    try:
+        tree = ast.parse(expression, mode="eval").body
+    except SyntaxError:
+        raise ValueError(f"Invalid expression '{expression}'") from None
+
+    for node in ast.walk(tree):
+        match node:
+            case ast.BinOp(op=op) if type(op) in _BINARY_OPERATORS:
+                continue
+            case ast.UnaryOp(op=op) if type(op) in _UNARY_OPERATORS:
+                continue
+            case ast.Constant(value=value) if isinstance(value, (int, float)) and not isinstance(value, bool):
+                continue
+            case ast.Name() | ast.Load() | ast.operator() | ast.unaryop():
+                continue
+            case _:
+                raise ValueError(
+                    f"Invalid expression '{expression}': only measure names, numbers, + - * / and parentheses are allowed"
+                )
+    return tree
+
+
+def references(expression: str) -> list[str]:
+    """Names of the measures an expression uses, in order of first use."""
+    return list(dict.fromkeys(node.id for node in ast.walk(parse(expression)) if isinstance(node, ast.Name)))
+
+
+def evaluate(expression: str, resolve: Callable[[str], ir.NumericValue]) -> ir.NumericValue:
+    """Build the Ibis expression of `expression`, with each measure name replaced by `resolve(name)`."""
+
+    def visit(node: ast.expr) -> ir.NumericValue:
+        match node:
+            case ast.BinOp(left=left, op=op, right=right):
+                return _BINARY_OPERATORS[type(op)](visit(left), visit(right))
+            case ast.UnaryOp(op=op, operand=operand):
+                return _UNARY_OPERATORS[type(op)](visit(operand))
+            case ast.Name(id=name):
+                return resolve(name)
+            case ast.Constant(value=value):
+                return ibis.literal(value)
+        raise ValueError(f"Invalid expression '{expression}'")
+
+    return visit(parse(expression))
@@ -0,0 +1,85 @@
+"""Join graph of a semantic model: resolving references to related models' columns into chains of joins."""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+from .models import ModelDefinition, SemanticModel
+
+
+@dataclass(frozen=True)
+class Reference:
+    """A column reached from a model by following join aliases, e.g. ('zone', 'borough') and 'name'."""
+
+    path: tuple[str, ...]
+    column: str
+    # Model the column belongs to (the referencing model itself when the path is empty)
+    model: str | None
+
+
+@dataclass
+class JoinNode:
+    """Related model reached through a chain of joins, with what the query reads from it."""
+
+    # Result column name -> column of the model, for dimensions
+    fields: dict[str, str] = field(default_factory=dict)
+    # (Filter position, column of the model), for filters
+    filters: list[tuple[int, str]] = field(default_factory=list)
+    # Join alias -> model joined from this one
+    children: dict[str, "JoinNode"] = field(default_factory=dict)
+
+    def child(self, path: tuple[str, ...]) -> "JoinNode":
+        node = self
+        for join_alias in path:
+            node = node.children.setdefault(join_alias, JoinNode())
+        return node
+
+    def joined_fields(self) -> list[str]:
+        """Result columns of the dimensions of the models joined below this one."""
+        return [name for child in self.children.values() for name in [*child.fields, *child.joined_fields()]]
+
+
+def join_path(model: SemanticModel, source: ModelDefinition, target: str) -> tuple[str, ...] | None:
+    """Shortest chain of join aliases from a model to the model named `target`, or None if it is unreachable.
+
+    Joins are followed in the direction they are declared. Among paths of the same length,
+    the first found following each model's joins in declaration order wins.
+    """
+    queue: deque[tuple[ModelDefinition, tuple[str, ...]]] = deque([(source, ())])
+    seen = {id(source)}
+    while queue:
+        model_def, path = queue.popleft()
+        for alias, join_def in model_def.joins.items():
+            if join_def.to_model == target:
+                return (*path, alias)
+            related = model.get_model(join_def.to_model)
+            if related is not None and id(related) not in seen:
+                seen.add(id(related))
+                queue.append((related, (*path, alias)))
+    return None
+
+
+def resolve(model: SemanticModel, model_def: ModelDefinition, reference: str) -> Reference:
+    """Resolve a dotted column reference from `model_def`, raising ValueError if it leads nowhere.
+
+    References are either a chain of join aliases ending with a column ('zone.borough.name'), or
+    a model name and a column ('boroughs.name'), reached through the shortest join path.
+    """
+    *prefix, column = reference.split(".")
+    if len(prefix) == 1 and prefix[0] not in model_def.joins and prefix[0] in model.models:
+        if model.models[prefix[0]] is model_def:
+            return Reference((), column, None)
+        path = join_path(model, model_def, prefix[0])
+        if path is None:
+            raise ValueError(f"No join path from model '{model_def.table}' to model '{prefix[0]}'")
+        return Reference(path, column, prefix[0])
+
+    current, target = model_def, None
+    for alias in prefix:
+        join_def = current.joins.get(alias)
+        if join_def is None:
+            raise ValueError(f"Join '{alias}' not defined on model '{current.table}'")
+        related = model.get_model(join_def.to_model)
+        if related is None:
+            raise ValueError(f"Model '{join_def.to_model}' not found (join '{alias}' of model '{current.table}')")
+        current, target = related, join_def.to_model
+    return Reference(tuple(prefix), column, target)
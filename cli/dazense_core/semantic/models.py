@@ -1,8 +1,11 @@
+from collections.abc import Mapping
 from enum import Enum
 from pathlib import Path
 
 import yaml
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, PrivateAttr, SerializerFunctionWrapHandler, field_serializer, model_validator
+
+from . import artifact, expressions
 
 
 class AggregationType(str, Enum):
@@ -12,6 +15,30 @@ class AggregationType(str, Enum):
     MIN = "min"
     MAX = "max"
     COUNT_DISTINCT = "count_distinct"
+    APPROX_COUNT_DISTINCT = "approx_count_distinct"
+    MEDIAN = "median"
+    PERCENTILE = "percentile"
+    APPROX_TOP_K = "approx_top_k"
+    DERIVED = "derived"
+
+
+# Aggregations a rollup can store and re-aggregate exactly (avg is stored as a sum and a count)
+REAGGREGATABLE_TYPES = (
+    AggregationType.COUNT,
+    AggregationType.SUM,
+    AggregationType.AVG,
+    AggregationType.MIN,
+    AggregationType.MAX,
+)
+
+
+class TimeGrain(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
 
 
 class JoinType(str, Enum):
@@ -29,13 +56,29 @@ class Measure(BaseModel):
     type: AggregationType
     column: str | None = None
     description: str | None = None
+    # Percentile (0-100) computed by percentile measures
+    percentile: float | None = None
+    # Number of most frequent values returned by approx_top_k measures
+    k: int = Field(default=10, ge=1)
+    # Arithmetic over other measures of the model, for derived measures (e.g. 'total_amount / order_count')
+    expression: str | None = None
 
     @model_validator(mode="after")
     def validate_column_required(self) -> "Measure":
-        if self.type != AggregationType.COUNT and self.column is None:
+        if self.type == AggregationType.DERIVED:
+            if self.expression is None:
+                raise ValueError("Measure with type 'derived' requires an 'expression' field")
+            expressions.parse(self.expression)
+        elif self.type != AggregationType.COUNT and self.column is None:
             raise ValueError(f"Measure with type '{self.type.value}' requires a 'column' field")
         return self
 
+    @model_validator(mode="after")
+    def validate_percentile(self) -> "Measure":
+        if self.type == AggregationType.PERCENTILE and (self.percentile is None or not 0 <= self.percentile <= 100):
+            raise ValueError("Measure with type 'percentile' requires a 'percentile' between 0 and 100")
+        return self
+
 
 class JoinDefinition(BaseModel):
     to_model: str
@@ -44,6 +87,38 @@ class JoinDefinition(BaseModel):
     type: JoinType = JoinType.MANY_TO_ONE
 
 
+class RollupDefinition(BaseModel):
+    """A pre-aggregated table of a model, built by `dazense build` and used to answer queries it covers."""
+
+    table: str
+    schema_name: str | None = Field(alias="schema", default=None)
+    database: str | None = None
+    description: str | None = None
+    dimensions: list[str] = Field(default_factory=list)
+    measures: list[str]
+    time_grain: TimeGrain | None = None
+
+    model_config = {"populate_by_name": True}
+
+
+class AccelerationDefinition(BaseModel):
+    """Opt-in local DuckDB copy of a model's table, extracted by `dazense sync` and used while fresh."""
+
+    # Columns to extract (default: all), e.g. to leave out wide text columns
+    columns: list[str] | None = None
+    # Filters applied when extracting (same format as query filters), e.g. to keep recent rows only
+    filters: list[dict] = Field(default_factory=list)
+    # Seconds after extraction during which queries are answered from the local copy
+    max_age: float = 86400
+
+
+class PartitionCacheDefinition(BaseModel):
+    """Opt-in caching of time-grained results per time partition, so repeat queries only recompute recent ones."""
+
+    # Partitions whose period ended less than this many seconds ago are always recomputed
+    freshness_window: float = 86400
+
+
 class ModelDefinition(BaseModel):
     table: str
     schema_name: str = Field(alias="schema", default="main")
@@ -54,20 +129,117 @@ class ModelDefinition(BaseModel):
     dimensions: dict[str, Dimension] = Field(default_factory=dict)
     measures: dict[str, Measure] = Field(default_factory=dict)
     joins: dict[str, JoinDefinition] = Field(default_factory=dict)
+    rollups: dict[str, RollupDefinition] = Field(default_factory=dict)
+    acceleration: AccelerationDefinition | None = None
+    partition_cache: PartitionCacheDefinition | None = None
 
     model_config = {"populate_by_name": True}
 
+    def base_measures(self, names: list[str]) -> list[str]:
+        """Expand derived measures into the measures they are computed from, recursively."""
+        result: dict[str, None] = {}
+        for name in names:
+            measure = self.measures.get(name)
+            if measure is not None and measure.type == AggregationType.DERIVED:
+                assert measure.expression is not None
+                result.update(dict.fromkeys(self.base_measures(expressions.references(measure.expression))))
+            else:
+                result[name] = None
+        return list(result)
+
+    @model_validator(mode="after")
+    def validate_derived_measures(self) -> "ModelDefinition":
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            measure = self.measures[name]
+            if measure.type != AggregationType.DERIVED:
+                return
+            assert measure.expression is not None
+            for ref in expressions.references(measure.expression):
+                if ref not in self.measures:
+                    raise ValueError(f"Derived measure '{name}' references unknown measure '{ref}'")
+                if ref in path:
+                    raise ValueError(f"Derived measure '{name}' references itself through '{ref}'")
+                if self.measures[ref].type == AggregationType.APPROX_TOP_K:
+                    raise ValueError(f"Derived measure '{name}' cannot use '{ref}', which returns a list of values")
+                visit(ref, (*path, ref))
+
+        for name in self.measures:
+            visit(name, (name,))
+        return self
+
+    @model_validator(mode="after")
+    def validate_rollups(self) -> "ModelDefinition":
+        for name, rollup in self.rollups.items():
+            for measure_name in rollup.measures:
+                measure = self.measures.get(measure_name)
+                if measure is None:
+                    raise ValueError(f"Rollup '{name}' references unknown measure '{measure_name}'")
+                if measure.type not in REAGGREGATABLE_TYPES:
+                    raise ValueError(
+                        f"Rollup '{name}' cannot store measure '{measure_name}': "
+                        f"'{measure.type.value}' cannot be re-aggregated"
+                    )
+            for dim in rollup.dimensions:
+                known = dim.split(".", 1)[0] in self.joins if "." in dim else dim in self.dimensions
+                if not known:
+                    raise ValueError(f"Rollup '{name}' references unknown dimension '{dim}'")
+            if rollup.time_grain is not None and self.time_dimension is None:
+                raise ValueError(f"Rollup '{name}' has a time_grain but the model has no time_dimension")
+        return self
+
+    @model_validator(mode="after")
+    def validate_partition_cache(self) -> "ModelDefinition":
+        if self.partition_cache is not None and self.time_dimension is None:
+            raise ValueError("partition_cache requires a time_dimension")
+        return self
+
 
 class SemanticModel(BaseModel):
+    # A LazyModels mapping when loaded from the compiled artifact
     models: dict[str, ModelDefinition]
 
+    # Folder of the project this model was loaded from; local copies of accelerated models live under it
+    _project_path: Path | None = PrivateAttr(default=None)
+    # Hash of the semantic_model.yml this model was loaded from
+    _source_hash: str | None = PrivateAttr(default=None)
+
+    @property
+    def project_path(self) -> Path | None:
+        return self._project_path
+
+    @property
+    def source_hash(self) -> str | None:
+        return self._source_hash
+
+    def set_project_path(self, project_path: Path) -> None:
+        self._project_path = project_path.resolve()
+
+    @field_serializer("models", mode="wrap")
+    def serialize_models(self, models: Mapping[str, ModelDefinition], handler: SerializerFunctionWrapHandler):
+        return handler(dict(models))
+
     @classmethod
     def load(cls, project_path: Path) -> "SemanticModel | None":
+        """Load semantics/semantic_model.yml, from its compiled artifact (see `dazense compile`) when up to date."""
         yaml_path = project_path / "semantics" / "semantic_model.yml"
         if not yaml_path.exists():
             return None
-        data = yaml.safe_load(yaml_path.read_text())
-        return cls.model_validate(data)
+        source = yaml_path.read_bytes()
+        digest = artifact.source_hash(source)
+        models = artifact.read_artifact(project_path, digest, ModelDefinition)
+        if models is not None:
+            # Each model is validated from its compiled JSON on first use
+            model = cls.model_construct(models=models)
+        else:
+            model = cls.parse(source)
+        model.set_project_path(project_path)
+        model._source_hash = digest
+        return model
+
+    @classmethod
+    def parse(cls, source: bytes) -> "SemanticModel":
+        """Parse and validate the YAML of a semantic model, raising ValueError (or a YAML error) if invalid."""
+        return cls.model_validate(yaml.safe_load(source))
 
     def get_model(self, name: str) -> ModelDefinition | None:
         return self.models.get(name)
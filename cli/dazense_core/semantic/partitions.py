@@ -0,0 +1,152 @@
+"""Process-wide cache of closed time partitions of metric query results, for incremental re-queries."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .models import TimeGrain
+
+
+@dataclass
+class PartitionEntry:
+    """Result rows of the closed partitions of one query shape."""
+
+    # Rows whose time bucket is in [covered_from, closed_before)
+    rows: pa.Table
+    # Start of the first cached partition, or None when cached from the first partition on
+    covered_from: datetime | None
+    # Watermark when the rows were computed: later partitions may still change
+    closed_before: datetime
+    expires_at: float = 0.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def truncate(value: datetime, grain: TimeGrain) -> datetime:
+    """Start of the `grain` period containing `value` (weeks start on Monday, like DATE_TRUNC)."""
+    day = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    match grain:
+        case TimeGrain.HOUR:
+            return value.replace(minute=0, second=0, microsecond=0)
+        case TimeGrain.DAY:
+            return day
+        case TimeGrain.WEEK:
+            return day - timedelta(days=day.weekday())
+        case TimeGrain.MONTH:
+            return day.replace(day=1)
+        case TimeGrain.QUARTER:
+            return day.replace(day=1, month=(day.month - 1) // 3 * 3 + 1)
+        case TimeGrain.YEAR:
+            return day.replace(day=1, month=1)
+
+
+def as_datetime(value: object) -> datetime | None:
+    """Parse a time filter value (ISO string, date or datetime), or None if it is something else."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo is None else None
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return None
+
+
+def select_buckets(rows: pa.Table, column: str, start: datetime | None, end: datetime | None) -> pa.Table:
+    """Rows whose `column` time bucket is in [start, end)."""
+    mask = None
+    for bound, compare in ((start, pc.greater_equal), (end, pc.less)):
+        if bound is None:
+            continue
+        condition = compare(rows[column], _scalar(bound, rows.schema.field(column).type))
+        mask = condition if mask is None else pc.and_(mask, condition)
+    return rows if mask is None else rows.filter(mask)
+
+
+def _scalar(value: datetime, dtype: pa.DataType) -> pa.Scalar:
+    if pa.types.is_date(dtype):
+        return pa.scalar(value.date(), type=dtype)
+    return pa.scalar(value, type=pa.timestamp("us")).cast(dtype)
+
+
+class PartitionCache:
+    """Thread-safe LRU cache of PartitionEntry by query shape.
+
+    Partitions whose period ended more than the model's freshness window ago are
+    treated as closed: repeat queries only recompute later partitions. Entries
+    expire after `ttl` seconds, which bounds how long a backfill of old data can go
+    unnoticed, and are evicted least recently used beyond `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 86400.0,
+        max_bytes: int = 128 * 1024 * 1024,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, PartitionEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def watermark(self, grain: TimeGrain, freshness_window: float) -> datetime:
+        """Start of the first partition that may still change: partitions before it are closed."""
+        return truncate(self.clock() - timedelta(seconds=freshness_window), grain)
+
+    def get(self, key: Hashable) -> PartitionEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, entry: PartitionEntry) -> None:
+        if self.ttl <= 0 or entry.rows.nbytes > self.max_bytes:
+            return
+        entry.expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while sum(e.rows.nbytes for e in self._entries.values()) > self.max_bytes:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_partition_cache: PartitionCache | None = None
+_partition_cache_lock = threading.Lock()
+
+
+def get_partition_cache() -> PartitionCache:
+    """Return the process-wide partition cache, creating it on first use.
+
+    Environment variables:
+        DAZENSE_PARTITION_CACHE_TTL: Seconds closed partitions are reused, 0 to disable (default: 86400)
+        DAZENSE_PARTITION_CACHE_MAX_BYTES: Memory budget for cached partitions (default: 128 MiB)
+    """
+    global _partition_cache
+    with _partition_cache_lock:
+        if _partition_cache is None:
+            _partition_cache = PartitionCache(
+                ttl=float(os.environ.get("DAZENSE_PARTITION_CACHE_TTL", 86400)),
+                max_bytes=int(os.environ.get("DAZENSE_PARTITION_CACHE_MAX_BYTES", 128 * 1024 * 1024)),
+            )
+        return _partition_cache
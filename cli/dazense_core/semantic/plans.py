@@ -0,0 +1,126 @@
+"""Process-wide LRU cache of built metric query plans (Ibis expressions with bind parameters)."""
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+
+import ibis.expr.types as ir
+from ibis import BaseBackend
+
+from .prepared import PreparedStatement, prepare
+
+FILTER_LIST_OPERATORS = ("in", "not_in")
+
+
+@dataclass
+class QueryPlan:
+    """A metric query expression whose filter values are bind parameters.
+
+    The expression is bound to the connection it was built on only for its table
+    schemas; it is executed on whichever pooled connection the caller holds.
+    """
+
+    expr: ir.Table
+    # One parameter per non-null filter value, in filter order (see filter_values)
+    params: list[ir.Scalar]
+    # Compiled on first execution: None if the backend does not bind parameters server-side
+    _statement: PreparedStatement | None = field(default=None, init=False, repr=False)
+    _prepared: bool = field(default=False, init=False, repr=False)
+
+    def statement(self, conn: BaseBackend) -> PreparedStatement | None:
+        """The plan's SQL with placeholders for its parameters, compiled once for `conn`'s backend."""
+        if not self._prepared:
+            try:
+                self._statement = prepare(conn, self.expr, self.params)
+            except Exception:
+                # Expressions the backend's compiler cannot render with placeholders keep literal values
+                self._statement = None
+            self._prepared = True
+        return self._statement
+
+    def discard_statement(self) -> None:
+        """Run the plan with literal values from now on, after its prepared statement failed."""
+        self._statement = None
+        self._prepared = True
+
+
+def filter_values(filters: list[dict]) -> list:
+    """Flatten filter values in plan parameter order, one entry per value of list operators.
+
+    Null values are skipped: they compile to IS NULL rather than to a parameter.
+    """
+    values: list = []
+    for f in filters:
+        values.extend(value for value in _values(f) if value is not None)
+    return values
+
+
+def filter_shape(filters: list[dict]) -> tuple:
+    """Part of a plan key describing filters without their values.
+
+    Null values stay in the shape because they compile to IS NULL rather than to a parameter.
+    """
+    return tuple((f["column"], f.get("operator", "eq"), tuple(value is None for value in _values(f))) for f in filters)
+
+
+def _values(f: dict) -> list:
+    value = f["value"]
+    if f.get("operator", "eq") in FILTER_LIST_OPERATORS:
+        return list(value) if isinstance(value, (list, tuple)) else [value]
+    return [value]
+
+
+class PlanCache:
+    """Thread-safe LRU cache of QueryPlans keyed by query shape."""
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._plans: OrderedDict[Hashable, QueryPlan] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def get(self, key: Hashable) -> QueryPlan | None:
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+            return plan
+
+    def put(self, key: Hashable, plan: QueryPlan) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Drop one plan, e.g. after it failed because the underlying table changed."""
+        with self._lock:
+            self._plans.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+
+_plan_cache: PlanCache | None = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> PlanCache:
+    """Return the process-wide plan cache, creating it on first use.
+
+    Environment variables:
+        DAZENSE_PLAN_CACHE_SIZE: Maximum number of cached query plans, 0 to disable (default: 256)
+    """
+    global _plan_cache
+    with _plan_cache_lock:
+        if _plan_cache is None:
+            _plan_cache = PlanCache(max_size=int(os.environ.get("DAZENSE_PLAN_CACHE_SIZE", 256)))
+        return _plan_cache
@@ -0,0 +1,123 @@
+"""Prepared execution of metric query plans: SQL compiled once per plan, filter values sent as driver bind parameters.
+
+Ibis substitutes parameter values into the SQL text, so every filter value gives distinct SQL
+that the warehouse plans (and caches) anew. Compiling each plan once with placeholders keeps
+the text identical across values, and drivers that bind server-side (psycopg, pyodbc,
+Snowflake with qmark binding, DuckDB) send the values separately.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any
+
+import ibis.expr.datashape as ds
+import ibis.expr.datatypes as dt
+import ibis.expr.operations as ops
+import ibis.expr.types as ir
+import pandas as pd
+import pyarrow as pa
+import pyarrow.types as pat
+import sqlglot.expressions as sge
+from ibis import BaseBackend
+from ibis.backends.duckdb.converter import DuckDBPandasData, DuckDBPyArrowData
+from ibis.formats.pandas import PandasData
+from ibis.formats.pyarrow import PyArrowData
+
+from dazense_core.results import cursor_to_arrow
+
+# Ibis backend name -> placeholder its DB-API driver binds server-side
+PLACEHOLDERS = {"duckdb": "?", "mssql": "?", "postgres": "%s", "snowflake": "?"}
+
+_TOKEN = re.compile(r"__dazense_param_(\d+)__")
+
+
+class BindParameter(ops.Value):
+    """Stand-in for a plan parameter, compiled to a placeholder instead of its value."""
+
+    index: int
+    dtype: dt.DataType
+    shape = ds.scalar
+
+
+@dataclass(frozen=True)
+class PreparedStatement:
+    sql: str
+    # Plan parameter index bound to each placeholder, in SQL text order (a parameter may repeat)
+    order: tuple[int, ...]
+    # Parameter types, to normalize filter values (e.g. date strings) before binding them
+    types: tuple[dt.DataType, ...]
+    # Expression the statement was compiled from, whose schema the results are converted to
+    expr: ir.Table
+
+    def to_pyarrow(self, conn: BaseBackend, values: list) -> pa.Table:
+        data_mapper = DuckDBPyArrowData if conn.name == "duckdb" else PyArrowData
+        return self.expr.__pyarrow_result__(self._execute(conn, values), data_mapper=data_mapper)
+
+    def to_pandas(self, conn: BaseBackend, values: list) -> pd.DataFrame:
+        data = self._execute(conn, values)
+        # As Ibis executes to pandas: nested and nullable columns as Python objects, then converted to the schema
+        df = pd.DataFrame(
+            {
+                name: (
+                    column.to_pylist()
+                    if pat.is_nested(column.type) or pat.is_dictionary(column.type) or column.null_count
+                    else column.to_pandas()
+                )
+                for name, column in zip(data.column_names, data.columns)
+            }
+        )
+        data_mapper = DuckDBPandasData if conn.name == "duckdb" else PandasData
+        return self.expr.__pandas_result__(data_mapper.convert_table(df, self.expr.schema()))
+
+    def _execute(self, conn: BaseBackend, values: list) -> pa.Table:
+        """Run the statement and return its rows as typed by the driver."""
+        bound = [dt.normalize(self.types[i], values[i]) for i in self.order]
+        if conn.name == "duckdb":
+            # Executed on the connection itself: DuckDB cursors are separate connections,
+            # which do not see this one's temporary views
+            return cursor_to_arrow(conn.con.execute(self.sql, bound))  # type: ignore[attr-defined]
+        cursor: Any = conn.con.cursor()  # type: ignore[attr-defined]
+        try:
+            cursor.execute(self.sql, bound)
+            return cursor_to_arrow(cursor)
+        finally:
+            cursor.close()
+
+
+def prepare(conn: BaseBackend, expr: ir.Table, params: list[ir.Scalar]) -> PreparedStatement | None:
+    """Compile a plan for prepared execution on `conn`, or None if its backend does not bind server-side."""
+    placeholder = PLACEHOLDERS.get(conn.name)
+    if placeholder is None:
+        return None
+    # Snowflake binds server-side only with qmark/numeric paramstyles (see SnowflakeDatabaseConfig.connect)
+    if conn.name == "snowflake" and getattr(conn.con, "_paramstyle", None) not in ("qmark", "numeric"):  # type: ignore[attr-defined]
+        return None
+
+    compiler_class = _compiler_classes.get(type(conn.compiler))  # type: ignore[attr-defined]
+    if compiler_class is None:
+        compiler_class = _compiler_classes[type(conn.compiler)] = type(  # type: ignore[attr-defined]
+            f"Prepared{type(conn.compiler).__name__}",  # type: ignore[attr-defined]
+            (type(conn.compiler),),  # type: ignore[attr-defined]
+            {"visit_BindParameter": _visit_bind_parameter},
+        )
+    op = expr.op().replace({param.op(): BindParameter(i, param.type()) for i, param in enumerate(params)})
+    sql = compiler_class().to_sqlglot(op.to_expr()).sql(dialect=conn.dialect)  # type: ignore[attr-defined]
+
+    if placeholder == "%s":
+        # The driver formats the SQL with the values: literal percent signs must be escaped
+        sql = sql.replace("%", "%%")
+    order = tuple(int(match) for match in _TOKEN.findall(sql))
+    return PreparedStatement(
+        sql=_TOKEN.sub(placeholder, sql),
+        order=order,
+        types=tuple(param.type() for param in params),
+        expr=expr,
+    )
+
+
+_compiler_classes: dict[type, type] = {}
+
+
+def _visit_bind_parameter(self, op, *, index: int, dtype: dt.DataType) -> sge.Expression:
+    # Typed like the literal it replaces, so the server never has to infer a placeholder's type
+    return self.cast(sge.Var(this=f"__dazense_param_{index}__"), dtype)
@@ -0,0 +1,132 @@
+"""Routing of metric queries to the rollup tables declared on a model."""
+
+from collections.abc import Collection
+from datetime import date, datetime
+
+from .models import ModelDefinition, RollupDefinition, TimeGrain
+
+# Grains a rollup's time bucket can be re-truncated to without mixing periods
+GRAIN_ROLLS_UP_TO = {
+    TimeGrain.HOUR: set(TimeGrain),
+    TimeGrain.DAY: {TimeGrain.DAY, TimeGrain.WEEK, TimeGrain.MONTH, TimeGrain.QUARTER, TimeGrain.YEAR},
+    TimeGrain.WEEK: {TimeGrain.WEEK},
+    TimeGrain.MONTH: {TimeGrain.MONTH, TimeGrain.QUARTER, TimeGrain.YEAR},
+    TimeGrain.QUARTER: {TimeGrain.QUARTER, TimeGrain.YEAR},
+    TimeGrain.YEAR: {TimeGrain.YEAR},
+}
+
+# Time filters that select whole buckets when their value falls on a bucket boundary
+_BUCKET_FILTER_OPERATORS = ("gte", "lt")
+
+
+def time_column(model_def: ModelDefinition) -> str | None:
+    """Column of the model's time dimension (which may name a dimension or a raw column)."""
+    if model_def.time_dimension is None:
+        return None
+    dimension = model_def.dimensions.get(model_def.time_dimension)
+    return dimension.column if dimension is not None else model_def.time_dimension
+
+
+def time_bucket_name(model_def: ModelDefinition, grain: TimeGrain) -> str:
+    return f"{model_def.time_dimension}_{grain.value}"
+
+
+def avg_columns(measure_name: str) -> tuple[str, str]:
+    """Rollup columns an avg measure is stored as: its sum and its non-null count."""
+    return f"{measure_name}__sum", f"{measure_name}__count"
+
+
+def rollup_filter_column(model_def: ModelDefinition, rollup: RollupDefinition, column: str) -> str | None:
+    """Rollup column a filter on a raw model column translates to, or None if the rollup lost that column."""
+    for dim in rollup.dimensions:
+        dim_def = model_def.dimensions.get(dim)
+        if dim_def is not None and dim_def.column == column:
+            return dim
+    if rollup.time_grain is not None and column == time_column(model_def):
+        return time_bucket_name(model_def, rollup.time_grain)
+    return None
+
+
+def can_answer(
+    model_def: ModelDefinition,
+    rollup: RollupDefinition,
+    measures: list[str],
+    dimensions: list[str],
+    filters: list[dict],
+    time_grain: TimeGrain | None,
+) -> bool:
+    """Whether re-aggregating the rollup gives exactly the result of querying the model's table."""
+    if not set(model_def.base_measures(measures)) <= set(rollup.measures) or not set(dimensions) <= set(
+        rollup.dimensions
+    ):
+        return False
+    if time_grain is not None and (rollup.time_grain is None or time_grain not in GRAIN_ROLLS_UP_TO[rollup.time_grain]):
+        return False
+
+    for f in filters:
+        column = rollup_filter_column(model_def, rollup, f["column"])
+        if column is None:
+            return False
+        if rollup.time_grain is not None and column == time_bucket_name(model_def, rollup.time_grain):
+            # Filtering buckets only matches filtering raw times on bucket boundaries
+            operator = f.get("operator", "eq")
+            if operator not in _BUCKET_FILTER_OPERATORS or not is_aligned(f["value"], rollup.time_grain):
+                return False
+    return True
+
+
+def choose_rollup(
+    model_def: ModelDefinition,
+    measures: list[str],
+    dimensions: list[str],
+    filters: list[dict],
+    time_grain: TimeGrain | None,
+    exclude: Collection[str] = (),
+) -> str | None:
+    """Name of the smallest rollup (not in `exclude`) that can answer the query, or None to query the model's table.
+
+    Rollup sizes are estimated from their shape: fewer dimensions first, then coarser time
+    grains, then declaration order.
+    """
+    candidates = [
+        name
+        for name, rollup in model_def.rollups.items()
+        if name not in exclude and can_answer(model_def, rollup, measures, dimensions, filters, time_grain)
+    ]
+    return min(candidates, key=lambda name: _size_rank(model_def.rollups[name]), default=None)
+
+
+def _size_rank(rollup: RollupDefinition) -> tuple[int, int]:
+    grains = list(TimeGrain)
+    fineness = len(grains) - grains.index(rollup.time_grain) if rollup.time_grain is not None else 0
+    return len(rollup.dimensions), fineness
+
+
+def is_aligned(value: object, grain: TimeGrain) -> bool:
+    """Whether a date/time value (or ISO string) falls on the start of a `grain` period."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return False
+    if isinstance(value, datetime):
+        if (value.minute, value.second, value.microsecond) != (0, 0, 0):
+            return False
+        if grain == TimeGrain.HOUR:
+            return True
+        if value.hour != 0:
+            return False
+    elif not isinstance(value, date):
+        return False
+
+    match grain:
+        case TimeGrain.HOUR | TimeGrain.DAY:
+            return True
+        case TimeGrain.WEEK:
+            return value.weekday() == 0
+        case TimeGrain.MONTH:
+            return value.day == 1
+        case TimeGrain.QUARTER:
+            return value.day == 1 and value.month % 3 == 1
+        case TimeGrain.YEAR:
+            return value.day == 1 and value.month == 1
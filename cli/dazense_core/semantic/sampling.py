@@ -0,0 +1,147 @@
+"""Sampled exploratory queries: TABLESAMPLE pushdown, scaled estimates and their confidence bounds."""
+
+from dataclasses import dataclass
+
+import ibis.expr.types as ir
+import sqlglot
+from sqlglot import exp
+
+from .models import AggregationType, ModelDefinition
+
+# Sampling method -> Ibis sample method: bernoulli keeps each row independently, system whole storage blocks
+SAMPLE_METHODS = {"bernoulli": "row", "system": "block"}
+
+# Measures estimated by scaling their value on the sample up by 1 / fraction
+SCALED_TYPES = (AggregationType.COUNT, AggregationType.SUM)
+# Measures that get confidence bounds
+BOUNDED_TYPES = (AggregationType.COUNT, AggregationType.SUM, AggregationType.AVG)
+
+# Normal quantile of two-sided 95% confidence bounds
+Z_95 = 1.96
+
+# Dialects whose TABLESAMPLE only samples blocks, whatever the requested method
+_BLOCK_ONLY_DIALECTS = ("bigquery", "tsql")
+# Dialects without a REPEATABLE / SEED clause for TABLESAMPLE
+_UNSEEDED_DIALECTS = ("bigquery",)
+
+
+@dataclass(frozen=True)
+class Sample:
+    """Sample of a query's base table to compute estimates from instead of exact values."""
+
+    # Share of rows (or blocks) kept, in (0, 1]
+    fraction: float
+    method: str = "bernoulli"
+    # Makes the sample repeatable on backends that support it
+    seed: int | None = None
+
+    @classmethod
+    def from_dict(cls, sample: dict | None) -> "Sample | None":
+        """Parse a query's `sample` parameter ({"fraction", "method", "seed"}), raising ValueError if invalid."""
+        if sample is None:
+            return None
+        if sample.get("fraction") is None:
+            raise ValueError("Sample needs a fraction")
+        result = cls(float(sample["fraction"]), sample.get("method") or "bernoulli", sample.get("seed"))
+        if not 0 < result.fraction <= 1:
+            raise ValueError(f"Sample fraction must be in (0, 1], got {result.fraction}")
+        if result.method not in SAMPLE_METHODS:
+            supported = ", ".join(SAMPLE_METHODS)
+            raise ValueError(f"Unsupported sample method '{result.method}'. Supported: {supported}")
+        return result
+
+    def apply(self, table: ir.Table) -> ir.Table:
+        return table.sample(self.fraction, method=SAMPLE_METHODS[self.method], seed=self.seed)  # type: ignore
+
+
+def bounded_measures(model_def: ModelDefinition, measures: list[str]) -> list[str]:
+    return [name for name in measures if name in model_def.measures and model_def.measures[name].type in BOUNDED_TYPES]
+
+
+def bound_columns(measure: str) -> tuple[str, str]:
+    """Columns of the lower and upper 95% confidence bounds of a sampled measure."""
+    return f"{measure}_lower", f"{measure}_upper"
+
+
+def sample_columns(model_def: ModelDefinition, measures: list[str], sample: Sample | None) -> list[str]:
+    """Names of the bound columns a sampled query adds after the measures, in order."""
+    if sample is None:
+        return []
+    return [column for measure in bounded_measures(model_def, measures) for column in bound_columns(measure)]
+
+
+def scale(value: ir.NumericScalar, agg_type: AggregationType, sample: Sample | None) -> ir.NumericScalar:
+    """Estimate a count or sum over the whole table from its value on the sample."""
+    if sample is None or agg_type not in SCALED_TYPES:
+        return value
+    return value / sample.fraction
+
+
+def bounds(
+    table: ir.Table, agg_type: AggregationType, column: str | None, sample: Sample
+) -> tuple[ir.NumericScalar, ir.NumericScalar]:
+    """95% confidence bounds of a measure estimated from a sampled table.
+
+    Counts and sums use the Horvitz-Thompson variance of Bernoulli sampling, averages the
+    standard error of the mean. Block (system) samples are correlated, so their bounds are
+    narrower than the actual error.
+    """
+    p = sample.fraction
+    match agg_type:
+        case AggregationType.COUNT:
+            n = table.count()
+            estimate = n / p
+            error = (n * (1 - p)).sqrt() / p
+        case AggregationType.SUM:
+            assert column is not None
+            values = table[column]
+            estimate = values.sum() / p
+            error = ((values * values).sum() * (1 - p)).sqrt() / p
+        case _:
+            assert column is not None
+            values = table[column]
+            estimate = values.mean()
+            error = values.std() / values.count().sqrt()
+    return estimate - Z_95 * error, estimate + Z_95 * error
+
+
+def is_repeatable(db_type: str, sample: Sample) -> bool:
+    """Whether sampled SQL reads the same rows on every run: seeded, on a database with a seed clause."""
+    from dazense_core.cache.results import SQL_DIALECTS
+
+    return sample.seed is not None and SQL_DIALECTS.get(db_type) not in _UNSEEDED_DIALECTS
+
+
+def sample_sql(sql: str, db_type: str, sample: Sample) -> str:
+    """Rewrite a query to sample the table each SELECT reads FROM.
+
+    Joined tables are read in full, so joins still find every match of the sampled rows.
+    Raises ValueError if the SQL does not parse or the database has no TABLESAMPLE.
+    """
+    from dazense_core.cache.results import SQL_DIALECTS
+
+    dialect = SQL_DIALECTS.get(db_type)
+    if dialect == "redshift":
+        raise ValueError("Sampling is not supported on Redshift")
+    try:
+        query = sqlglot.parse_one(sql, dialect=dialect)
+    except sqlglot.errors.SqlglotError as e:
+        raise ValueError(f"Cannot sample SQL that does not parse: {e}") from None
+
+    method = "SYSTEM" if sample.method == "system" or dialect in _BLOCK_ONLY_DIALECTS else "BERNOULLI"
+    seeded = is_repeatable(db_type, sample)
+    ctes = {cte.alias_or_name for cte in query.find_all(exp.CTE)}
+    for select in query.find_all(exp.Select):
+        source = select.args.get("from_")
+        table = source.this if source is not None else None
+        if not isinstance(table, exp.Table) or (not table.db and table.name in ctes):
+            continue
+        table.set(
+            "sample",
+            exp.TableSample(
+                method=exp.var(method),
+                percent=exp.Literal.number(f"{sample.fraction * 100:g}"),
+                seed=exp.Literal.number(sample.seed) if seeded else None,
+            ),
+        )
+    return query.sql(dialect=dialect)
@@ -0,0 +1,72 @@
+"""Top-N dimension values, with the rows of all other values aggregated into an "Other" group."""
+
+from dataclasses import dataclass
+
+import ibis
+import ibis.expr.types as ir
+
+from .models import AggregationType, ModelDefinition
+
+# Value of the dimension in the group aggregating every value outside the top N
+OTHER = "Other"
+
+
+@dataclass(frozen=True)
+class TopN:
+    """Keep the `n` values of a query dimension ranking highest by a measure, grouping the rest as OTHER."""
+
+    dimension: str
+    n: int
+    # Measure the values are ranked by (default: the query's first measure)
+    by: str | None = None
+
+    @classmethod
+    def from_dict(cls, top_n: dict | None) -> "TopN | None":
+        """Parse a query's `top_n` parameter ({"dimension", "n", "by"}), raising ValueError if invalid."""
+        if top_n is None:
+            return None
+        if top_n.get("dimension") is None or top_n.get("n") is None:
+            raise ValueError("top_n needs a dimension and n")
+        result = cls(top_n["dimension"], int(top_n["n"]), top_n.get("by"))
+        if result.n < 1:
+            raise ValueError(f"top_n n must be at least 1, got {result.n}")
+        return result
+
+    def ranking_measure(self, measures: list[str]) -> str:
+        return self.by if self.by is not None else measures[0]
+
+
+def validate_top_n(
+    model_def: ModelDefinition, measures: list[str], dimensions: list[str], compare: tuple[str, ...], top_n: TopN | None
+) -> None:
+    if top_n is None:
+        return
+    if top_n.dimension not in dimensions:
+        raise ValueError(f"top_n dimension '{top_n.dimension}' must be one of the query's dimensions")
+    if top_n.by is None and not measures:
+        raise ValueError("top_n needs a measure to rank by: set 'by' or request a measure")
+    by = top_n.ranking_measure(measures)
+    measure_def = model_def.measures.get(by)
+    if measure_def is None:
+        raise ValueError(f"Measure '{by}' not found on model '{model_def.table}'")
+    if measure_def.type == AggregationType.APPROX_TOP_K:
+        raise ValueError(f"top_n cannot rank by '{by}', an approx_top_k measure")
+    if compare:
+        raise ValueError("top_n cannot be combined with compare")
+
+
+def top_values(ranked: ir.Table, n: int) -> ir.Column:
+    """The `n` non-null values of `ranked` (one `__value` row each) with the highest `__rank_by` measure.
+
+    Ranked with a window in the same statement as the query, which reads them as a subquery.
+    """
+    values = ranked.filter(ranked["__value"].notnull())
+    rank = ibis.row_number().over(order_by=[values["__rank_by"].desc(nulls_first=False), values["__value"]])
+    values = values.mutate(__rank=rank)
+    # row_number() counts from 0
+    return values.filter(values["__rank"] < n)["__value"]
+
+
+def top_n_bucket(dimension: ir.Column, top: ir.Column) -> ir.Column:
+    """The dimension as text, or OTHER outside its `top` values (nulls included)."""
+    return dimension.isin(top).fill_null(False).ifelse(dimension.cast("string"), ibis.literal(OTHER))
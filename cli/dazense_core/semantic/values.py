@@ -0,0 +1,131 @@
+"""Local index of the distinct values of low-cardinality dimensions, built by `dazense sync`.
+
+Agents look up valid filter values here instead of running SELECT DISTINCT, and the
+engine rejects `eq`/`in` filters on unknown values without querying the warehouse.
+"""
+
+import difflib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import ibis
+import ibis.expr.datatypes as dt
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .acceleration import write_local_copy
+
+# Folder of the value indexes (one Parquet file per model), relative to the project folder
+VALUE_INDEX_OUTPUT_DIR = "dimension_values"
+
+# Dimensions with more distinct values than this are not indexed
+DEFAULT_MAX_VALUES = 1000
+
+# Seconds an index is trusted to reject filter values: values added later are unknown to it
+DEFAULT_MAX_AGE = 86400.0
+
+_SCHEMA = pa.schema([("dimension", pa.string()), ("type", pa.string()), ("value", pa.string()), ("count", pa.int64())])
+
+
+@dataclass
+class DimensionValues:
+    """Indexed dimensions of a model, each with its (value, row count) pairs, most frequent first.
+
+    Values are stored as strings, as the warehouse casts them, so they compare across column types.
+    """
+
+    values: dict[str, list[tuple[str | None, int]]]
+    # Column type of each dimension, to bring filter values to the warehouse's string form
+    types: dict[str, dt.DataType] = field(default_factory=dict)
+
+    def search(self, dimension: str, prefix: str = "", limit: int = 100) -> list[dict]:
+        """Values of a dimension starting with `prefix` (case-insensitive), most frequent first."""
+        prefix = prefix.lower()
+        matches = [
+            {"value": value, "count": count}
+            for value, count in self.values[dimension]
+            # Nulls only match an empty prefix
+            if (value or "").lower().startswith(prefix)
+        ]
+        return matches[:limit]
+
+    def check(self, dimension: str, value: object) -> None:
+        """Raise ValueError if a filter value is not one of the dimension's values.
+
+        Only string and integer dimensions are checked: the string form of other types
+        (floats, decimals, times, booleans) depends on the warehouse.
+        """
+        text = _as_indexed(self.types.get(dimension), value)
+        if text is None:
+            return
+        known = [v for v, _ in self.values[dimension] if v is not None]
+        if text in known:
+            return
+        message = f"'{value}' is not a value of dimension '{dimension}'"
+        suggestions = difflib.get_close_matches(text, known, n=3)
+        if suggestions:
+            message += f". Did you mean: {', '.join(repr(s) for s in suggestions)}?"
+        raise ValueError(message)
+
+
+def _as_indexed(dtype: dt.DataType | None, value: object) -> str | None:
+    """A filter value as the index stores it, or None if it cannot be compared with the index."""
+    if dtype is None or isinstance(value, bool):
+        return None
+    if dtype.is_string():
+        return str(value)
+    if dtype.is_integer():
+        if isinstance(value, float):
+            return str(int(value)) if value.is_integer() else None
+        try:
+            return str(int(value))  # type: ignore[call-overload]
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def value_index_path(project_path: Path, model_name: str) -> Path:
+    return project_path / VALUE_INDEX_OUTPUT_DIR / f"{model_name}.parquet"
+
+
+def write_value_index(path: Path, values: DimensionValues) -> None:
+    rows = [
+        (dimension, str(values.types[dimension]) if dimension in values.types else None, value, count)
+        for dimension, pairs in values.values.items()
+        for value, count in pairs
+    ]
+    dimensions, types, texts, counts = zip(*rows) if rows else ((), (), (), ())
+    table = pa.table(
+        {"dimension": list(dimensions), "type": list(types), "value": list(texts), "count": list(counts)},
+        schema=_SCHEMA,
+    )
+    write_local_copy(path, table)
+
+
+_indexes: dict[Path, tuple[int, DimensionValues]] = {}
+_indexes_lock = threading.Lock()
+
+
+def read_value_index(path: Path) -> DimensionValues | None:
+    """Read a model's value index, or None if it was never built. Re-read only when the file changes."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return None
+    with _indexes_lock:
+        cached = _indexes.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+    values: dict[str, list[tuple[str | None, int]]] = {}
+    types: dict[str, dt.DataType] = {}
+    # Indexes written before types were recorded have no "type" column: their values are never checked
+    for row in pq.read_table(path).to_pylist():
+        values.setdefault(row["dimension"], []).append((row["value"], row["count"]))
+        if row.get("type") is not None and row["dimension"] not in types:
+            types[row["dimension"]] = ibis.dtype(row["type"])
+    index = DimensionValues(values, types)
+    with _indexes_lock:
+        _indexes[path] = (mtime, index)
+    return index
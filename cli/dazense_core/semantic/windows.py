@@ -0,0 +1,88 @@
+"""Period-over-period comparisons and running totals over the time buckets of a time-grained query."""
+
+from dataclasses import dataclass
+
+from .models import AggregationType, ModelDefinition, TimeGrain
+
+# Shift moving each period onto the period it is compared with, as ibis.interval arguments per grain
+COMPARISON_OFFSETS: dict[str, dict[TimeGrain, dict[str, int]]] = {
+    "previous_period": {
+        TimeGrain.HOUR: {"hours": 1},
+        TimeGrain.DAY: {"days": 1},
+        TimeGrain.WEEK: {"weeks": 1},
+        TimeGrain.MONTH: {"months": 1},
+        TimeGrain.QUARTER: {"months": 3},
+        TimeGrain.YEAR: {"years": 1},
+    },
+    "previous_year": {
+        TimeGrain.HOUR: {"years": 1},
+        TimeGrain.DAY: {"years": 1},
+        # Whole weeks, so that shifted weeks still start on Mondays
+        TimeGrain.WEEK: {"weeks": 52},
+        TimeGrain.MONTH: {"years": 1},
+        TimeGrain.QUARTER: {"years": 1},
+        TimeGrain.YEAR: {"years": 1},
+    },
+}
+
+# Measures whose running total is the sum of their values per period
+CUMULATIVE_TYPES = (AggregationType.COUNT, AggregationType.SUM)
+
+
+@dataclass(frozen=True)
+class Windows:
+    """Columns computed across the time buckets of a result, after aggregation."""
+
+    # Comparisons (see COMPARISON_OFFSETS) added for every measure
+    compare: tuple[str, ...] = ()
+    # Measures whose running total over time is added
+    cumulative: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.compare or self.cumulative)
+
+
+def compared_measures(model_def: ModelDefinition, measures: list[str]) -> list[str]:
+    """Measures that get comparison columns: all but the list-valued approx_top_k ones."""
+    return [
+        name
+        for name in measures
+        if name in model_def.measures and model_def.measures[name].type != AggregationType.APPROX_TOP_K
+    ]
+
+
+def comparison_columns(measure: str, comparison: str) -> tuple[str, str]:
+    """Columns of a measure's value in the compared period and its relative change since then."""
+    return f"{measure}_{comparison}", f"{measure}_{comparison}_change"
+
+
+def cumulative_column(measure: str) -> str:
+    return f"{measure}_cumulative"
+
+
+def window_columns(model_def: ModelDefinition, measures: list[str], windows: Windows) -> list[str]:
+    """Names of the columns `windows` adds after the measures, in order."""
+    columns = []
+    for comparison in windows.compare:
+        for measure in compared_measures(model_def, measures):
+            columns.extend(comparison_columns(measure, comparison))
+    return columns + [cumulative_column(measure) for measure in windows.cumulative]
+
+
+def validate_windows(model_def: ModelDefinition, measures: list[str], time_grain: str | None, windows: Windows) -> None:
+    if not windows:
+        return
+    if time_grain is None:
+        raise ValueError("compare and cumulative require a time_grain")
+    for comparison in windows.compare:
+        if comparison not in COMPARISON_OFFSETS:
+            supported = ", ".join(COMPARISON_OFFSETS)
+            raise ValueError(f"Unsupported comparison '{comparison}'. Supported: {supported}")
+    for measure in windows.cumulative:
+        if measure not in measures:
+            raise ValueError(f"Cumulative measure '{measure}' is not one of the queried measures")
+        measure_def = model_def.measures.get(measure)
+        if measure_def is not None and measure_def.type not in CUMULATIVE_TYPES:
+            raise ValueError(
+                f"Measure '{measure}' of type '{measure_def.type.value}' has no running total, only count and sum do"
+            )
@@ -0,0 +1,87 @@
+import os
+from textwrap import dedent
+
+import pytest
+
+from dazense_core.cache.project import ProjectCache
+from dazense_core.config import DazenseConfigError
+
+
+@pytest.fixture()
+def project(tmp_path):
+    (tmp_path / "dazense_config.yaml").write_text("project_name: test-project\n")
+    (tmp_path / "semantics").mkdir()
+    (tmp_path / "semantics" / "semantic_model.yml").write_text(
+        dedent("""\
+            models:
+              orders:
+                table: orders
+                measures:
+                  order_count:
+                    type: count
+        """)
+    )
+    return tmp_path
+
+
+def _touch(path, content: str) -> None:
+    """Rewrite a file and move its mtime forward so the change is always detected."""
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_returns_same_object_while_unchanged(project):
+    cache = ProjectCache()
+    assert cache.get_config(project) is cache.get_config(project)
+    assert cache.get_semantic_model(project) is cache.get_semantic_model(project)
+
+
+def test_reloads_when_file_changes(project):
+    cache = ProjectCache()
+    assert cache.get_config(project).project_name == "test-project"
+
+    _touch(project / "dazense_config.yaml", "project_name: renamed\n")
+
+    assert cache.get_config(project).project_name == "renamed"
+
+
+def test_missing_file_is_cached_as_none(project):
+    cache = ProjectCache()
+    assert cache.get_business_rules(project) is None
+
+    (project / "semantics" / "business_rules.yml").write_text(
+        dedent("""\
+            rules:
+              - name: r1
+                category: metrics
+                description: D
+                guidance: G
+        """)
+    )
+
+    rules = cache.get_business_rules(project)
+    assert rules is not None
+    assert rules.rules[0].name == "r1"
+
+
+def test_invalidate_bumps_version_and_reloads(project):
+    cache = ProjectCache()
+    first = cache.get_semantic_model(project)
+    version = cache.version
+
+    cache.invalidate(project)
+
+    assert cache.version == version + 1
+    assert cache.get_semantic_model(project) is not first
+
+
+def test_config_error_is_not_cached(project):
+    cache = ProjectCache()
+    _touch(project / "dazense_config.yaml", "databases: []\n")
+
+    with pytest.raises(DazenseConfigError):
+        cache.get_config(project)
+
+    _touch(project / "dazense_config.yaml", "project_name: fixed\n")
+    assert cache.get_config(project).project_name == "fixed"
@@ -0,0 +1,110 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from dazense_core.cache.results import QueryResultCache, normalize_sql
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "select  a, b from t -- comment\n where x=1",
+        "SELECT a,b FROM t WHERE x = 1",
+        "/* leading */ SELECT a, b FROM t WHERE x = 1;",
+    ],
+)
+def test_normalize_sql_ignores_formatting(sql):
+    assert normalize_sql(sql, "duckdb") == "SELECT a, b FROM t WHERE x = 1"
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "INSERT INTO t VALUES (1)",
+        "CREATE TABLE t AS SELECT 1",
+        "SELECT 1; SELECT 2",
+        "SELECT random()",
+        "SELECT now()",
+        "SELECT current_date",
+        "SELECT * FROM t WHERE created_at > current_timestamp - INTERVAL 1 DAY",
+        "SELECT uuid()",
+        "SELECT * FROM t USING SAMPLE 10%",
+        "SELECT * FROM t TABLESAMPLE BERNOULLI (10)",
+        "SELECT FROM WHERE (",
+    ],
+)
+def test_normalize_sql_rejects_uncacheable_sql(sql):
+    assert normalize_sql(sql, "duckdb") is None
+
+
+def test_normalize_sql_keeps_seeded_samples():
+    assert normalize_sql("SELECT * FROM t TABLESAMPLE BERNOULLI (10) REPEATABLE (42)", "duckdb") is not None
+
+
+def test_normalize_sql_uses_dialect():
+    assert normalize_sql("select top 5 id from t", "mssql") == "SELECT TOP 5 id FROM t"
+
+
+def test_get_returns_stored_result():
+    cache = QueryResultCache()
+    df = pd.DataFrame({"a": [1, 2]})
+    cache.put("k", df)
+    assert cache.get("k") is df
+    assert cache.get("missing") is None
+
+
+def test_entries_expire():
+    cache = QueryResultCache(ttl=0)
+    cache.put("k", pd.DataFrame({"a": [1]}))
+    assert cache.get("k") is None
+    assert cache.nbytes == 0
+
+
+def test_evicts_least_recently_used_over_budget():
+    table = pa.table({"a": list(range(100))})
+    cache = QueryResultCache(max_bytes=table.nbytes * 2)
+    cache.put("first", table)
+    cache.put("second", table)
+    cache.get("first")
+    cache.put("third", table)
+
+    assert cache.get("second") is None
+    assert cache.get("first") is table
+    assert cache.get("third") is table
+    assert cache.nbytes == table.nbytes * 2
+
+
+def test_result_larger_than_budget_is_not_cached():
+    table = pa.table({"a": list(range(100))})
+    cache = QueryResultCache(max_bytes=table.nbytes - 1)
+    cache.put("k", table)
+    assert cache.get("k") is None
+
+
+def test_disk_tier_survives_memory_eviction(tmp_path):
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    cache = QueryResultCache(disk_dir=tmp_path)
+    cache.put("k", df)
+
+    restarted = QueryResultCache(disk_dir=tmp_path)
+    result = restarted.get("k")
+    assert isinstance(result, pd.DataFrame)
+    pd.testing.assert_frame_equal(result, df)
+
+    restarted.clear()
+    assert not list(tmp_path.glob("*.parquet"))
+    assert QueryResultCache(disk_dir=tmp_path).get("k") is None
+
+
+def test_disk_tier_keeps_arrow_tables(tmp_path):
+    table = pa.table({"a": [1, 2]})
+    QueryResultCache(disk_dir=tmp_path).put("k", table)
+    assert QueryResultCache(disk_dir=tmp_path).get("k").equals(table)
+
+
+def test_disk_tier_is_best_effort(tmp_path):
+    df = pd.DataFrame({"mixed": [1, "two"]})
+    cache = QueryResultCache(disk_dir=tmp_path)
+    cache.put("k", df)
+    assert cache.get("k") is df
+    assert not list(tmp_path.iterdir())
@@ -4,7 +4,9 @@ from dazense_core.commands.sync.providers import (
     SyncResult,
     get_all_providers,
 )
+from dazense_core.commands.sync.providers.acceleration.provider import AccelerationSyncProvider
 from dazense_core.commands.sync.providers.databases.provider import DatabaseSyncProvider
+from dazense_core.commands.sync.providers.dimension_values.provider import DimensionValuesSyncProvider
 from dazense_core.commands.sync.providers.notion.provider import NotionSyncProvider
 from dazense_core.commands.sync.providers.repositories.provider import RepositorySyncProvider
 
@@ -47,10 +49,12 @@ class TestGetAllProviders:
     def test_returns_list_of_providers(self):
         providers = get_all_providers()
 
-        assert len(providers) == 3
+        assert len(providers) == 5
         assert any(isinstance(p.provider, RepositorySyncProvider) for p in providers)
         assert any(isinstance(p.provider, DatabaseSyncProvider) for p in providers)
         assert any(isinstance(p.provider, NotionSyncProvider) for p in providers)
+        assert any(isinstance(p.provider, AccelerationSyncProvider) for p in providers)
+        assert any(isinstance(p.provider, DimensionValuesSyncProvider) for p in providers)
 
     def test_returns_copy_of_providers(self):
         providers1 = get_all_providers()
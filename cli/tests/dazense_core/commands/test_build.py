@@ -0,0 +1,83 @@
+"""Unit tests for the build command."""
+
+from unittest.mock import patch
+
+import duckdb
+import pytest
+
+from dazense_core.commands.build import build, select_rollups
+from dazense_core.semantic import SemanticModel
+
+SEMANTIC_MODEL = """\
+models:
+  orders:
+    table: orders
+    dimensions:
+      status:
+        column: status
+    measures:
+      order_count:
+        type: count
+      avg_amount:
+        type: avg
+        column: amount
+    rollups:
+      by_status:
+        table: orders_by_status
+        dimensions: [status]
+        measures: [order_count, avg_amount]
+"""
+
+
+@pytest.fixture
+def project(tmp_path, create_config):
+    create_config("""\
+project_name: test-project
+databases:
+  - name: shop
+    type: duckdb
+    path: shop.duckdb
+""")
+    with duckdb.connect(str(tmp_path / "shop.duckdb")) as con:
+        con.execute(
+            "CREATE TABLE orders AS SELECT * FROM (VALUES ('open', 10), ('open', 20), ('closed', 5)) t(status, amount)"
+        )
+    (tmp_path / "semantics").mkdir()
+    (tmp_path / "semantics" / "semantic_model.yml").write_text(SEMANTIC_MODEL)
+    return tmp_path
+
+
+def test_select_rollups_by_model_or_name():
+    semantic_model = SemanticModel.model_validate(
+        {
+            "models": {
+                "orders": {"table": "orders", "rollups": {"a": {"table": "a", "measures": []}}},
+                "trips": {"table": "trips", "rollups": {"b": {"table": "b", "measures": []}}},
+            }
+        }
+    )
+
+    assert select_rollups(semantic_model, None) == [("orders", "a"), ("trips", "b")]
+    assert select_rollups(semantic_model, ["trips"]) == [("trips", "b")]
+    assert select_rollups(semantic_model, ["orders.a"]) == [("orders", "a")]
+    with pytest.raises(ValueError, match="Unknown rollup"):
+        select_rollups(semantic_model, ["orders.b"])
+
+
+@pytest.mark.usefixtures("clean_env")
+def test_build_creates_rollup_tables(project):
+    with patch("dazense_core.commands.build.console"):
+        build()
+
+    with duckdb.connect(str(project / "shop.duckdb"), read_only=True) as con:
+        rows = con.execute("SELECT * FROM orders_by_status ORDER BY status").fetchall()
+    assert rows == [("closed", 1, 5, 1), ("open", 2, 30, 2)]
+
+
+@pytest.mark.usefixtures("clean_env")
+def test_build_exits_on_unknown_rollup(project):
+    with patch("dazense_core.commands.build.console"):
+        with pytest.raises(SystemExit) as exc_info:
+            build(rollup=["missing"])
+
+    assert exc_info.value.code == 1
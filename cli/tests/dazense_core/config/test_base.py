@@ -50,3 +50,23 @@ def test_mixed_dollar_and_no_dollar_syntax():
         content = "a: ${{ env('VAR1') }}, b: {{ env('VAR2') }}"
         result = DazenseConfig._process_env_vars(content)
         assert result == "a: value1, b: value2"
+
+
+def test_try_load_without_change_dir_resolves_relative_paths(tmp_path, monkeypatch):
+    """Test that relative database paths resolve against the project folder, not the cwd."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "dazense_config.yaml").write_text(
+        "project_name: test-project\ndatabases:\n  - name: local\n    type: duckdb\n    path: data.duckdb\n"
+    )
+    elsewhere = tmp_path / "elsewhere"
+    elsewhere.mkdir()
+    monkeypatch.chdir(elsewhere)
+
+    config = DazenseConfig.try_load(project, raise_on_error=True, change_dir=False)
+
+    assert config is not None
+    assert os.getcwd() == str(elsewhere)
+    db = config.databases[0]
+    assert db.resolve_path(db.path) == str(project.resolve() / "data.duckdb")
+    assert db.resolve_path("/abs/key.pem") == "/abs/key.pem"
@@ -0,0 +1,119 @@
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.pool import ConnectionPool
+
+
+@pytest.fixture()
+def db_config():
+    return DuckDBConfig(name="test-db", path=":memory:")
+
+
+def test_reuses_released_connection(db_config):
+    pool = ConnectionPool()
+    with pool.connection(db_config) as first:
+        pass
+    with pool.connection(db_config) as second:
+        pass
+    assert first is second
+    assert pool.size == 1
+
+
+def test_concurrent_checkouts_get_distinct_connections(db_config):
+    pool = ConnectionPool()
+    with pool.connection(db_config) as first, pool.connection(db_config) as second:
+        assert first is not second
+    assert pool.size == 2
+
+
+def test_different_configs_do_not_share(db_config):
+    pool = ConnectionPool()
+    other = DuckDBConfig(name="other-db", path=":memory:")
+    with pool.connection(db_config) as first:
+        pass
+    with pool.connection(other) as second:
+        pass
+    assert first is not second
+
+
+def test_evicts_least_recently_used_idle_connection_when_full(db_config):
+    pool = ConnectionPool(max_size=1)
+    other = DuckDBConfig(name="other-db", path=":memory:")
+    with pool.connection(db_config):
+        pass
+    with pool.connection(other):
+        pass
+    assert pool.size == 1
+
+
+def test_waits_for_release_when_full(db_config):
+    pool = ConnectionPool(max_size=1, acquire_timeout=5)
+    conn = pool.acquire(db_config)
+    acquired = []
+
+    def worker():
+        acquired.append(pool.acquire(db_config))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    pool.release(db_config, conn)
+    thread.join(timeout=5)
+
+    assert acquired == [conn]
+
+
+def test_times_out_when_full(db_config):
+    pool = ConnectionPool(max_size=1, acquire_timeout=0.05)
+    pool.acquire(db_config)
+    with pytest.raises(TimeoutError):
+        pool.acquire(db_config)
+
+
+def test_idle_connections_expire(db_config):
+    pool = ConnectionPool(idle_timeout=0)
+    with pool.connection(db_config) as first:
+        pass
+    with pool.connection(db_config) as second:
+        pass
+    assert first is not second
+    assert pool.size == 1
+
+
+def test_unhealthy_connection_is_replaced_after_failure(db_config):
+    pool = ConnectionPool()
+    with pytest.raises(RuntimeError):
+        with pool.connection(db_config) as first:
+            raise RuntimeError("query failed")
+
+    with patch.object(DuckDBConfig, "is_connection_alive", return_value=False):
+        with pool.connection(db_config) as second:
+            pass
+
+    assert first is not second
+    assert pool.size == 1
+
+
+def test_close_all_closes_checked_out_connections_on_release(db_config):
+    pool = ConnectionPool()
+    with pool.connection(db_config) as first:
+        pool.close_all()
+        first.raw_sql("SELECT 1")
+    assert pool.size == 0
+    with pytest.raises(Exception):
+        first.raw_sql("SELECT 1")
+
+    with pool.connection(db_config) as second:
+        pass
+    assert first is not second
+    assert pool.size == 1
+
+
+def test_execute_sql_uses_pool(db_config):
+    with patch("dazense_core.config.databases.base.get_connection_pool") as get_pool:
+        get_pool.return_value = ConnectionPool()
+        db_config.execute_sql("CREATE TABLE t AS SELECT 42 AS answer")
+        df = db_config.execute_sql("SELECT answer FROM t")
+    assert df["answer"].tolist() == [42]
@@ -0,0 +1,122 @@
+from unittest.mock import patch
+
+import duckdb
+import ibis
+import pytest
+
+from dazense_core.commands.sync.providers.databases.context import DatabaseContext
+from dazense_core.config.databases import ConnectionPool
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache, parse_columns_snapshot, sync_snapshot_path
+from dazense_core.templates.engine import TemplateEngine
+
+
+@pytest.fixture()
+def project(tmp_path):
+    with duckdb.connect(str(tmp_path / "shop.duckdb")) as con:
+        con.execute(
+            """
+            CREATE TABLE orders (
+                order_id INTEGER NOT NULL,
+                status VARCHAR,
+                amount DECIMAL(10, 2),
+                created_at TIMESTAMP,
+                tags VARCHAR[]
+            )
+            """
+        )
+        con.execute("INSERT INTO orders VALUES (1, 'open', 10.5, '2024-01-01', ['a'])")
+
+    db_config = DuckDBConfig(name="shop", path="shop.duckdb")
+    db_config.set_project_path(tmp_path)
+    conn = db_config.connect()
+    yield db_config, conn
+    conn.disconnect()
+
+
+def _write_snapshot(db_config, conn) -> None:
+    ctx = DatabaseContext(
+        conn,
+        "main",
+        "orders",
+        column_descriptions=db_config.fetch_column_descriptions(conn, "main", "orders"),
+    )
+    path = sync_snapshot_path(db_config, "main", "orders")
+    assert path is not None
+    path.parent.mkdir(parents=True)
+    path.write_text(TemplateEngine().render("databases/columns.md.j2", db=ctx, table_name="orders", dataset="main"))
+
+
+def test_columns_snapshot_round_trips_schema(project):
+    db_config, conn = project
+    _write_snapshot(db_config, conn)
+
+    schema = parse_columns_snapshot(sync_snapshot_path(db_config, "main", "orders").read_text())
+
+    assert schema == conn.table("orders", database="main").schema()
+
+
+def test_parse_columns_snapshot_with_descriptions():
+    schema = parse_columns_snapshot(
+        '# orders\n\n- status (string, "Order status (open, closed)")\n- amount (decimal(10, 2) NOT NULL, "Total")\n'
+    )
+    assert schema == ibis.schema({"status": "string", "amount": "!decimal(10, 2)"})
+
+
+def test_parse_columns_snapshot_rejects_other_formats():
+    assert parse_columns_snapshot("# orders\n\nError generating content: boom") is None
+    assert parse_columns_snapshot("- id (not a type)") is None
+
+
+def test_reuses_table_handle_and_rebinds_connection(project):
+    db_config, conn = project
+    cache = SchemaCache()
+    first = cache.table(conn, db_config, "orders", "main", snapshot=False)
+
+    other = ibis.duckdb.connect()
+    other.raw_sql(
+        "CREATE TABLE orders AS SELECT 2 AS order_id, 'x' AS status, 1.0 AS amount, NULL AS created_at, NULL AS tags"
+    )
+    with patch.object(type(other), "table", side_effect=AssertionError("catalog lookup")):
+        second = cache.table(other, db_config, "orders", "main")
+
+    assert first.schema() == second.schema()
+    assert second.order_id.max().execute() == 2
+
+
+def test_seeds_from_sync_snapshot_until_invalidated(project):
+    db_config, conn = project
+    _write_snapshot(db_config, conn)
+    cache = SchemaCache()
+
+    with patch.object(type(conn), "table", side_effect=AssertionError("catalog lookup")):
+        table = cache.table(conn, db_config, "orders", "main")
+    assert table.count().execute() == 1
+
+    cache.invalidate(db_config)
+    with patch.object(type(conn), "table", wraps=conn.table) as lookup:
+        cache.table(conn, db_config, "orders", "main")
+    assert lookup.call_count == 1
+
+
+def test_invalidating_one_table_keeps_the_others(project):
+    db_config, _ = project
+    cache = SchemaCache()
+    cache.mark_unavailable(db_config, "orders_rollup", "main")
+
+    cache.invalidate(db_config)
+    assert cache.is_unavailable(db_config, "orders_rollup", "main")
+
+    cache.invalidate(db_config, "orders_rollup", "main")
+    assert not cache.is_unavailable(db_config, "orders_rollup", "main")
+    key = (ConnectionPool.config_key(db_config), "main", "orders_rollup")
+    assert cache._skip_snapshot == {key}
+
+
+def test_ttl_zero_disables_cache(project):
+    db_config, conn = project
+    cache = SchemaCache(ttl=0)
+    with patch.object(type(conn), "table", wraps=conn.table) as lookup:
+        cache.table(conn, db_config, "orders", "main")
+        cache.table(conn, db_config, "orders", "main")
+    assert lookup.call_count == 2
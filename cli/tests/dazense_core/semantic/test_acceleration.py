@@ -0,0 +1,125 @@
+import os
+
+import ibis
+import pyarrow.parquet as pq
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.pool import ConnectionPool
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.acceleration import can_answer, local_copy_path
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.models import SemanticModel
+from dazense_core.semantic.plans import PlanCache
+
+
+@pytest.fixture()
+def semantic_model(tmp_path):
+    model = SemanticModel.model_validate(
+        {
+            "models": {
+                "orders": {
+                    "table": "orders",
+                    "schema": "main",
+                    "time_dimension": "order_date",
+                    "dimensions": {"status": {"column": "status"}, "channel": {"column": "channel"}},
+                    "measures": {
+                        "order_count": {"type": "count"},
+                        "total_amount": {"type": "sum", "column": "amount"},
+                    },
+                    "joins": {
+                        "customer": {"to_model": "orders", "foreign_key": "user_id", "related_key": "user_id"},
+                    },
+                    "acceleration": {
+                        "columns": ["status", "amount", "order_date"],
+                        "filters": [{"column": "order_date", "operator": "gte", "value": "2024-01-02"}],
+                    },
+                },
+            }
+        }
+    )
+    model.set_project_path(tmp_path)
+    return model
+
+
+@pytest.fixture()
+def warehouse():
+    conn = ibis.duckdb.connect()
+    conn.raw_sql("""
+        CREATE TABLE main.orders AS SELECT * FROM (VALUES
+            (1, 'completed', 'web', 100, DATE '2024-01-01'),
+            (2, 'completed', 'store', 50, DATE '2024-01-02'),
+            (2, 'cancelled', 'web', 75, DATE '2024-01-03'),
+            (3, 'completed', 'web', 200, DATE '2024-01-04')
+        ) AS t(user_id, status, channel, amount, order_date)
+    """)
+    return conn
+
+
+@pytest.fixture()
+def engine(semantic_model, warehouse):
+    engine = SemanticEngine(
+        semantic_model,
+        [DuckDBConfig(name="test-db", path=":memory:")],
+        pool=ConnectionPool(),
+        plan_cache=PlanCache(),
+        schema_cache=SchemaCache(),
+    )
+    engine._connections["test-db"] = warehouse
+    return engine
+
+
+RECENT = [{"column": "order_date", "operator": "gte", "value": "2024-01-03"}]
+
+
+def test_accelerate_writes_pruned_and_filtered_copy(engine, tmp_path):
+    assert engine.accelerate("orders") == 3
+
+    copy = pq.read_table(local_copy_path(tmp_path, "orders"))
+    assert copy.column_names == ["status", "amount", "order_date"]
+
+
+def test_fresh_copy_answers_queries_it_covers(engine, warehouse):
+    engine.accelerate("orders")
+    warehouse.raw_sql("DELETE FROM main.orders")
+
+    result = engine.query("orders", ["total_amount"], ["status"], filters=RECENT, order_by=[{"column": "status"}])
+
+    assert result == [{"status": "cancelled", "total_amount": 75}, {"status": "completed", "total_amount": 200}]
+
+
+def test_replaced_copy_is_read_without_reconnecting(engine, warehouse):
+    engine.accelerate("orders")
+    assert engine.query("orders", ["order_count"], filters=RECENT) == [{"order_count": 2}]
+
+    warehouse.raw_sql("INSERT INTO main.orders VALUES (4, 'completed', 'web', 10, DATE '2024-01-05')")
+    engine.accelerate("orders")
+    warehouse.raw_sql("DELETE FROM main.orders")
+
+    assert engine.query("orders", ["order_count"], filters=RECENT) == [{"order_count": 3}]
+
+
+def test_stale_copy_falls_back_to_warehouse(engine, warehouse, tmp_path):
+    engine.accelerate("orders")
+    path = local_copy_path(tmp_path, "orders")
+    os.utime(path, (0, 0))
+    warehouse.raw_sql("DELETE FROM main.orders")
+
+    assert engine.query("orders", ["order_count"], filters=RECENT) == [{"order_count": 0}]
+
+
+@pytest.mark.parametrize(
+    "measures, dimensions, filters, answered",
+    [
+        (["total_amount"], ["status"], RECENT, True),
+        (["order_count"], [], [{"column": "order_date", "operator": "gte", "value": "2024-01-02"}], True),
+        (["order_count"], [], [{"column": "order_date", "operator": "gt", "value": "2024-01-01"}], False),
+        (["order_count"], [], [], False),
+        (["order_count"], ["channel"], RECENT, False),
+        (["order_count"], ["customer.status"], RECENT, False),
+        (["order_count"], [], RECENT + [{"column": "customer.status", "value": "completed"}], False),
+    ],
+)
+def test_can_answer(semantic_model, measures, dimensions, filters, answered):
+    model_def = semantic_model.models["orders"]
+    assert can_answer(model_def, model_def.acceleration, measures, dimensions, filters, None) is answered
@@ -0,0 +1,91 @@
+from dazense_core.semantic.batch import merge_queries, select_rows
+
+
+def test_merges_queries_differing_only_by_measures():
+    groups = merge_queries(
+        [
+            {"model_name": "orders", "measures": ["order_count"], "dimensions": ["status"]},
+            {"model_name": "orders", "measures": ["total_amount"], "dimensions": ["channel"]},
+            {"model_name": "orders", "measures": ["total_amount", "order_count"], "dimensions": ["status"]},
+        ]
+    )
+
+    assert [(g.dimensions, g.measures, g.members) for g in groups] == [
+        (["status"], ["order_count", "total_amount"], [0, 2]),
+        (["channel"], ["total_amount"], [1]),
+    ]
+
+
+def test_does_not_merge_different_filters_or_limits():
+    base = {"model_name": "orders", "measures": ["order_count"]}
+    groups = merge_queries(
+        [
+            base,
+            {**base, "filters": [{"column": "status", "value": "completed"}]},
+            {**base, "limit": 10},
+            {**base, "order_by": [{"column": "order_count"}], "limit": 10},
+            {**base, "time_grain": "month"},
+            {**base, "time_grain": "month", "time_range": {"start": "2024-01-01"}},
+        ]
+    )
+
+    assert len(groups) == 6
+
+
+def test_top_n_queries_merge_only_when_ranked_by_the_same_measure():
+    top_n = {"dimension": "status", "n": 3}
+    groups = merge_queries(
+        [
+            {"model_name": "orders", "measures": ["order_count"], "dimensions": ["status"], "top_n": top_n},
+            {"model_name": "orders", "measures": ["total_amount"], "dimensions": ["status"], "top_n": top_n},
+            {
+                "model_name": "orders",
+                "measures": ["total_amount"],
+                "dimensions": ["status"],
+                "top_n": {**top_n, "by": "order_count"},
+            },
+        ]
+    )
+
+    assert [(g.measures, g.top_n["by"], g.members) for g in groups] == [
+        (["order_count", "total_amount"], "order_count", [0, 2]),
+        (["total_amount"], "total_amount", [1]),
+    ]
+
+
+def test_query_kwargs_match_engine_signature():
+    (group,) = merge_queries([{"model_name": "orders", "measures": ["order_count"], "limit": 5}])
+    assert group.query_kwargs() == {
+        "model_name": "orders",
+        "measures": ["order_count"],
+        "dimensions": [],
+        "filters": [],
+        "order_by": [],
+        "limit": 5,
+        "time_grain": None,
+        "time_range": None,
+        "compare": [],
+        "cumulative": [],
+        "sample": None,
+        "top_n": None,
+    }
+
+
+def test_select_rows_projects_member_columns():
+    rows = [{"customer_name": "Alice", "order_count": 2, "total_amount": 150}]
+    assert select_rows(rows, ["customer_name", "total_amount"]) == [{"customer_name": "Alice", "total_amount": 150}]
+
+
+def test_top_n_query_without_measures_is_left_to_fail_on_its_own():
+    top_n = {"dimension": "status", "n": 3}
+    groups = merge_queries(
+        [
+            {"model_name": "orders", "measures": [], "dimensions": ["status"], "top_n": top_n},
+            {"model_name": "orders", "measures": ["order_count"], "dimensions": ["status"], "top_n": top_n},
+        ]
+    )
+
+    assert [(g.top_n, g.members) for g in groups] == [
+        (top_n, [0]),
+        ({**top_n, "by": "order_count"}, [1]),
+    ]
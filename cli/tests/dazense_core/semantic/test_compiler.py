@@ -0,0 +1,193 @@
+from textwrap import dedent
+
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import sync_snapshot_path
+from dazense_core.semantic import artifact
+from dazense_core.semantic.compiler import compile_semantic_model
+from dazense_core.semantic.models import ModelDefinition, SemanticModel
+
+SEMANTIC_MODEL = dedent("""\
+    models:
+      orders:
+        table: orders
+        schema: main
+        primary_key: order_id
+        time_dimension: created_at
+        dimensions:
+          status:
+            column: status
+        measures:
+          order_count:
+            type: count
+          total_amount:
+            type: sum
+            column: amount
+        joins:
+          customer:
+            to_model: customers
+            foreign_key: customer_id
+            related_key: customer_id
+            type: many_to_one
+      customers:
+        table: customers
+        schema: main
+        dimensions:
+          name:
+            column: name
+        measures:
+          customer_count:
+            type: count
+""")
+
+
+@pytest.fixture()
+def project(tmp_path):
+    (tmp_path / "semantics").mkdir()
+    (tmp_path / "semantics" / "semantic_model.yml").write_text(SEMANTIC_MODEL)
+
+    db_config = DuckDBConfig(name="shop", path="shop.duckdb")
+    db_config.set_project_path(tmp_path)
+    _write_snapshot(
+        db_config,
+        "orders",
+        "- order_id (int32 NOT NULL)\n- customer_id (int32)\n- status (string)\n"
+        "- amount (decimal(10, 2))\n- created_at (timestamp)\n",
+    )
+    _write_snapshot(db_config, "customers", "- customer_id (int32 NOT NULL)\n- name (string)\n")
+    return tmp_path, db_config
+
+
+def _write_snapshot(db_config, table: str, columns: str) -> None:
+    path = sync_snapshot_path(db_config, "main", table)
+    assert path is not None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"# {table}\n\n**Dataset:** `main`\n\n## Columns\n\n{columns}")
+
+
+def test_compile_writes_artifact_loaded_instead_of_yaml(project):
+    project_path, db_config = project
+
+    result = compile_semantic_model(project_path, [db_config])
+
+    assert result.success
+    assert result.unchecked == []
+    assert result.path == project_path / artifact.ARTIFACT_FILE
+    assert result.path.exists()
+
+    model = SemanticModel.load(project_path)
+    assert isinstance(model.models, artifact.LazyModels)
+    assert model.project_path == project_path.resolve()
+    assert model.get_model("orders").measures["total_amount"].column == "amount"
+    assert model.models["customers"] is model.models["customers"]
+    assert model.model_dump() == SemanticModel.parse(SEMANTIC_MODEL.encode()).model_dump()
+
+
+def test_models_are_validated_on_first_use(project):
+    project_path, db_config = project
+    compile_semantic_model(project_path, [db_config])
+
+    model = SemanticModel.load(project_path)
+
+    assert set(model.models) == {"orders", "customers"}
+    assert model.models._models == {}
+    assert isinstance(model.models["orders"], ModelDefinition)
+    assert set(model.models._models) == {"orders"}
+
+
+def test_stale_artifact_is_ignored(project):
+    project_path, db_config = project
+    compile_semantic_model(project_path, [db_config])
+
+    yaml_path = project_path / "semantics" / "semantic_model.yml"
+    yaml_path.write_text(SEMANTIC_MODEL.replace("column: status", "column: order_status"))
+
+    model = SemanticModel.load(project_path)
+    assert not isinstance(model.models, artifact.LazyModels)
+    assert model.models["orders"].dimensions["status"].column == "order_status"
+
+
+def test_corrupt_artifact_falls_back_to_yaml(project):
+    project_path, _ = project
+    (project_path / artifact.ARTIFACT_FILE).write_text('{"format": ')
+
+    model = SemanticModel.load(project_path)
+    assert model.models["orders"].table == "orders"
+
+
+def test_artifact_of_another_dazense_version_is_ignored(project, monkeypatch):
+    project_path, db_config = project
+    compile_semantic_model(project_path, [db_config])
+
+    monkeypatch.setattr(artifact, "__version__", "0.0.0")
+
+    model = SemanticModel.load(project_path)
+    assert not isinstance(model.models, artifact.LazyModels)
+
+
+def test_time_dimension_may_name_a_dimension(project):
+    project_path, db_config = project
+    yaml_path = project_path / "semantics" / "semantic_model.yml"
+    yaml_path.write_text(
+        SEMANTIC_MODEL.replace("time_dimension: created_at", "time_dimension: created").replace(
+            "      status:\n", "      created:\n        column: created_at\n      status:\n"
+        )
+    )
+
+    result = compile_semantic_model(project_path, [db_config])
+
+    assert result.errors == []
+
+
+def test_fingerprint_is_the_yaml_hash(project):
+    project_path, _ = project
+    model = SemanticModel.load(project_path)
+    assert model.source_hash == artifact.source_hash(SEMANTIC_MODEL.encode())
+
+
+def test_compile_reports_columns_missing_from_synced_schema(project):
+    project_path, db_config = project
+    yaml_path = project_path / "semantics" / "semantic_model.yml"
+    yaml_path.write_text(
+        SEMANTIC_MODEL.replace("column: amount", "column: total").replace("related_key: customer_id", "related_key: id")
+    )
+
+    result = compile_semantic_model(project_path, [db_config])
+
+    assert not result.success
+    assert result.path is None
+    assert not (project_path / artifact.ARTIFACT_FILE).exists()
+    assert result.errors == [
+        "orders: join 'customer' related_key 'id' is not a column of main.customers",
+        "orders: measure 'total_amount' column 'total' is not a column of main.orders",
+    ]
+
+
+def test_compile_skips_tables_that_were_not_synced(project):
+    project_path, db_config = project
+    sync_snapshot_path(db_config, "main", "customers").unlink()
+
+    result = compile_semantic_model(project_path, [db_config])
+
+    assert result.success
+    assert result.unchecked == ["customers"]
+    assert "not checked" in result.get_summary()
+
+
+def test_compile_reports_unknown_join_model(project):
+    project_path, db_config = project
+    yaml_path = project_path / "semantics" / "semantic_model.yml"
+    yaml_path.write_text(SEMANTIC_MODEL.replace("to_model: customers", "to_model: clients"))
+
+    result = compile_semantic_model(project_path, [db_config])
+
+    assert result.errors == ["orders: join 'customer' references unknown model 'clients'"]
+
+
+def test_compile_raises_on_invalid_semantic_model(project):
+    project_path, db_config = project
+    (project_path / "semantics" / "semantic_model.yml").write_text("models:\n  orders:\n    schema: main\n")
+
+    with pytest.raises(ValueError):
+        compile_semantic_model(project_path, [db_config])
@@ -1,9 +1,13 @@
+import math
+
 import ibis
 import pytest
 
 from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
 from dazense_core.semantic.engine import SemanticEngine
 from dazense_core.semantic.models import SemanticModel
+from dazense_core.semantic.plans import PlanCache
 
 
 @pytest.fixture()
@@ -56,6 +60,14 @@ def semantic_model():
                         "first_name": {"column": "first_name"},
                     },
                     "measures": {"customer_count": {"type": "count"}},
+                    "joins": {
+                        "orders": {
+                            "to_model": "orders",
+                            "foreign_key": "customer_id",
+                            "related_key": "user_id",
+                            "type": "one_to_many",
+                        }
+                    },
                 },
                 "orders": {
                     "table": "orders",
@@ -68,6 +80,12 @@ def semantic_model():
                         "order_count": {"type": "count"},
                         "total_amount": {"type": "sum", "column": "amount"},
                         "avg_order_value": {"type": "avg", "column": "amount"},
+                        "approx_customers": {"type": "approx_count_distinct", "column": "user_id"},
+                        "median_amount": {"type": "median", "column": "amount"},
+                        "p90_amount": {"type": "percentile", "column": "amount", "percentile": 90},
+                        "top_status": {"type": "approx_top_k", "column": "status", "k": 1},
+                        "orders_per_customer": {"type": "derived", "expression": "order_count / approx_customers"},
+                        "net_amount": {"type": "derived", "expression": "(total_amount - 10) * 1.0"},
                     },
                     "joins": {
                         "customer": {
@@ -87,7 +105,7 @@ def semantic_model():
 def engine(semantic_model, duckdb_with_data, monkeypatch):
     """Create engine with a mock DuckDB config that returns our test connection."""
     db_config = DuckDBConfig(name="test-db", path=":memory:")
-    engine = SemanticEngine(semantic_model, [db_config])
+    engine = SemanticEngine(semantic_model, [db_config], plan_cache=PlanCache(), schema_cache=SchemaCache())
     # Override the connection to use our pre-populated one
     engine._connections["test-db"] = duckdb_with_data
     return engine
@@ -163,6 +181,100 @@ def test_join_dimension(engine):
     assert "Bob" in names
 
 
+def test_one_to_many_join_dimension_does_not_fan_out(engine):
+    result = engine.query("customers", measures=["customer_count"], dimensions=["orders.status"])
+    by_status = {row["orders_status"]: row["customer_count"] for row in result}
+    assert by_status == {"completed": 3, "cancelled": 1}
+
+
+def test_filter_on_joined_model_uses_semi_join(engine, duckdb_with_data):
+    result = engine.query(
+        "orders", measures=["order_count"], filters=[{"column": "customer.first_name", "value": "Bob"}]
+    )
+    assert result[0]["order_count"] == 2
+
+    (plan,) = engine._plans._plans.values()
+    sql = duckdb_with_data.compile(plan.expr, params={p: "Bob" for p in plan.params})
+    assert "SEMI JOIN" in sql
+
+
+def test_filter_on_many_side_does_not_fan_out(engine):
+    result = engine.query(
+        "customers", measures=["customer_count"], filters=[{"column": "orders.status", "value": "completed"}]
+    )
+    assert result[0]["customer_count"] == 3
+
+
+@pytest.mark.parametrize(
+    "names, status, expected",
+    [
+        (["Alice", "Bob"], "completed", [("Alice", 2), ("Bob", 1)]),
+        (["Bob", "Charlie"], "cancelled", [("Bob", 1)]),
+    ],
+)
+def test_joined_filters_and_dimensions_share_a_plan(engine, names, status, expected):
+    result = engine.query(
+        "orders",
+        measures=["order_count"],
+        dimensions=["customer.first_name"],
+        filters=[
+            {"column": "customer.first_name", "operator": "in", "value": names},
+            {"column": "status", "value": status},
+        ],
+        order_by=[{"column": "customer.first_name"}],
+    )
+    assert [(row["customer_first_name"], row["order_count"]) for row in result] == expected
+
+
+@pytest.mark.parametrize("native", [True, False])
+def test_approximate_measures(engine, duckdb_with_data, monkeypatch, native):
+    if not native:
+        monkeypatch.setattr(duckdb_with_data, "has_operation", lambda operation: False)
+
+    result = engine.query("orders", measures=["approx_customers", "median_amount", "p90_amount"])
+
+    assert result[0]["approx_customers"] == 3
+    assert result[0]["median_amount"] == pytest.approx(100)
+    assert 125 <= result[0]["p90_amount"] <= 200
+    (plan,) = engine._plans._plans.values()
+    assert ("APPROX" in duckdb_with_data.compile(plan.expr)) is native
+
+
+def test_approx_top_k_per_group(engine):
+    result = engine.query(
+        "orders",
+        measures=["order_count", "top_status"],
+        dimensions=["customer.first_name"],
+        order_by=[{"column": "customer.first_name"}],
+    )
+    assert result == [
+        {"customer_first_name": "Alice", "order_count": 2, "top_status": ["completed"]},
+        {"customer_first_name": "Bob", "order_count": 2, "top_status": ["cancelled"]},
+        {"customer_first_name": "Charlie", "order_count": 1, "top_status": ["completed"]},
+    ]
+    assert engine.query("orders", measures=["top_status"]) == [{"top_status": ["completed"]}]
+
+
+def test_derived_measures_are_computed_in_the_same_query(engine):
+    result = engine.query(
+        "orders",
+        measures=["orders_per_customer", "net_amount"],
+        dimensions=["status"],
+        order_by=[{"column": "status"}],
+    )
+    assert result == [
+        {"status": "cancelled", "orders_per_customer": 1.0, "net_amount": pytest.approx(65.0)},
+        {"status": "completed", "orders_per_customer": 4 / 3, "net_amount": pytest.approx(465.0)},
+    ]
+
+
+def test_derived_measure_divides_safely_by_zero(engine):
+    result = engine.query(
+        "orders", measures=["orders_per_customer"], filters=[{"column": "status", "value": "refunded"}]
+    )
+    assert math.isnan(result[0]["orders_per_customer"])
+
+
 def test_model_not_found(engine):
     with pytest.raises(ValueError, match="Model 'nonexistent' not found"):
         engine.query("nonexistent", measures=["order_count"])
@@ -191,3 +303,109 @@ def test_avg_measure(engine):
     result = engine.query("orders", measures=["avg_order_value"])
     assert len(result) == 1
     assert result[0]["avg_order_value"] == pytest.approx(110.0)
+
+
+def test_query_arrow(engine):
+    table = engine.query_arrow(
+        "orders", measures=["order_count"], dimensions=["status"], order_by=[{"column": "status"}]
+    )
+    assert table.column_names == ["status", "order_count"]
+    assert table.to_pylist() == [
+        {"status": "cancelled", "order_count": 1},
+        {"status": "completed", "order_count": 4},
+    ]
+
+
+def test_plan_is_reused_across_filter_values(engine, monkeypatch):
+    first = engine.query(
+        "orders",
+        measures=["order_count"],
+        filters=[{"column": "status", "value": "completed"}, {"column": "user_id", "operator": "in", "value": [1, 2]}],
+    )
+
+    def no_catalog_lookup(*args, **kwargs):
+        raise AssertionError("table() should not be called for a cached plan")
+
+    monkeypatch.setattr(engine._connections["test-db"], "table", no_catalog_lookup)
+    second = engine.query(
+        "orders",
+        measures=["order_count"],
+        filters=[{"column": "status", "value": "cancelled"}, {"column": "user_id", "operator": "in", "value": [2, 3]}],
+    )
+
+    assert first[0]["order_count"] == 3
+    assert second[0]["order_count"] == 1
+    assert len(engine._plans) == 1
+
+
+def test_plan_shape_includes_null_filter_values(engine):
+    engine.query("orders", measures=["order_count"], filters=[{"column": "status", "value": "completed"}])
+    result = engine.query("orders", measures=["order_count"], filters=[{"column": "status", "value": None}])
+    assert result[0]["order_count"] == 0
+    assert len(engine._plans) == 2
+
+
+def test_filter_value_is_coerced_to_column_type(engine):
+    result = engine.query(
+        "orders",
+        measures=["order_count"],
+        filters=[{"column": "order_date", "operator": "gte", "value": "2024-01-04"}],
+    )
+    assert result[0]["order_count"] == 2
+
+
+def test_failed_plan_is_discarded(engine):
+    with pytest.raises(Exception):
+        engine.query("orders", measures=["order_count"], filters=[{"column": "amount", "value": "not-a-number"}])
+    assert len(engine._plans) == 0
+
+
+def test_time_grain_groups_by_truncated_time_dimension(engine):
+    result = engine.query("orders", measures=["order_count"], time_grain="month")
+    assert len(result) == 1
+    assert result[0]["order_count"] == 5
+    assert str(result[0]["order_date_month"]).startswith("2024-01-01")
+
+
+def test_time_range_filters_raw_time_dimension(engine):
+    result = engine.query(
+        "orders",
+        measures=["order_count"],
+        dimensions=["status"],
+        time_grain="day",
+        time_range={"start": "2024-01-02", "end": "2024-01-04"},
+        order_by=[{"column": "order_date_day"}],
+    )
+    assert [(str(r["order_date_day"])[:10], r["status"]) for r in result] == [
+        ("2024-01-02", "completed"),
+        ("2024-01-03", "cancelled"),
+    ]
+
+
+def test_time_grain_compiles_to_date_trunc_and_range_predicates(engine, duckdb_with_data):
+    engine.query("orders", measures=["order_count"], time_grain="week", time_range={"start": "2024-01-01"})
+    (plan,) = engine._plans._plans.values()
+    sql = duckdb_with_data.compile(plan.expr, params={p: "2024-01-01" for p in plan.params})
+    assert "DATE_TRUNC('WEEK'" in sql
+    assert '"order_date" >= ' in sql
+
+
+def test_result_columns_include_time_bucket(engine):
+    assert engine.result_columns("orders", ["order_count"], ["customer.first_name"], time_grain="year") == [
+        "order_date_year",
+        "customer_first_name",
+        "order_count",
+    ]
+
+
+@pytest.mark.parametrize(
+    ("model_name", "time_grain", "message"),
+    [
+        ("orders", "decade", "Unsupported time grain 'decade'"),
+        ("orders", "hour", "not supported on date column"),
+        ("customers", "day", "has no time_dimension"),
+    ],
+)
+def test_invalid_time_grain(engine, model_name, time_grain, message):
+    with pytest.raises(ValueError, match=message):
+        engine.query(model_name, measures=[f"{model_name[:-1]}_count"], time_grain=time_grain)
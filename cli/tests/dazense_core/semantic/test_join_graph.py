@@ -0,0 +1,140 @@
+import ibis
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.join_graph import join_path, resolve
+from dazense_core.semantic.models import SemanticModel
+from dazense_core.semantic.plans import PlanCache
+
+MODEL = SemanticModel.model_validate(
+    {
+        "models": {
+            "trips": {
+                "table": "trips",
+                "schema": "main",
+                "time_dimension": "pickup_date",
+                "dimensions": {"zone_id": {"column": "zone_id"}},
+                "measures": {"trip_count": {"type": "count"}, "total_fare": {"type": "sum", "column": "fare"}},
+                "joins": {
+                    "zone": {"to_model": "zones", "foreign_key": "zone_id", "related_key": "id"},
+                    "dropoff_zone": {"to_model": "zones", "foreign_key": "dropoff_zone_id", "related_key": "id"},
+                },
+            },
+            "payments": {
+                "table": "payments",
+                "schema": "main",
+                "time_dimension": "paid_date",
+                "dimensions": {"zone_id": {"column": "zone_id"}},
+                "measures": {"total_paid": {"type": "sum", "column": "amount"}},
+                "joins": {"zone": {"to_model": "zones", "foreign_key": "zone_id", "related_key": "id"}},
+            },
+            "zones": {
+                "table": "zones",
+                "schema": "main",
+                "primary_key": "id",
+                "dimensions": {"zone_name": {"column": "name"}},
+                "joins": {"borough": {"to_model": "boroughs", "foreign_key": "borough_id", "related_key": "id"}},
+            },
+            "boroughs": {
+                "table": "boroughs",
+                "schema": "main",
+                "primary_key": "id",
+                "dimensions": {"borough_name": {"column": "name"}},
+            },
+        }
+    }
+)
+
+
+@pytest.fixture()
+def engine():
+    conn = ibis.duckdb.connect()
+    conn.raw_sql("""
+        CREATE TABLE main.trips AS SELECT * FROM (VALUES
+            (0, 1, 10.0::DOUBLE, DATE '2024-01-05'),
+            (1, 2, 20.0, DATE '2024-01-06'),
+            (2, 2, 30.0, DATE '2024-02-01'),
+            (2, 0, 40.0, DATE '2024-02-02')
+        ) AS t(zone_id, dropoff_zone_id, fare, pickup_date)
+    """)
+    conn.raw_sql("""
+        CREATE TABLE main.payments AS SELECT * FROM (VALUES
+            (0, 5.0::DOUBLE, DATE '2024-01-10'),
+            (0, 6.0, DATE '2024-02-10'),
+            (1, 7.0, DATE '2024-02-11')
+        ) AS t(zone_id, amount, paid_date)
+    """)
+    conn.raw_sql("""
+        CREATE TABLE main.zones AS SELECT * FROM (VALUES (0, 'Airport', 0), (1, 'Harlem', 1), (2, 'SoHo', 1))
+        AS t(id, name, borough_id)
+    """)
+    conn.raw_sql("CREATE TABLE main.boroughs AS SELECT * FROM (VALUES (0, 'Queens'), (1, 'Manhattan')) AS t(id, name)")
+    engine = SemanticEngine(
+        MODEL, [DuckDBConfig(name="test-db", path=":memory:")], plan_cache=PlanCache(), schema_cache=SchemaCache()
+    )
+    engine._connections["test-db"] = conn
+    return engine
+
+
+def test_join_path_is_the_shortest_chain_of_joins():
+    trips = MODEL.models["trips"]
+    assert join_path(MODEL, trips, "zones") == ("zone",)
+    assert join_path(MODEL, trips, "boroughs") == ("zone", "borough")
+    assert join_path(MODEL, MODEL.models["boroughs"], "trips") is None
+
+    assert resolve(MODEL, trips, "boroughs.name").path == ("zone", "borough")
+    assert resolve(MODEL, trips, "dropoff_zone.borough.name").path == ("dropoff_zone", "borough")
+    with pytest.raises(ValueError, match="Join 'borough' not defined on model 'trips'"):
+        resolve(MODEL, trips, "borough.name")
+
+
+def test_dimensions_and_filters_several_joins_away(engine):
+    result = engine.query(
+        "trips",
+        ["trip_count", "total_fare"],
+        ["boroughs.name", "dropoff_zone.borough.name"],
+        filters=[{"column": "zone.borough.name", "operator": "ne", "value": "Queens"}],
+        order_by=[{"column": "dropoff_zone.borough.name"}],
+    )
+
+    assert result == [
+        {"boroughs_name": "Manhattan", "dropoff_zone_borough_name": "Manhattan", "trip_count": 2, "total_fare": 50.0},
+        {"boroughs_name": "Manhattan", "dropoff_zone_borough_name": "Queens", "trip_count": 1, "total_fare": 40.0},
+    ]
+
+
+def test_measures_of_several_models_are_aggregated_separately_then_joined(engine):
+    result = engine.query(
+        "trips",
+        ["trip_count", "payments.total_paid"],
+        ["zone.name"],
+        order_by=[{"column": "zone.name"}],
+        time_range={"start": "2024-02-01"},
+    )
+
+    # Harlem has a payment but no trip in February, SoHo trips but no payment
+    assert result == [
+        {"zone_name": "Airport", "trip_count": 0, "payments_total_paid": 6.0},
+        {"zone_name": "Harlem", "trip_count": 0, "payments_total_paid": 7.0},
+        {"zone_name": "SoHo", "trip_count": 2, "payments_total_paid": pytest.approx(float("nan"), nan_ok=True)},
+    ]
+    assert engine.result_columns("trips", ["trip_count", "payments.total_paid"], ["zone.name"]) == [
+        "zone_name",
+        "trip_count",
+        "payments_total_paid",
+    ]
+
+
+def test_measures_of_several_models_by_month(engine):
+    result = engine.query(
+        "trips", ["total_fare", "payments.total_paid"], time_grain="month", order_by=[{"column": "pickup_date_month"}]
+    )
+
+    assert [(r["total_fare"], r["payments_total_paid"]) for r in result] == [(30.0, 5.0), (70.0, 13.0)]
+
+
+def test_models_without_a_shared_dimension_cannot_be_combined(engine):
+    with pytest.raises(ValueError, match="No join path from model 'payments' to model 'trips'"):
+        engine.query("trips", ["trip_count", "payments.total_paid"], ["trips.dropoff_zone_id"])
@@ -125,5 +125,38 @@ def test_all_aggregation_types():
             measure = Measure(type=agg_type)
             assert measure.column is None
         else:
-            measure = Measure(type=agg_type, column="value")
+            measure = Measure(type=agg_type, column="value", percentile=50, expression="other")
             assert measure.column == "value"
+
+
+@pytest.mark.parametrize("percentile", [None, -1, 101])
+def test_percentile_measure_requires_percentile_in_range(percentile):
+    with pytest.raises(ValueError, match="between 0 and 100"):
+        Measure(type=AggregationType.PERCENTILE, column="value", percentile=percentile)
+
+
+@pytest.mark.parametrize(
+    "expression, message",
+    [
+        ("revenue / missing", "unknown measure 'missing'"),
+        ("revenue / ratio", "references itself"),
+        ("__import__('os')", "only measure names"),
+        ("revenue ** 2", "only measure names"),
+        ("revenue /", "Invalid expression"),
+    ],
+)
+def test_derived_measure_validation(expression, message):
+    with pytest.raises(ValueError, match=message):
+        SemanticModel.model_validate(
+            {
+                "models": {
+                    "orders": {
+                        "table": "orders",
+                        "measures": {
+                            "revenue": {"type": "sum", "column": "amount"},
+                            "ratio": {"type": "derived", "expression": expression},
+                        },
+                    }
+                }
+            }
+        )
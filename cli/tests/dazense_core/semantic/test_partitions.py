@@ -0,0 +1,141 @@
+from datetime import datetime
+
+import ibis
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.models import SemanticModel, TimeGrain
+from dazense_core.semantic.partitions import PartitionCache, truncate
+from dazense_core.semantic.plans import PlanCache
+
+
+class Clock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return Clock(datetime(2024, 1, 5, 12))
+
+
+@pytest.fixture()
+def warehouse():
+    conn = ibis.duckdb.connect()
+    conn.raw_sql("""
+        CREATE TABLE main.orders AS SELECT * FROM (VALUES
+            ('web', 100, DATE '2024-01-01'),
+            ('store', 50, DATE '2024-01-02'),
+            ('web', 75, DATE '2024-01-03'),
+            ('web', 20, DATE '2024-01-04'),
+            ('store', 10, DATE '2024-01-05')
+        ) AS t(channel, amount, order_date)
+    """)
+    return conn
+
+
+@pytest.fixture()
+def engine(warehouse, clock):
+    model = SemanticModel.model_validate(
+        {
+            "models": {
+                "orders": {
+                    "table": "orders",
+                    "schema": "main",
+                    "time_dimension": "order_date",
+                    "dimensions": {"channel": {"column": "channel"}},
+                    "measures": {"total_amount": {"type": "sum", "column": "amount"}},
+                    "partition_cache": {"freshness_window": 86400},
+                },
+            }
+        }
+    )
+    engine = SemanticEngine(
+        model,
+        [DuckDBConfig(name="test-db", path=":memory:")],
+        plan_cache=PlanCache(),
+        schema_cache=SchemaCache(),
+        partition_cache=PartitionCache(clock=clock),
+    )
+    engine._connections["test-db"] = warehouse
+    return engine
+
+
+def daily(engine, **kwargs) -> dict:
+    rows = engine.query("orders", ["total_amount"], time_grain="day", order_by=[{"column": "order_date_day"}], **kwargs)
+    return {row["order_date_day"].day: row["total_amount"] for row in rows}
+
+
+def test_repeat_query_recomputes_only_open_partitions(engine, warehouse):
+    assert daily(engine) == {1: 100, 2: 50, 3: 75, 4: 20, 5: 10}
+
+    # Closed days are served from the cache, even when their rows change afterwards
+    warehouse.raw_sql("UPDATE main.orders SET amount = amount + 1")
+    assert daily(engine) == {1: 100, 2: 50, 3: 75, 4: 21, 5: 11}
+
+
+def test_watermark_moves_forward(engine, warehouse, clock):
+    daily(engine)
+    clock.now = datetime(2024, 1, 7, 12)
+    warehouse.raw_sql("UPDATE main.orders SET amount = amount + 1")
+
+    # Jan 4 was open at the last query, so it is recomputed once and cached from now on
+    assert daily(engine) == {1: 100, 2: 50, 3: 75, 4: 21, 5: 11}
+    warehouse.raw_sql("UPDATE main.orders SET amount = amount + 1")
+    assert daily(engine) == {1: 100, 2: 50, 3: 75, 4: 21, 5: 11}
+
+
+def test_time_range_reuses_and_extends_cached_partitions(engine, warehouse):
+    assert daily(engine, time_range={"start": "2024-01-02"}) == {2: 50, 3: 75, 4: 20, 5: 10}
+    warehouse.raw_sql("UPDATE main.orders SET amount = amount + 1")
+
+    assert daily(engine, time_range={"start": "2024-01-03", "end": "2024-01-04"}) == {3: 75}
+    # Starts before the cached partitions: everything is recomputed
+    assert daily(engine, time_range={"start": "2024-01-01"}) == {1: 101, 2: 51, 3: 76, 4: 21, 5: 11}
+
+
+def test_partitions_are_cached_per_dimensions_and_filters(engine, warehouse):
+    filters = [{"column": "channel", "value": "web"}]
+    assert daily(engine, filters=filters) == {1: 100, 3: 75, 4: 20}
+    warehouse.raw_sql("UPDATE main.orders SET amount = amount + 1")
+
+    assert daily(engine, filters=[{"column": "channel", "value": "store"}]) == {2: 51, 5: 11}
+    rows = engine.query("orders", ["total_amount"], ["channel"], time_grain="day", filters=filters)
+    assert sorted(row["total_amount"] for row in rows) == [21, 76, 101]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"limit": 10},
+        {"time_range": {"start": "2024-01-01T06:00:00"}},
+        {"filters": [{"column": "order_date", "operator": "gt", "value": "2024-01-01"}]},
+    ],
+)
+def test_queries_cutting_across_partitions_bypass_the_cache(engine, warehouse, kwargs):
+    daily(engine, **kwargs)
+    warehouse.raw_sql("UPDATE main.orders SET amount = amount + 1")
+
+    assert daily(engine, **kwargs)[2] == 51
+
+
+def test_partition_cache_requires_time_dimension():
+    with pytest.raises(ValueError, match="requires a time_dimension"):
+        SemanticModel.model_validate({"models": {"orders": {"table": "orders", "partition_cache": {}}}})
+
+
+@pytest.mark.parametrize(
+    "grain, expected",
+    [
+        (TimeGrain.HOUR, datetime(2024, 5, 15, 13)),
+        (TimeGrain.WEEK, datetime(2024, 5, 13)),
+        (TimeGrain.QUARTER, datetime(2024, 4, 1)),
+    ],
+)
+def test_truncate(grain, expected):
+    assert truncate(datetime(2024, 5, 15, 13, 45), grain) == expected
@@ -0,0 +1,49 @@
+import ibis
+
+from dazense_core.semantic.plans import PlanCache, QueryPlan, filter_shape, filter_values
+
+
+def _plan() -> QueryPlan:
+    return QueryPlan(expr=ibis.table({"a": "int64"}, name="t"), params=[])
+
+
+def test_filter_shape_ignores_values_but_not_nulls_or_list_lengths():
+    def shape(value, operator="eq"):
+        return filter_shape([{"column": "status", "operator": operator, "value": value}])
+
+    assert shape("completed") == shape("cancelled")
+    assert shape("completed") != shape(None)
+    assert shape(["a", "b"], "in") == shape(["c", "d"], "in")
+    assert shape(["a", "b"], "in") != shape(["a"], "in")
+
+
+def test_filter_values_flattens_in_plan_order():
+    filters = [
+        {"column": "status", "value": "completed"},
+        {"column": "user_id", "operator": "in", "value": [1, 2]},
+    ]
+    assert filter_values(filters) == ["completed", 1, 2]
+
+
+def test_filter_values_skip_nulls():
+    filters = [{"column": "status", "value": None}, {"column": "user_id", "operator": "in", "value": [1, None]}]
+    assert filter_values(filters) == [1]
+
+
+def test_plan_cache_evicts_least_recently_used():
+    cache = PlanCache(max_size=2)
+    first, second, third = _plan(), _plan(), _plan()
+    cache.put("first", first)
+    cache.put("second", second)
+    cache.get("first")
+    cache.put("third", third)
+
+    assert cache.get("second") is None
+    assert cache.get("first") is first
+    assert cache.get("third") is third
+
+
+def test_plan_cache_can_be_disabled():
+    cache = PlanCache(max_size=0)
+    cache.put("k", _plan())
+    assert cache.get("k") is None
@@ -0,0 +1,98 @@
+import ibis
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.models import SemanticModel
+from dazense_core.semantic.plans import PlanCache
+
+
+@pytest.fixture()
+def warehouse():
+    conn = ibis.duckdb.connect()
+    conn.raw_sql("""
+        CREATE TABLE main.trips AS
+        SELECT
+            i,
+            CASE WHEN i % 3 = 0 THEN 'Cash' ELSE 'Credit card' END AS payment_type,
+            DATE '2024-01-01' + i::INTEGER AS pickup_date,
+            (i % 10)::DOUBLE AS fare
+        FROM range(100) AS t(i)
+    """)
+    return conn
+
+
+@pytest.fixture()
+def engine(warehouse):
+    model = SemanticModel.model_validate(
+        {
+            "models": {
+                "trips": {
+                    "table": "trips",
+                    "schema": "main",
+                    "time_dimension": "pickup_date",
+                    "dimensions": {"payment_type": {"column": "payment_type"}},
+                    "measures": {"trip_count": {"type": "count"}, "total_fare": {"type": "sum", "column": "fare"}},
+                },
+            }
+        }
+    )
+    engine = SemanticEngine(
+        model, [DuckDBConfig(name="test-db", path=":memory:")], plan_cache=PlanCache(), schema_cache=SchemaCache()
+    )
+    engine._connections["test-db"] = warehouse
+    return engine
+
+
+def test_filter_values_are_bound_to_one_statement(engine):
+    for payment_type, expected in [("Cash", 34), ("Credit card", 66)]:
+        assert engine.query("trips", ["trip_count"], filters=[{"column": "payment_type", "value": payment_type}]) == [
+            {"trip_count": expected}
+        ]
+
+    (plan,) = engine._plans._plans.values()
+    statement = plan._statement
+    assert statement is not None
+    assert "Cash" not in statement.sql and "?" in statement.sql
+
+
+def test_list_and_time_range_values_are_bound_in_order(engine):
+    result = engine.query_arrow(
+        "trips",
+        ["trip_count", "total_fare"],
+        ["payment_type"],
+        filters=[{"column": "payment_type", "operator": "in", "value": ["Cash", "Credit card"]}],
+        order_by=[{"column": "payment_type"}],
+        time_range={"start": "2024-01-11", "end": "2024-01-21"},
+    )
+
+    assert result.to_pylist() == [
+        {"payment_type": "Cash", "trip_count": 3, "total_fare": 15.0},
+        {"payment_type": "Credit card", "trip_count": 7, "total_fare": 30.0},
+    ]
+    (plan,) = engine._plans._plans.values()
+    assert len(plan._statement.order) == 4
+
+
+def test_backends_without_server_side_binding_use_literal_values(engine, warehouse, monkeypatch):
+    monkeypatch.setattr(warehouse, "name", "bigquery", raising=False)
+
+    assert engine.query("trips", ["trip_count"], filters=[{"column": "payment_type", "value": "Cash"}]) == [
+        {"trip_count": 34}
+    ]
+    (plan,) = engine._plans._plans.values()
+    assert plan._prepared and plan._statement is None
+
+
+def test_failed_statement_falls_back_to_literal_values(engine, monkeypatch):
+    def fail(self, conn, values):
+        raise RuntimeError("statement rejected")
+
+    monkeypatch.setattr("dazense_core.semantic.prepared.PreparedStatement._execute", fail)
+
+    assert engine.query("trips", ["trip_count"], filters=[{"column": "payment_type", "value": "Cash"}]) == [
+        {"trip_count": 34}
+    ]
+    (plan,) = engine._plans._plans.values()
+    assert plan._prepared and plan._statement is None
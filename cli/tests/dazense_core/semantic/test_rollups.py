@@ -0,0 +1,242 @@
+import time
+from datetime import date, datetime
+
+import ibis
+import pytest
+
+from dazense_core.config.databases import ConnectionPool
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.models import SemanticModel, TimeGrain
+from dazense_core.semantic.plans import PlanCache
+from dazense_core.semantic.rollups import choose_rollup, is_aligned
+
+
+@pytest.fixture()
+def semantic_model():
+    return SemanticModel.model_validate(
+        {
+            "models": {
+                "orders": {
+                    "table": "orders",
+                    "schema": "main",
+                    "time_dimension": "order_date",
+                    "dimensions": {
+                        "status": {"column": "status"},
+                        "channel": {"column": "channel"},
+                    },
+                    "measures": {
+                        "order_count": {"type": "count"},
+                        "total_amount": {"type": "sum", "column": "amount"},
+                        "avg_amount": {"type": "avg", "column": "amount"},
+                        "max_amount": {"type": "max", "column": "amount"},
+                        "customer_count": {"type": "count_distinct", "column": "user_id"},
+                        "amount_per_order": {"type": "derived", "expression": "total_amount / order_count"},
+                    },
+                    "rollups": {
+                        "daily_by_status_channel": {
+                            "table": "orders_daily_by_status_channel",
+                            "dimensions": ["status", "channel"],
+                            "measures": ["order_count", "total_amount", "avg_amount", "max_amount"],
+                            "time_grain": "day",
+                        },
+                        "by_status": {
+                            "table": "orders_by_status",
+                            "dimensions": ["status"],
+                            "measures": ["order_count", "total_amount"],
+                        },
+                    },
+                },
+            }
+        }
+    )
+
+
+@pytest.fixture()
+def engine(semantic_model):
+    conn = ibis.duckdb.connect()
+    conn.raw_sql("""
+        CREATE TABLE main.orders AS SELECT * FROM (VALUES
+            (1, 1, 'completed', 'web', 100, DATE '2024-01-01'),
+            (2, 1, 'completed', 'store', 50, DATE '2024-01-02'),
+            (3, 2, 'cancelled', 'web', 75, DATE '2024-01-31'),
+            (4, 3, 'completed', 'web', NULL, DATE '2024-02-01'),
+            (5, 2, 'completed', 'store', 125, DATE '2024-02-15')
+        ) AS t(order_id, user_id, status, channel, amount, order_date)
+    """)
+    engine = SemanticEngine(
+        semantic_model,
+        [DuckDBConfig(name="test-db", path=":memory:")],
+        plan_cache=PlanCache(),
+        schema_cache=SchemaCache(),
+    )
+    engine._connections["test-db"] = conn
+    return engine
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ({"measures": ["order_count"], "dimensions": ["status"]}, "by_status"),
+        ({"measures": ["order_count"], "dimensions": ["channel"]}, "daily_by_status_channel"),
+        ({"measures": ["avg_amount"]}, "daily_by_status_channel"),
+        ({"measures": ["order_count"], "time_grain": TimeGrain.MONTH}, "daily_by_status_channel"),
+        ({"measures": ["order_count"], "time_grain": TimeGrain.HOUR}, None),
+        ({"measures": ["customer_count"]}, None),
+        ({"measures": ["amount_per_order"], "dimensions": ["status"]}, "by_status"),
+        ({"measures": ["order_count"], "filters": [{"column": "status", "value": "completed"}]}, "by_status"),
+        ({"measures": ["order_count"], "filters": [{"column": "user_id", "value": 1}]}, None),
+        (
+            {
+                "measures": ["order_count"],
+                "filters": [{"column": "order_date", "operator": "gte", "value": "2024-01-02"}],
+            },
+            "daily_by_status_channel",
+        ),
+        (
+            {
+                "measures": ["order_count"],
+                "filters": [{"column": "order_date", "operator": "gt", "value": "2024-01-02"}],
+            },
+            None,
+        ),
+    ],
+)
+def test_choose_rollup_picks_smallest_that_can_answer(semantic_model, query, expected):
+    query = {"dimensions": [], "filters": [], "time_grain": None, **query}
+    assert choose_rollup(semantic_model.models["orders"], **query) == expected
+
+
+@pytest.mark.parametrize(
+    "value, grain, aligned",
+    [
+        ("2024-01-01", TimeGrain.YEAR, True),
+        ("2024-04-01", TimeGrain.QUARTER, True),
+        ("2024-05-01", TimeGrain.QUARTER, False),
+        (date(2024, 1, 15), TimeGrain.MONTH, False),
+        (date(2024, 1, 15), TimeGrain.WEEK, True),
+        (datetime(2024, 1, 15, 13), TimeGrain.DAY, False),
+        (datetime(2024, 1, 15, 13), TimeGrain.HOUR, True),
+        ("not a date", TimeGrain.DAY, False),
+    ],
+)
+def test_is_aligned(value, grain, aligned):
+    assert is_aligned(value, grain) is aligned
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {"measures": ["order_count", "total_amount"], "dimensions": ["status"], "order_by": [{"column": "status"}]},
+        {"measures": ["avg_amount", "max_amount"], "dimensions": ["channel"], "order_by": [{"column": "channel"}]},
+        {
+            "measures": ["order_count", "avg_amount"],
+            "time_grain": "month",
+            "time_range": {"start": "2024-01-02", "end": "2024-03-01"},
+            "order_by": [{"column": "order_date_month"}],
+        },
+        {"measures": ["order_count"], "filters": [{"column": "status", "value": "refunded"}]},
+        {"measures": ["amount_per_order"], "dimensions": ["channel"], "order_by": [{"column": "channel"}]},
+    ],
+)
+def test_rollup_results_match_model_table(engine, query):
+    expected = engine.query("orders", **query)
+
+    engine.build_rollup("orders", "daily_by_status_channel")
+    engine.build_rollup("orders", "by_status")
+    engine._plans.clear()
+
+    assert engine.query("orders", **query) == pytest.approx(expected)
+    assert any(key[3] is not None for key in engine._plans._plans)
+
+
+def test_missing_rollup_table_falls_back_to_model_table(engine):
+    result = engine.query("orders", measures=["order_count"], dimensions=["status"], order_by=[{"column": "status"}])
+    assert result == [{"status": "cancelled", "order_count": 1}, {"status": "completed", "order_count": 4}]
+
+
+def test_missing_rollup_is_skipped_until_built(engine):
+    db_config = engine._databases["test-db"]
+    query = {"measures": ["order_count"], "dimensions": ["status"], "order_by": [{"column": "status"}]}
+
+    engine.query("orders", **query)
+    # Only the rollup table is invalidated, the model table keeps its cached schema
+    assert engine._schemas._skip_snapshot == {(ConnectionPool.config_key(db_config), "main", "orders_by_status")}
+    assert engine._schemas.is_unavailable(db_config, "orders_by_status", "main")
+
+    engine.query("orders", **query)
+    assert all(key[3] is None for key in engine._plans._plans)
+
+    engine.build_rollup("orders", "by_status")
+    assert not engine._schemas.is_unavailable(db_config, "orders_by_status", "main")
+    assert engine.query("orders", **query) == [
+        {"status": "cancelled", "order_count": 1},
+        {"status": "completed", "order_count": 4},
+    ]
+    assert any(key[3] == "by_status" for key in engine._plans._plans)
+
+
+def test_rollup_built_by_another_process_is_used_once_the_mark_expires(engine, monkeypatch):
+    db_config = engine._databases["test-db"]
+    query = {"measures": ["order_count"], "dimensions": ["status"], "order_by": [{"column": "status"}]}
+    engine.query("orders", **query)
+    assert engine._schemas.is_unavailable(db_config, "orders_by_status", "main")
+
+    # As `dazense build` would, without invalidating this process's schema cache
+    engine._connections["test-db"].raw_sql(
+        "CREATE TABLE main.orders_by_status AS "
+        "SELECT status, COUNT(*) AS order_count, SUM(amount) AS total_amount FROM main.orders GROUP BY status"
+    )
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + engine._schemas.unavailable_ttl + 1)
+
+    assert engine.query("orders", **query) == [
+        {"status": "cancelled", "order_count": 1},
+        {"status": "completed", "order_count": 4},
+    ]
+    assert any(key[3] == "by_status" for key in engine._plans._plans)
+
+
+def test_transient_rollup_error_does_not_mark_it_unavailable(engine, monkeypatch):
+    db_config = engine._databases["test-db"]
+    engine.build_rollup("orders", "by_status")
+
+    def fail(*args, **kwargs):
+        raise ConnectionError("warehouse unreachable")
+
+    monkeypatch.setattr(engine, "_build_rollup_plan", fail)
+    engine.query("orders", measures=["order_count"], dimensions=["status"])
+
+    assert not engine._schemas.is_unavailable(db_config, "orders_by_status", "main")
+
+
+def test_build_rollup_into_another_database(engine, semantic_model, tmp_path):
+    local = DuckDBConfig(name="local", path="rollups.duckdb")
+    local.set_project_path(tmp_path)
+    semantic_model.models["orders"].database = "test-db"
+    semantic_model.models["orders"].rollups["by_status"].database = "local"
+    engine._databases["local"] = local
+
+    assert engine.build_rollup("orders", "by_status") == 2
+    conn = ibis.duckdb.connect(str(tmp_path / "rollups.duckdb"))
+    assert conn.table("orders_by_status").order_by("status").to_pyarrow().to_pylist() == [
+        {"status": "cancelled", "order_count": 1, "total_amount": 75},
+        {"status": "completed", "order_count": 4, "total_amount": 275},
+    ]
+    conn.disconnect()
+
+
+def test_rollup_rejects_measures_that_cannot_be_reaggregated():
+    with pytest.raises(ValueError, match="cannot be re-aggregated"):
+        SemanticModel.model_validate(
+            {
+                "models": {
+                    "orders": {
+                        "table": "orders",
+                        "measures": {"customer_count": {"type": "count_distinct", "column": "user_id"}},
+                        "rollups": {"r": {"table": "r", "measures": ["customer_count"]}},
+                    }
+                }
+            }
+        )
@@ -0,0 +1,116 @@
+import ibis
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.models import SemanticModel
+from dazense_core.semantic.plans import PlanCache
+from dazense_core.semantic.sampling import Sample, sample_sql
+
+
+@pytest.fixture()
+def engine():
+    conn = ibis.duckdb.connect()
+    conn.raw_sql("""
+        CREATE TABLE main.trips AS
+        SELECT i % 3 AS vendor_id, (i % 10)::DOUBLE AS fare FROM range(30000) AS t(i)
+    """)
+    model = SemanticModel.model_validate(
+        {
+            "models": {
+                "trips": {
+                    "table": "trips",
+                    "schema": "main",
+                    "dimensions": {"vendor_id": {"column": "vendor_id"}},
+                    "measures": {
+                        "trip_count": {"type": "count"},
+                        "total_fare": {"type": "sum", "column": "fare"},
+                        "avg_fare": {"type": "avg", "column": "fare"},
+                        "max_fare": {"type": "max", "column": "fare"},
+                        "fare_per_trip": {"type": "derived", "expression": "total_fare / trip_count"},
+                    },
+                },
+            }
+        }
+    )
+    engine = SemanticEngine(
+        model, [DuckDBConfig(name="test-db", path=":memory:")], plan_cache=PlanCache(), schema_cache=SchemaCache()
+    )
+    engine._connections["test-db"] = conn
+    return engine
+
+
+def test_sample_scales_estimates_and_bounds_them(engine):
+    (row,) = engine.query(
+        "trips",
+        ["trip_count", "total_fare", "avg_fare", "max_fare", "fare_per_trip"],
+        sample={"fraction": 0.2, "seed": 7},
+    )
+
+    for measure, exact in [("trip_count", 30000), ("total_fare", 135000), ("avg_fare", 4.5)]:
+        assert row[f"{measure}_lower"] < row[measure] < row[f"{measure}_upper"]
+        assert row[measure] == pytest.approx(exact, rel=0.05)
+    assert row["fare_per_trip"] == pytest.approx(row["total_fare"] / row["trip_count"])
+    # Not scaled, and without bounds
+    assert row["max_fare"] == 9
+    assert "max_fare_lower" not in row
+
+
+def test_full_sample_is_exact_per_group(engine):
+    rows = engine.query(
+        "trips", ["trip_count"], ["vendor_id"], order_by=[{"column": "vendor_id"}], sample={"fraction": 1}
+    )
+
+    assert [(r["trip_count"], r["trip_count_lower"], r["trip_count_upper"]) for r in rows] == [
+        (10000, 10000, 10000)
+    ] * 3
+
+
+def test_result_columns_include_bound_columns(engine):
+    assert engine.result_columns("trips", ["trip_count", "max_fare"], sample={"fraction": 0.1}) == [
+        "trip_count",
+        "max_fare",
+        "trip_count_lower",
+        "trip_count_upper",
+    ]
+
+
+@pytest.mark.parametrize(
+    "sample, message",
+    [({"fraction": 0}, "must be in"), ({"fraction": 0.1, "method": "reservoir"}, "Unsupported sample method")],
+)
+def test_invalid_sample(engine, sample, message):
+    with pytest.raises(ValueError, match=message):
+        engine.query("trips", ["trip_count"], sample=sample)
+
+
+@pytest.mark.parametrize(
+    "db_type, expected",
+    [
+        (
+            "duckdb",
+            "SELECT COUNT(*) FROM trips AS t TABLESAMPLE BERNOULLI (1 PERCENT) REPEATABLE (3) "
+            "JOIN zones AS z ON t.zone = z.zone",
+        ),
+        (
+            "bigquery",
+            "SELECT COUNT(*) FROM trips AS t TABLESAMPLE SYSTEM (1 PERCENT) JOIN zones AS z ON t.zone = z.zone",
+        ),
+    ],
+)
+def test_sample_sql_samples_the_table_read_from(db_type, expected):
+    sql = "SELECT COUNT(*) FROM trips AS t JOIN zones AS z ON t.zone = z.zone"
+    assert sample_sql(sql, db_type, Sample(0.01, seed=3)) == expected
+
+
+def test_sample_sql_skips_cte_references():
+    sql = "WITH recent AS (SELECT * FROM trips) SELECT COUNT(*) FROM recent"
+    assert sample_sql(sql, "duckdb", Sample(0.5, method="system")) == (
+        "WITH recent AS (SELECT * FROM trips TABLESAMPLE SYSTEM (50 PERCENT)) SELECT COUNT(*) FROM recent"
+    )
+
+
+def test_sample_sql_unsupported_on_redshift():
+    with pytest.raises(ValueError, match="not supported"):
+        sample_sql("SELECT 1 FROM trips", "redshift", Sample(0.1))
@@ -0,0 +1,103 @@
+import ibis
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.models import SemanticModel
+from dazense_core.semantic.plans import PlanCache
+
+
+@pytest.fixture()
+def engine():
+    conn = ibis.duckdb.connect()
+    # Zone z has 10 * (z + 1) trips with a fare of z, and zone 5 is missing from the zones table
+    conn.raw_sql("""
+        CREATE TABLE main.trips AS
+        SELECT z AS zone_id, z::DOUBLE AS fare, DATE '2024-01-01' + (j % 2)::INTEGER * 31 AS pickup_date
+        FROM range(6) AS t(z), range(60) AS u(j)
+        WHERE j < 10 * (z + 1)
+    """)
+    conn.raw_sql("CREATE TABLE main.zones AS SELECT z AS id, 'Zone ' || z AS name FROM range(5) AS t(z)")
+    model = SemanticModel.model_validate(
+        {
+            "models": {
+                "trips": {
+                    "table": "trips",
+                    "schema": "main",
+                    "time_dimension": "pickup_date",
+                    "dimensions": {"zone_id": {"column": "zone_id"}},
+                    "measures": {
+                        "trip_count": {"type": "count"},
+                        "total_fare": {"type": "sum", "column": "fare"},
+                        "avg_fare": {"type": "avg", "column": "fare"},
+                    },
+                    "joins": {"zone": {"to_model": "zones", "foreign_key": "zone_id", "related_key": "id"}},
+                },
+                "zones": {
+                    "table": "zones",
+                    "schema": "main",
+                    "primary_key": "id",
+                    "dimensions": {"name": {"column": "name"}},
+                    "measures": {"zone_count": {"type": "count"}},
+                },
+            }
+        }
+    )
+    engine = SemanticEngine(
+        model, [DuckDBConfig(name="test-db", path=":memory:")], plan_cache=PlanCache(), schema_cache=SchemaCache()
+    )
+    engine._connections["test-db"] = conn
+    return engine
+
+
+def test_other_aggregates_the_remaining_rows(engine):
+    result = engine.query(
+        "trips",
+        ["trip_count", "avg_fare"],
+        ["zone_id"],
+        order_by=[{"column": "trip_count", "ascending": False}],
+        top_n={"dimension": "zone_id", "n": 2},
+    )
+
+    assert result == [
+        # Zones 0 to 3: 10 + 20 + 30 + 40 trips
+        {"zone_id": "Other", "trip_count": 100, "avg_fare": 2.0},
+        {"zone_id": "5", "trip_count": 60, "avg_fare": 5.0},
+        {"zone_id": "4", "trip_count": 50, "avg_fare": 4.0},
+    ]
+
+
+def test_ranks_joined_dimensions_over_the_whole_range_by_the_given_measure(engine):
+    result = engine.query(
+        "trips",
+        ["trip_count"],
+        ["zone.name"],
+        filters=[{"column": "zone_id", "operator": "ne", "value": 4}],
+        time_grain="month",
+        top_n={"dimension": "zone.name", "n": 1, "by": "total_fare"},
+    )
+
+    # Zone 5 has no zone row, so the join drops it; zone 3 has the highest total fare of the others
+    assert sorted((r["zone_name"], r["trip_count"]) for r in result) == [
+        ("Other", 30),
+        ("Other", 30),
+        ("Zone 3", 20),
+        ("Zone 3", 20),
+    ]
+    (plan,) = engine._plans._plans.values()
+    assert "ROW_NUMBER" in plan._statement.sql
+
+
+@pytest.mark.parametrize(
+    "top_n, kwargs, message",
+    [
+        ({"dimension": "zone_id", "n": 0}, {}, "at least 1"),
+        ({"dimension": "zone.name", "n": 3}, {}, "must be one of the query's dimensions"),
+        ({"dimension": "zone_id", "n": 3, "by": "fare"}, {}, "Measure 'fare' not found"),
+        ({"dimension": "zone_id", "n": 3}, {"time_grain": "month", "compare": ["previous_period"]}, "compare"),
+    ],
+)
+def test_invalid_top_n(engine, top_n, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        engine.query("trips", ["trip_count"], ["zone_id"], top_n=top_n, **kwargs)
@@ -0,0 +1,134 @@
+import os
+
+import ibis
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.models import SemanticModel
+from dazense_core.semantic.plans import PlanCache
+from dazense_core.semantic.values import value_index_path
+
+
+@pytest.fixture()
+def warehouse():
+    conn = ibis.duckdb.connect()
+    conn.raw_sql("""
+        CREATE TABLE main.trips AS
+        SELECT
+            i,
+            CASE WHEN i % 4 = 0 THEN 'Cash' WHEN i % 4 = 3 THEN NULL ELSE 'Credit card' END AS payment_type,
+            i % 2 = 0 AS shared,
+            i % 3 AS zone_id,
+            (i % 2)::DOUBLE AS tip,
+            TIMESTAMP '2024-01-01' + INTERVAL (i % 2) DAY AS pickup_day
+        FROM range(100) AS t(i)
+    """)
+    conn.raw_sql("CREATE TABLE main.zones AS SELECT * FROM (VALUES (0, 'Airport'), (1, 'Downtown')) AS t(id, name)")
+    return conn
+
+
+@pytest.fixture()
+def engine(warehouse, tmp_path):
+    model = SemanticModel.model_validate(
+        {
+            "models": {
+                "trips": {
+                    "table": "trips",
+                    "schema": "main",
+                    "dimensions": {
+                        "trip_id": {"column": "i"},
+                        "payment_type": {"column": "payment_type"},
+                        "shared": {"column": "shared"},
+                        "tip": {"column": "tip"},
+                        "pickup_day": {"column": "pickup_day"},
+                    },
+                    "measures": {"trip_count": {"type": "count"}},
+                    "joins": {"zone": {"to_model": "zones", "foreign_key": "zone_id", "related_key": "id"}},
+                },
+                "zones": {
+                    "table": "zones",
+                    "schema": "main",
+                    "primary_key": "id",
+                    "dimensions": {"zone_name": {"column": "name"}},
+                    "measures": {"zone_count": {"type": "count"}},
+                },
+            }
+        }
+    )
+    model.set_project_path(tmp_path)
+    engine = SemanticEngine(
+        model, [DuckDBConfig(name="test-db", path=":memory:")], plan_cache=PlanCache(), schema_cache=SchemaCache()
+    )
+    engine._connections["test-db"] = warehouse
+    return engine
+
+
+def test_indexes_dimensions_under_the_threshold(engine):
+    assert engine.index_dimension_values("trips", max_values=10) == {
+        "payment_type": 3,
+        "shared": 2,
+        "tip": 2,
+        "pickup_day": 2,
+    }
+
+    assert engine.dimension_values("trips", "payment_type") == [
+        {"value": "Credit card", "count": 50},
+        {"value": "Cash", "count": 25},
+        {"value": None, "count": 25},
+    ]
+    assert engine.dimension_values("trips", "payment_type", prefix="c", limit=1) == [
+        {"value": "Credit card", "count": 50}
+    ]
+    with pytest.raises(ValueError, match="has no value index"):
+        engine.dimension_values("trips", "trip_id")
+
+
+def test_unknown_filter_values_are_rejected_before_querying(engine, warehouse):
+    engine.index_dimension_values("trips")
+    engine.index_dimension_values("zones")
+    # Would fail if the query reached the warehouse
+    warehouse.raw_sql("DROP TABLE main.trips")
+
+    with pytest.raises(ValueError, match="'cash' is not a value of dimension 'payment_type'. Did you mean: 'Cash'"):
+        engine.query("trips", ["trip_count"], filters=[{"column": "payment_type", "value": "cash"}])
+    with pytest.raises(ValueError, match="'Uptown' is not a value of dimension 'zone_name'"):
+        engine.query(
+            "trips", ["trip_count"], filters=[{"column": "zone.name", "operator": "in", "value": ["Airport", "Uptown"]}]
+        )
+
+
+def test_known_and_unindexed_filter_values_are_queried(engine):
+    engine.index_dimension_values("trips", max_values=10)
+    filters = [
+        {"column": "payment_type", "operator": "in", "value": ["Cash", None]},
+        {"column": "shared", "value": True},
+        {"column": "zone_id", "value": 0},
+        {"column": "payment_type", "operator": "ne", "value": "Bitcoin"},
+    ]
+
+    assert engine.query("trips", ["trip_count"], filters=filters) == [{"trip_count": 9}]
+
+
+def test_stale_index_is_not_used_to_reject_values(engine):
+    engine.index_dimension_values("trips")
+    path = value_index_path(engine._model.project_path, "trips")
+    os.utime(path, (0, 0))
+
+    assert engine.query("trips", ["trip_count"], filters=[{"column": "payment_type", "value": "Card"}]) == [
+        {"trip_count": 0}
+    ]
+
+
+def test_filter_values_are_compared_in_the_column_type(engine):
+    engine.index_dimension_values("trips")
+
+    with pytest.raises(ValueError, match="'500' is not a value of dimension 'trip_id'"):
+        engine.query("trips", ["trip_count"], filters=[{"column": "i", "value": 500}])
+    filters = [
+        {"column": "i", "operator": "in", "value": [4, 8.0, "12"]},
+        {"column": "tip", "operator": "in", "value": [0, 1.0]},
+        {"column": "pickup_day", "value": "2024-01-01T00:00:00"},
+    ]
+    assert engine.query("trips", ["trip_count"], filters=filters) == [{"trip_count": 3}]
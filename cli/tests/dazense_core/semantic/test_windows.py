@@ -0,0 +1,123 @@
+import ibis
+import pytest
+
+from dazense_core.config.databases.duckdb import DuckDBConfig
+from dazense_core.config.databases.schema_cache import SchemaCache
+from dazense_core.semantic.engine import SemanticEngine
+from dazense_core.semantic.models import SemanticModel
+from dazense_core.semantic.plans import PlanCache
+
+
+@pytest.fixture()
+def engine():
+    conn = ibis.duckdb.connect()
+    conn.raw_sql("""
+        CREATE TABLE main.orders AS SELECT * FROM (VALUES
+            ('web', 100, DATE '2023-02-10'),
+            ('web', 50, DATE '2023-12-05'),
+            ('store', 20, DATE '2024-01-03'),
+            ('web', 30, DATE '2024-01-20'),
+            ('web', 60, DATE '2024-02-14'),
+            ('store', 40, DATE '2024-03-01')
+        ) AS t(channel, amount, order_date)
+    """)
+    model = SemanticModel.model_validate(
+        {
+            "models": {
+                "orders": {
+                    "table": "orders",
+                    "schema": "main",
+                    "time_dimension": "order_date",
+                    "dimensions": {"channel": {"column": "channel"}},
+                    "measures": {
+                        "order_count": {"type": "count"},
+                        "total_amount": {"type": "sum", "column": "amount"},
+                        "avg_amount": {"type": "avg", "column": "amount"},
+                    },
+                },
+            }
+        }
+    )
+    engine = SemanticEngine(
+        model, [DuckDBConfig(name="test-db", path=":memory:")], plan_cache=PlanCache(), schema_cache=SchemaCache()
+    )
+    engine._connections["test-db"] = conn
+    return engine
+
+
+def monthly(engine, **kwargs) -> list[tuple]:
+    rows = engine.query("orders", time_grain="month", order_by=[{"column": "order_date_month"}], **kwargs)
+    return [tuple(row.values())[1:] for row in rows]
+
+
+def test_compare_with_periods_outside_the_time_range(engine):
+    result = monthly(
+        engine,
+        measures=["total_amount"],
+        time_range={"start": "2024-01-01"},
+        compare=["previous_period", "previous_year"],
+    )
+
+    assert result == [
+        (50, 50, 0.0, None, pytest.approx(float("nan"), nan_ok=True)),
+        (60, 50, pytest.approx(0.2), 100, pytest.approx(-0.4)),
+        (40, 60, pytest.approx(-1 / 3), None, pytest.approx(float("nan"), nan_ok=True)),
+    ]
+
+
+def test_compare_matches_groups_by_dimension(engine):
+    rows = engine.query(
+        "orders",
+        ["total_amount"],
+        ["channel"],
+        time_grain="month",
+        time_range={"start": "2024-02-01"},
+        compare=["previous_period"],
+    )
+
+    by_channel = {row["channel"]: row["total_amount_previous_period"] for row in rows}
+    assert by_channel["web"] == 30
+    assert by_channel["store"] is None  # no store orders in February
+
+
+def test_cumulative_runs_per_dimension_group(engine):
+    rows = engine.query(
+        "orders",
+        ["order_count", "total_amount"],
+        ["channel"],
+        time_grain="year",
+        cumulative=["total_amount"],
+        order_by=[{"column": "order_date_year"}, {"column": "channel"}],
+    )
+
+    assert [(row["channel"], row["total_amount_cumulative"]) for row in rows] == [
+        ("store", 60),
+        ("web", 150),
+        ("web", 240),
+    ]
+
+
+def test_result_columns_include_window_columns(engine):
+    assert engine.result_columns(
+        "orders", ["total_amount"], time_grain="month", compare=["previous_year"], cumulative=["total_amount"]
+    ) == [
+        "order_date_month",
+        "total_amount",
+        "total_amount_previous_year",
+        "total_amount_previous_year_change",
+        "total_amount_cumulative",
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"compare": ["previous_period"]}, "require a time_grain"),
+        ({"time_grain": "month", "compare": ["next_period"]}, "Unsupported comparison"),
+        ({"time_grain": "month", "cumulative": ["order_count"]}, "not one of the queried measures"),
+        ({"time_grain": "month", "measures": ["avg_amount"], "cumulative": ["avg_amount"]}, "only count and sum"),
+    ],
+)
+def test_invalid_windows(engine, kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        engine.query("orders", **{"measures": ["total_amount"], **kwargs})
@@ -0,0 +1,61 @@
+import datetime
+from decimal import Decimal
+
+import pyarrow as pa
+
+from dazense_core.results import arrow_to_columns, arrow_to_ipc, cursor_to_arrow, cursor_to_batches
+
+
+class FakeDBAPICursor:
+    description = [("id",), ("name",)]
+
+    def fetchall(self):
+        return [(1, "a"), (2, "b")]
+
+
+def test_arrow_to_columns_converts_non_json_types():
+    table = pa.table(
+        {
+            "amount": pa.array([Decimal("1.50"), None], type=pa.decimal128(4, 2)),
+            "ratio": [float("nan"), 0.5],
+            "day": [datetime.date(2024, 1, 2), None],
+            "payload": pa.array([b"hi", None], type=pa.binary()),
+        }
+    )
+    assert arrow_to_columns(table) == {
+        "amount": [1.5, None],
+        "ratio": [None, 0.5],
+        "day": ["2024-01-02", None],
+        "payload": ["aGk=", None],
+    }
+
+
+def test_cursor_to_arrow_falls_back_to_dbapi_rows():
+    table = cursor_to_arrow(FakeDBAPICursor())
+    assert table.to_pylist() == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+
+def test_arrow_to_ipc_round_trip():
+    table = pa.table({"id": [1, 2]})
+    assert pa.ipc.open_stream(arrow_to_ipc(table)).read_all().equals(table)
+
+
+class FakeStreamingCursor(FakeDBAPICursor):
+    def __init__(self, rows):
+        self._rows = list(rows)
+
+    def fetchmany(self, size):
+        batch, self._rows = self._rows[:size], self._rows[size:]
+        return batch
+
+
+def test_cursor_to_batches_uses_fetchmany():
+    batches = list(cursor_to_batches(FakeStreamingCursor([(i, str(i)) for i in range(5)]), batch_size=2))
+    assert [b.num_rows for b in batches] == [2, 2, 1]
+
+
+def test_cursor_to_batches_yields_schema_for_empty_result():
+    batches = list(cursor_to_batches(FakeStreamingCursor([]), batch_size=2))
+    assert len(batches) == 1
+    assert batches[0].num_rows == 0
+    assert batches[0].schema.names == ["id", "name"]